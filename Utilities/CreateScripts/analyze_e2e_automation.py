@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
+from ttm_data import load_ttm_data
+from ttm_tagger import HOW_FIXED, KeywordTagger
 
 # Load data
-df = pd.read_csv('data/october_2025_ttm_filtered.csv')
+df = load_ttm_data('data/october_2025_ttm_filtered.csv', columns=[
+    'OutageIncidentId', 'ServiceName', 'TTM', 'TTO', 'TTFix', 'HowFixed', 'Is_IA_Mitigation'
+])
 
 print('=' * 80)
 print('FULL E2E AUTOMATION ANALYSIS (Detection + Mitigation)')
@@ -28,8 +32,9 @@ ia_mitigation_true = df['Is_IA_Mitigation'].notna() & (df['Is_IA_Mitigation'] ==
 ia_mitigation_count = ia_mitigation_true.sum()
 
 # Also count transient/false alarm incidents (auto-resolved without human mitigation)
-transient_keywords = ['Transient', 'False Alarm', 'transient', 'false alarm']
-is_transient = df['HowFixed'].notna() & df['HowFixed'].str.contains('|'.join(transient_keywords), case=False, na=False)
+how_fixed_tagger = KeywordTagger({'HowFixedTags': HOW_FIXED})
+how_fixed_bits = how_fixed_tagger.tag(df['HowFixed'])['HowFixedTags']
+is_transient = pd.Series(how_fixed_tagger.has('HowFixedTags', how_fixed_bits, 'transient'), index=df.index)
 transient_count = is_transient.sum()
 
 # Full E2E = IA Mitigation OR Transient/False Alarm
@@ -166,12 +171,10 @@ print(f'\n' + '=' * 80)
 print('SERVICES WITH HIGHEST E2E AUTOMATION RATE (2+ incidents):')
 print('=' * 80)
 
-service_stats = df.groupby('ServiceName').agg({
+service_stats = df.groupby('ServiceName', observed=True).agg({
     'OutageIncidentId': 'count',
 }).rename(columns={'OutageIncidentId': 'Total'})
-service_stats['E2E_Automated'] = df.groupby('ServiceName').apply(
-    lambda x: ((x['Is_IA_Mitigation'] == True) | (x['HowFixed'].notna() & x['HowFixed'].str.contains('Transient|False Alarm', case=False, na=False))).sum()
-)
+service_stats['E2E_Automated'] = full_e2e_mask.groupby(df['ServiceName'], observed=True).sum()
 service_stats['E2E_Rate'] = (service_stats['E2E_Automated'] / service_stats['Total'] * 100).round(1)
 service_stats = service_stats[service_stats['Total'] >= 2]  # At least 2 incidents
 service_stats = service_stats.sort_values('E2E_Rate', ascending=False).head(10)
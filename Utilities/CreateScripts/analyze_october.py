@@ -1,8 +1,12 @@
 import pandas as pd
 import numpy as np
+from ttm_data import load_ttm_data
 
 # Read the CSV file
-data = pd.read_csv('sept_base_data.csv')
+data = load_ttm_data('sept_base_data.csv', columns=[
+    'OutageIncidentId', 'TTM', 'OutageCreateDate', 'ServiceName', 'Impacts', 'Symptoms',
+    'Severity', 'State', 'RootCauseCategory', 'HowFixed', 'IsMultiRegion', 'IsCausedBy'
+])
 
 # Convert TTM to numeric, handling any non-numeric values
 data['TTM'] = pd.to_numeric(data['TTM'], errors='coerce')
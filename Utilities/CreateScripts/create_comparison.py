@@ -1,24 +1,25 @@
-import pandas as pd
 from datetime import datetime
 import os
+from ttm_metrics import load_metrics
 
-df_oct = pd.read_csv("october_2025_ttm_full_month.csv")
+metrics_oct = load_metrics("october_2025_ttm_full_month.csv")
 sept_path = "../SeptTTM/september_ttm_analysis.csv"
 
 if os.path.exists(sept_path):
-    df_sept = pd.read_csv(sept_path)
+    metrics_sept = load_metrics(sept_path)
     
-    oct_count = len(df_oct)
-    sept_count = len(df_sept)
+    oct_count = metrics_oct['rows']
+    sept_count = metrics_sept['rows']
     count_delta = oct_count - sept_count
     count_pct = (count_delta / sept_count * 100) if sept_count > 0 else 0
     
-    oct_ttm_p75 = df_oct['TTM'].quantile(0.75)
-    sept_ttm_p75 = df_sept['TTM'].quantile(0.75)
+    oct_ttm_p75 = metrics_oct['overall']['TTM']['p75']
+    sept_ttm_p75 = metrics_sept['overall']['TTM']['p75']
     ttm_delta = oct_ttm_p75 - sept_ttm_p75
     ttm_pct = (ttm_delta / sept_ttm_p75 * 100) if sept_ttm_p75 > 0 else 0
     
-    severity_col = 'OutageIncidentSeverity' if 'OutageIncidentSeverity' in df_oct.columns else 'Severity'
+    oct_severity = {g['value']: g['count'] for g in metrics_oct['groups'].get(metrics_oct['severity_column'], [])}
+    sept_severity = {g['value']: g['count'] for g in metrics_sept['groups'].get(metrics_sept['severity_column'], [])}
     
     output = f"""# October 2025 vs September 2025 - TTM Comparison
 
@@ -42,9 +43,9 @@ if os.path.exists(sept_path):
 |----------|---------|-----------|--------|
 """
     
-    for sev in sorted(df_oct[severity_col].unique()):
-        oct_sev = len(df_oct[df_oct[severity_col] == sev])
-        sept_sev = len(df_sept[df_sept[severity_col] == sev]) if sev in df_sept[severity_col].values else 0
+    for sev in sorted(oct_severity):
+        oct_sev = oct_severity[sev]
+        sept_sev = sept_severity.get(sev, 0)
         delta = oct_sev - sept_sev
         output += f"| Severity {sev} | {oct_sev} | {sept_sev} | {delta:+d} |\n"
     
@@ -19,9 +19,13 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import re
+from ttm_data import load_ttm_data
+from ttm_tagger import KeywordTagger
 
 # Load data
-df = pd.read_csv('data/october_2025_ttm_filtered.csv')
+df = load_ttm_data('data/october_2025_ttm_filtered.csv', columns=[
+    'OutageIncidentId', 'OutageIncidentSeverity', 'TTM', 'TTO', 'RootCauses', 'set_Whys'
+])
 
 print("=" * 80)
 print("MITIGATION TIME REGRESSION MODEL")
@@ -46,81 +50,35 @@ print("STEP 1: ROOT CAUSE CLASSIFICATION")
 print("=" * 80)
 print()
 
-def classify_root_cause(row):
-    """
-    Classify root cause from set_Whys and RootCauses columns
-    
-    Categories:
-    - Hardware Failure
-    - Software Bug
-    - Configuration Issue
-    - Capacity/Resource Exhaustion
-    - Network Issue
-    - Deployment/Change
-    - External Dependency
-    - Transient/Unknown
-    """
-    
-    # Combine text sources
-    text = ""
-    if pd.notna(row.get('set_Whys')):
-        text += str(row['set_Whys']).lower() + " "
-    if pd.notna(row.get('RootCauses')):
-        text += str(row['RootCauses']).lower() + " "
-    
-    if not text.strip():
-        return "Unknown"
-    
-    # Classification rules (order matters - most specific first)
-    
-    # Hardware Failure
-    if any(kw in text for kw in ['hardware failure', 'hardware error', 'psu', 'power loss', 
-                                   'fuse', 'ssd failure', 'disk failure', 'memory failure',
-                                   'nic failure', 'tor switch', 'power breaker', 'parity error']):
-        return "Hardware Failure"
-    
-    # Software Bug
-    if any(kw in text for kw in ['software bug', 'code bug', 'null reference', 'exception',
-                                   'assertion failure', 'crash', 'memory leak', 'deadlock',
-                                   'race condition', 'known bug', 'csc', 'process crash']):
-        return "Software Bug"
-    
-    # Configuration Issue
-    if any(kw in text for kw in ['configuration', 'misconfiguration', 'config error', 
-                                   'wrong setting', 'incorrect parameter', 'config change',
-                                   'settings', 'firewall rule', 'acl', 'policy']):
-        return "Configuration Issue"
-    
-    # Capacity/Resource Exhaustion
-    if any(kw in text for kw in ['capacity', 'exhaustion', 'out of memory', 'oom', 
-                                   'disk full', 'cpu high', 'throttling', 'quota',
-                                   'resource limit', 'scaling', 'overload']):
-        return "Capacity/Resource"
-    
-    # Network Issue
-    if any(kw in text for kw in ['network', 'connectivity', 'packet loss', 'latency',
-                                   'bgp', 'routing', 'dns', 'timeout', 'connection reset']):
-        return "Network Issue"
-    
-    # Deployment/Change
-    if any(kw in text for kw in ['deployment', 'rollout', 'release', 'code push',
-                                   'change', 'update', 'upgrade', 'migration', 'rollback']):
-        return "Deployment/Change"
-    
-    # External Dependency
-    if any(kw in text for kw in ['external', 'dependency', 'downstream', 'upstream',
-                                   'third party', 'vendor', 'azure ad', 'cosmos']):
-        return "External Dependency"
-    
-    # Transient
-    if any(kw in text for kw in ['transient', 'intermittent', 'temporary', 'flaky',
-                                   'self-healing', 'self-resolved', 'recovered']):
-        return "Transient"
-    
-    return "Unknown"
+# Root cause classes from set_Whys and RootCauses, in priority order (most specific
+# first): an incident gets the first class with a keyword in its text
+ROOT_CAUSE_CLASSES = {
+    "Hardware Failure": ['hardware failure', 'hardware error', 'psu', 'power loss',
+                         'fuse', 'ssd failure', 'disk failure', 'memory failure',
+                         'nic failure', 'tor switch', 'power breaker', 'parity error'],
+    "Software Bug": ['software bug', 'code bug', 'null reference', 'exception',
+                     'assertion failure', 'crash', 'memory leak', 'deadlock',
+                     'race condition', 'known bug', 'csc', 'process crash'],
+    "Configuration Issue": ['configuration', 'misconfiguration', 'config error',
+                            'wrong setting', 'incorrect parameter', 'config change',
+                            'settings', 'firewall rule', 'acl', 'policy'],
+    "Capacity/Resource": ['capacity', 'exhaustion', 'out of memory', 'oom',
+                          'disk full', 'cpu high', 'throttling', 'quota',
+                          'resource limit', 'scaling', 'overload'],
+    "Network Issue": ['network', 'connectivity', 'packet loss', 'latency',
+                      'bgp', 'routing', 'dns', 'timeout', 'connection reset'],
+    "Deployment/Change": ['deployment', 'rollout', 'release', 'code push',
+                          'change', 'update', 'upgrade', 'migration', 'rollback'],
+    "External Dependency": ['external', 'dependency', 'downstream', 'upstream',
+                            'third party', 'vendor', 'azure ad', 'cosmos'],
+    "Transient": ['transient', 'intermittent', 'temporary', 'flaky',
+                  'self-healing', 'self-resolved', 'recovered']
+}
+root_cause_tagger = KeywordTagger({'RootCause': ROOT_CAUSE_CLASSES})
 
-# Apply classification
-df['RootCause_Classified'] = df.apply(classify_root_cause, axis=1)
+# Apply classification (one scan per distinct text; no class found -> "Unknown")
+root_cause_bits = root_cause_tagger.tag(df['set_Whys'], df['RootCauses'])['RootCause']
+df['RootCause_Classified'] = root_cause_tagger.first('RootCause', root_cause_bits, default="Unknown")
 
 print("Root Cause Classification Results:")
 root_cause_counts = df['RootCause_Classified'].value_counts()
@@ -1,7 +1,12 @@
 import pandas as pd
 from datetime import datetime
+from ttm_data import load_ttm_data
+from ttm_metrics import group_stats, load_metrics
 
-df = pd.read_csv("october_2025_ttm_full_month.csv")
+df = load_ttm_data("october_2025_ttm_full_month.csv", columns=[
+    'OutageIncidentId', 'OutageCreateDate', 'TTM', 'OutageIncidentSeverity', 'ServiceName',
+    'IsMultiRegion', 'RootCauseCategory', 'HowFixed', 'AI_Summary'
+])
 df['OutageCreateDate'] = pd.to_datetime(df['OutageCreateDate'], format='mixed', errors='coerce')
 df['Day'] = df['OutageCreateDate'].dt.day
 df['TTM'] = pd.to_numeric(df['TTM'], errors='coerce')
@@ -15,12 +20,13 @@ def get_week(day):
     else: return 'Week 5 (Oct 29-31)'
 
 df['Week'] = df['Day'].apply(get_week)
+metrics = load_metrics("october_2025_ttm_full_month.csv")
 severity_col = 'OutageIncidentSeverity'
-total = len(df)
-mean_ttm = df['TTM'].mean()
-median_ttm = df['TTM'].median()
-p75_ttm = df['TTM'].quantile(0.75)
-sev2 = len(df[df[severity_col] == 2])
+total = metrics['rows']
+mean_ttm = metrics['overall']['TTM']['mean']
+median_ttm = metrics['overall']['TTM']['p50']
+p75_ttm = metrics['overall']['TTM']['p75']
+sev2 = metrics['counts']['severity_2']
 major_incidents = df[(df[severity_col] == 2) | (df['TTM'] > 200) | (df['IsMultiRegion'] == True)].sort_values('TTM', ascending=False)
 
 output = f"""# October 2025 TTM Analysis - Comprehensive Narrative
@@ -49,16 +55,20 @@ In October 2025, Azure experienced **{total} service incidents** with an average
 
 weeks = ['Week 1 (Oct 1-7)', 'Week 2 (Oct 8-14)', 'Week 3 (Oct 15-21)', 'Week 4 (Oct 22-28)', 'Week 5 (Oct 29-31)']
 
+# Weekly and week x service statistics in one grouped pass each
+week_stats = group_stats(df, 'Week', ['TTM'])
+week_service_stats = group_stats(df, ['Week', 'ServiceName'], ['TTM'])
+week_sev2 = (df[severity_col] == 2).groupby(df['Week']).sum()
+
 for week_label in weeks:
-    week_df = df[df['Week'] == week_label]
-    if len(week_df) == 0:
+    if week_label not in week_stats.index:
         output += f"### {week_label}\n\nNo incidents recorded during this period.\n\n"
         continue
     
-    total_week = len(week_df)
-    avg_ttm = week_df['TTM'].mean()
-    median_ttm_week = week_df['TTM'].median()
-    sev2_week = len(week_df[week_df[severity_col] == 2])
+    total_week = int(week_stats.loc[week_label, 'incidents'])
+    avg_ttm = week_stats.loc[week_label, 'TTM_mean']
+    median_ttm_week = week_stats.loc[week_label, 'TTM_p50']
+    sev2_week = int(week_sev2.get(week_label, 0))
     
     output += f"### {week_label}\n\n"
     output += f"**Overview:** {total_week} incidents occurred during this week, with an average TTM of {avg_ttm:.0f} minutes (median: {median_ttm_week:.0f} minutes). "
@@ -68,9 +78,8 @@ for week_label in weeks:
     
     output += "\n\n**Most Affected Services:**\n\n"
     
-    for service, count in week_df['ServiceName'].value_counts().head(3).items():
-        service_ttm = week_df[week_df['ServiceName'] == service]['TTM'].mean()
-        output += f"- **{service}**: {count} incidents (avg TTM: {service_ttm:.0f} min)\n"
+    for service, row in week_service_stats.xs(week_label, level='Week').head(3).iterrows():
+        output += f"- **{service}**: {int(row['incidents'])} incidents (avg TTM: {row['TTM_mean']:.0f} min)\n"
     
     output += "\n"
 
@@ -117,13 +126,12 @@ The following services experienced the highest incident volumes in October 2025:
 
 """
 
-for service, count in df['ServiceName'].value_counts().head(10).items():
-    avg_ttm = df[df['ServiceName'] == service]['TTM'].mean()
-    median_service = df[df['ServiceName'] == service]['TTM'].median()
-    output += f"### {service}\n\n"
+for group in metrics['groups']['ServiceName'][:10]:
+    count = group['count']
+    output += f"### {group['value']}\n\n"
     output += f"- **Incident Count:** {count} ({count/total*100:.1f}% of total)\n"
-    output += f"- **Average TTM:** {avg_ttm:.0f} minutes\n"
-    output += f"- **Median TTM:** {median_service:.0f} minutes\n\n"
+    output += f"- **Average TTM:** {group['TTM']['mean']:.0f} minutes\n"
+    output += f"- **Median TTM:** {group['TTM']['p50']:.0f} minutes\n\n"
 
 output += f"""---
 
@@ -2,8 +2,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from ttm_data import load_ttm_data
 
-df = pd.read_csv("october_2025_ttm_full_month.csv")
+df = load_ttm_data("october_2025_ttm_full_month.csv", columns=['OutageCreateDate', 'TTM', 'ServiceName', 'OutageIncidentSeverity'])
 df['OutageCreateDate'] = pd.to_datetime(df['OutageCreateDate'], format='mixed', errors='coerce')
 df_ttm = df[df['TTM'].notna() & (df['TTM'] >= 0)]
 severity_col = 'OutageIncidentSeverity'
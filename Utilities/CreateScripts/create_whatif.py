@@ -1,16 +1,25 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from ttm_data import load_ttm_data
+from ttm_metrics import RemovalStats
 
 # Load data
-df = pd.read_csv("october_2025_ttm_full_month.csv")
+df = load_ttm_data("october_2025_ttm_full_month.csv", columns=[
+    'OutageIncidentId', 'TTM', 'RootResponsibleIncidentId', 'EventId', 'ServiceName', 'OutageIncidentSeverity',
+    'Severity', 'OutageCreateDate', 'RootCauseCategory', 'Level'
+])
 df['TTM'] = pd.to_numeric(df['TTM'], errors='coerce')
 df_clean = df[df['TTM'].notna() & (df['TTM'] >= 0)].copy()
 
+# TTM values still in scope as event systems are removed: each removal updates the
+# order statistics in O(log n) per incident instead of re-filtering the month
+remaining = RemovalStats(df_clean['TTM'].to_numpy())
+
 # Calculate baseline
-baseline_p75 = df_clean['TTM'].quantile(0.75)
-baseline_mean = df_clean['TTM'].mean()
-baseline_median = df_clean['TTM'].median()
+baseline_p75 = remaining.quantile(0.75)
+baseline_mean = remaining.mean()
+baseline_median = remaining.quantile(0.5)
 baseline_count = len(df_clean)
 
 # Get severity column
@@ -47,38 +56,50 @@ else:
     root_events = df_clean['IsRootEvent'].sum()
     cascading_outages = (~df_clean['IsRootEvent']).sum()
 
-# Function to get all incidents in an event system (root + all cascades)
-def get_event_system_incidents(root_id):
-    """Get root event and all cascading outages with same RootResponsibleIncidentId"""
-    return df_clean[df_clean['RootId'] == root_id]['OutageIncidentId'].tolist()
-
-# Function to calculate metrics without specific incidents
-def calculate_without(exclude_ids):
-    remaining = df_clean[~df_clean['OutageIncidentId'].isin(exclude_ids)]
-    if len(remaining) == 0:
+# Row positions of every event system (root + all cascades with the same RootResponsibleIncidentId)
+systems = df_clean.groupby('RootId', sort=False)
+system_positions = systems.indices
+system_ttm = systems['TTM'].agg(['sum', 'max', 'size'])  # in order of first appearance
+
+# One representative row per system: its root event, or its first incident when the root is not in scope
+representatives = (df_clean.sort_values('IsRootEvent', ascending=False, kind='stable')
+                   .drop_duplicates('RootId').set_index('RootId').reindex(system_ttm.index))
+
+def representative_values(column, default):
+    if column not in representatives.columns:
+        return [default] * len(representatives)
+    return representatives[column].tolist()
+
+# Per-incident arrays for listing cascades, so no system needs a frame of its own
+incident_ids = df_clean['OutageIncidentId'].to_numpy()
+incident_services = df_clean['ServiceName'].to_numpy()
+incident_ttms = df_clean['TTM'].to_numpy()
+incident_levels = df_clean['Level'].to_numpy() if 'Level' in df_clean.columns else None
+
+# Function to calculate metrics over the incidents not removed so far
+def remaining_metrics():
+    if remaining.count == 0:
         return None, None, None, 0
-    return (
-        remaining['TTM'].quantile(0.75),
-        remaining['TTM'].mean(),
-        remaining['TTM'].median(),
-        len(remaining)
-    )
+    return remaining.quantile(0.75), remaining.mean(), remaining.quantile(0.5), remaining.count
+
+# Function to calculate metrics without specific incidents (row positions), leaving them in scope
+def calculate_without(positions):
+    removed = remaining.remove(positions)
+    try:
+        return remaining_metrics()
+    finally:
+        remaining.restore(removed)
 
 # Calculate impact for each event system
 event_impacts = []
 
-for root_id in df_clean['RootId'].unique():
+for root_id, total_system_ttm, max_ttm, system_size, service, severity, root_ttm, create_date, root_cause in zip(
+        system_ttm.index, system_ttm['sum'], system_ttm['max'], system_ttm['size'],
+        representative_values('ServiceName', 'Unknown'), representative_values(severity_col, 'N/A'),
+        representatives['TTM'].tolist(), representative_values('OutageCreateDate', 'N/A'),
+        representative_values('RootCauseCategory', 'N/A')):
     # Get all incidents in this event system
-    system_incidents = get_event_system_incidents(root_id)
-    system_df = df_clean[df_clean['RootId'] == root_id]
-    
-    # Get the root event details
-    root_event = system_df[system_df['OutageIncidentId'] == root_id]
-    if root_event.empty:
-        # If no exact match, take the first incident in the system as representative
-        root_event = system_df.iloc[[0]]
-    
-    root_event = root_event.iloc[0]
+    system_incidents = system_positions[root_id]
     
     # Calculate impact of removing this entire event system
     p75_without, mean_without, median_without, count_without = calculate_without(system_incidents)
@@ -88,18 +109,16 @@ for root_id in df_clean['RootId'].unique():
         p75_pct = (p75_delta / baseline_p75 * 100)
         mean_delta = baseline_mean - mean_without
         
-        cascade_count = len(system_incidents) - 1  # -1 for the root itself
-        total_system_ttm = system_df['TTM'].sum()
-        max_ttm = system_df['TTM'].max()
+        cascade_count = system_size - 1  # -1 for the root itself
         
         event_impacts.append({
             'root_id': root_id,
-            'service': root_event['ServiceName'] if 'ServiceName' in root_event else 'Unknown',
-            'severity': root_event[severity_col] if severity_col in root_event else 'N/A',
-            'root_ttm': root_event['TTM'],
+            'service': service,
+            'severity': severity,
+            'root_ttm': root_ttm,
             'max_ttm': max_ttm,
             'cascade_count': cascade_count,
-            'total_incidents': len(system_incidents),
+            'total_incidents': system_size,
             'total_ttm': total_system_ttm,
             'p75_without': p75_without,
             'p75_delta': p75_delta,
@@ -108,9 +127,9 @@ for root_id in df_clean['RootId'].unique():
             'mean_delta': mean_delta,
             'median_without': median_without,
             'count_without': count_without,
-            'create_date': root_event.get('OutageCreateDate', 'N/A'),
-            'root_cause': root_event.get('RootCauseCategory', 'N/A'),
-            'system_df': system_df
+            'create_date': create_date,
+            'root_cause': root_cause,
+            'positions': system_incidents
         })
 
 # Sort by P75 impact (descending - most impact first)
@@ -120,8 +139,8 @@ print(f"\nCalculated impacts for {len(event_impacts)} event systems")
 top3_pcts = [e['p75_pct'] for e in event_impacts[:3]]
 print(f"Top 3 impacts: {top3_pcts}")
 
-# Build markdown output
-output = f"""# October 2025 TTM Analysis - What-If Scenario Analysis (Event Systems)
+# Build markdown output (as a list of parts, joined once at the end)
+output = [f"""# October 2025 TTM Analysis - What-If Scenario Analysis (Event Systems)
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -153,13 +172,13 @@ This section ranks each event system by its impact on P75 TTM if that system (ro
 
 **Interpretation:** The higher the P75 delta, the more that event system contributed to overall TTM.
 
-"""
+"""]
 
 # Part 1: Individual event impacts ranked by P75 delta
 for idx, event in enumerate(event_impacts, 1):
     root_id = int(event['root_id'])
     
-    output += f"""### Rank #{idx}: Event System {root_id}
+    output.append(f"""### Rank #{idx}: Event System {root_id}
 
 **Event System Details:**
 - **Root Event ID:** {root_id}
@@ -171,63 +190,61 @@ for idx, event in enumerate(event_impacts, 1):
 - **System Total TTM:** {event['total_ttm']:.0f} minutes
 - **Date:** {str(event['create_date'])[:10] if pd.notna(event['create_date']) else 'N/A'}
 
-"""
+""")
     
     # List cascading outages if any
     if event['cascade_count'] > 0:
-        output += "**Cascading Outages:**\n"
-        cascades = event['system_df'][event['system_df']['OutageIncidentId'] != root_id]
-        for _, outage in cascades.head(10).iterrows():
-            output += f"  - Outage {int(outage['OutageIncidentId'])} ({outage['ServiceName']}, TTM: {outage['TTM']:.0f} min"
-            if 'Level' in outage and pd.notna(outage['Level']):
-                output += f", Level: {outage['Level']}"
-            output += ")\n"
+        output.append("**Cascading Outages:**\n")
+        positions = event['positions']
+        for pos in positions[incident_ids[positions] != root_id][:10]:
+            output.append(f"  - Outage {int(incident_ids[pos])} ({incident_services[pos]}, TTM: {incident_ttms[pos]:.0f} min")
+            if incident_levels is not None and pd.notna(incident_levels[pos]):
+                output.append(f", Level: {incident_levels[pos]}")
+            output.append(")\n")
         if event['cascade_count'] > 10:
-            output += f"  - ...and {event['cascade_count'] - 10} more cascading outages\n"
-        output += "\n"
+            output.append(f"  - ...and {event['cascade_count'] - 10} more cascading outages\n")
+        output.append("\n")
     
-    output += f"""**Impact if This Event System Prevented:**
+    output.append(f"""**Impact if This Event System Prevented:**
 - **P75 TTM:** {event['p75_without']:.1f} minutes
 - **P75 Delta:** {event['p75_delta']:+.1f} minutes ({event['p75_pct']:+.1f}%)
 - **Mean TTM:** {event['mean_without']:.1f} minutes (Δ {event['mean_delta']:+.1f} min)
 - **Median TTM:** {event['median_without']:.1f} minutes
 - **Remaining Incidents:** {event['count_without']}
 
-"""
+""")
     
     if pd.notna(event['root_cause']) and event['root_cause'] != 'N/A':
-        output += f"**Root Cause:** {event['root_cause']}\n\n"
+        output.append(f"**Root Cause:** {event['root_cause']}\n\n")
     
     # Flag high-impact events
     if abs(event['p75_pct']) >= 2.0:
-        output += f"⚠️ **High Impact:** Preventing this event system would change P75 by {abs(event['p75_pct']):.1f}%\n\n"
+        output.append(f"⚠️ **High Impact:** Preventing this event system would change P75 by {abs(event['p75_pct']):.1f}%\n\n")
     
     if event['cascade_count'] >= 3:
-        output += f"🔗 **High Cascade:** This event triggered {event['cascade_count']} downstream outages\n\n"
+        output.append(f"🔗 **High Cascade:** This event triggered {event['cascade_count']} downstream outages\n\n")
     
-    output += "---\n\n"
+    output.append("---\n\n")
 
 # Part 2: Cumulative removal impact
-output += """## Part 2: Cumulative Removal Impact Analysis
+output.append("""## Part 2: Cumulative Removal Impact Analysis
 
 This section shows the cumulative impact of removing event systems in order of their individual impact (from Part 1). This answers: "What if we prevented the top N most impactful events?"
 
 **Methodology:** Events are removed in rank order (highest individual impact first), and metrics are recalculated after each removal to show cumulative effect.
 
-"""
+""")
 
 # Calculate cumulative impacts
-cumulative_excluded = []
 cumulative_results = []
 
 for idx, event in enumerate(event_impacts, 1):
-    # Add this event system's incidents to cumulative list
-    system_incidents = get_event_system_incidents(event['root_id'])
-    cumulative_excluded.extend(system_incidents)
-    cumulative_excluded = list(set(cumulative_excluded))  # Remove duplicates
+    # Remove this event system's incidents on top of those removed so far
+    remaining.remove(system_positions[event['root_id']])
+    incidents_removed = baseline_count - remaining.count
     
     # Calculate metrics with all excluded so far
-    p75_cum, mean_cum, median_cum, count_cum = calculate_without(cumulative_excluded)
+    p75_cum, mean_cum, median_cum, count_cum = remaining_metrics()
     
     if p75_cum is not None:
         p75_delta_cum = baseline_p75 - p75_cum
@@ -237,8 +254,8 @@ for idx, event in enumerate(event_impacts, 1):
         cumulative_results.append({
             'rank': idx,
             'events_removed': idx,
-            'total_incidents_removed': len(cumulative_excluded),
-            'pct_removed': (len(cumulative_excluded) / baseline_count * 100),
+            'total_incidents_removed': incidents_removed,
+            'pct_removed': (incidents_removed / baseline_count * 100),
             'p75': p75_cum,
             'p75_delta': p75_delta_cum,
             'p75_pct': p75_pct_cum,
@@ -253,7 +270,7 @@ for idx, event in enumerate(event_impacts, 1):
 for result in cumulative_results[:20]:  # Show top 20
     latest = result['latest_event']
     
-    output += f"""### Cumulative Step {result['rank']}: Remove Top {result['events_removed']} Event System{"s" if result['events_removed'] > 1 else ""}
+    output.append(f"""### Cumulative Step {result['rank']}: Remove Top {result['events_removed']} Event System{"s" if result['events_removed'] > 1 else ""}
 
 **Latest Event Added:** {int(latest['root_id'])} ({latest['service']}, {latest['total_incidents']} incidents)
 
@@ -268,54 +285,54 @@ for result in cumulative_results[:20]:  # Show top 20
 - **Mean TTM:** {result['mean']:.1f} minutes (Δ {result['mean_delta']:+.1f} min)
 - **Median TTM:** {result['median']:.1f} minutes
 
-"""
+""")
     
     # Highlight milestones
     if result['events_removed'] in [1, 3, 5, 10]:
         if result['events_removed'] == 1:
-            output += f"📊 **Insight:** Single most impactful event system accounts for {abs(result['p75_pct']):.1f}% of P75 TTM\n\n"
+            output.append(f"📊 **Insight:** Single most impactful event system accounts for {abs(result['p75_pct']):.1f}% of P75 TTM\n\n")
         else:
-            output += f"📊 **Insight:** Top {result['events_removed']} event systems account for {abs(result['p75_pct']):.1f}% of P75 TTM\n\n"
+            output.append(f"📊 **Insight:** Top {result['events_removed']} event systems account for {abs(result['p75_pct']):.1f}% of P75 TTM\n\n")
     
-    output += "---\n\n"
+    output.append("---\n\n")
 
 # Summary comparison table
-output += """## Summary: Cumulative Removal Comparison Table
+output.append("""## Summary: Cumulative Removal Comparison Table
 
 | Rank | Events Removed | Incidents Removed | % of Total | P75 TTM (min) | Δ P75 (min) | Δ P75 (%) | Remaining |
 |------|----------------|-------------------|------------|---------------|-------------|-----------|-----------|
-"""
+""")
 
 for result in cumulative_results[:15]:
-    output += f"| {result['rank']} | {result['events_removed']} | {result['total_incidents_removed']} | {result['pct_removed']:.1f}% | {result['p75']:.1f} | {result['p75_delta']:+.1f} | {result['p75_pct']:+.1f}% | {result['remaining']} |\n"
+    output.append(f"| {result['rank']} | {result['events_removed']} | {result['total_incidents_removed']} | {result['pct_removed']:.1f}% | {result['p75']:.1f} | {result['p75_delta']:+.1f} | {result['p75_pct']:+.1f}% | {result['remaining']} |\n")
 
-output += "\n---\n\n"
+output.append("\n---\n\n")
 
 # Top event systems summary
-output += """## Top Event Systems Summary (Top 10 by Impact)
+output.append("""## Top Event Systems Summary (Top 10 by Impact)
 
 | Rank | Event ID | Service | Cascades | Total TTM | P75 Impact | P75 Δ % |
 |------|----------|---------|----------|-----------|------------|---------|
-"""
+""")
 
 for idx, event in enumerate(event_impacts[:10], 1):
-    output += f"| {idx} | {int(event['root_id'])} | {event['service'][:30]} | {event['cascade_count']} | {event['total_ttm']:.0f} min | {event['p75_delta']:+.1f} min | {event['p75_pct']:+.1f}% |\n"
+    output.append(f"| {idx} | {int(event['root_id'])} | {event['service'][:30]} | {event['cascade_count']} | {event['total_ttm']:.0f} min | {event['p75_delta']:+.1f} min | {event['p75_pct']:+.1f}% |\n")
 
-output += "\n---\n\n"
+output.append("\n---\n\n")
 
 # Key insights
-output += f"""## Key Insights & Recommendations
+output.append(f"""## Key Insights & Recommendations
 
 ### Impact Concentration
 
-"""
+""")
 
 if len(cumulative_results) > 0:
     top1_impact = cumulative_results[0]['p75_pct']
     top5_impact = cumulative_results[4]['p75_pct'] if len(cumulative_results) > 4 else cumulative_results[-1]['p75_pct']
     top10_impact = cumulative_results[9]['p75_pct'] if len(cumulative_results) > 9 else cumulative_results[-1]['p75_pct']
     
-    output += f"""- **Single Most Impactful Event:** {abs(top1_impact):.1f}% of P75 TTM
+    output.append(f"""- **Single Most Impactful Event:** {abs(top1_impact):.1f}% of P75 TTM
 - **Top 5 Event Systems:** {abs(top5_impact):.1f}% of P75 TTM ({cumulative_results[4]['total_incidents_removed'] if len(cumulative_results) > 4 else cumulative_results[-1]['total_incidents_removed']} incidents)
 - **Top 10 Event Systems:** {abs(top10_impact):.1f}% of P75 TTM ({cumulative_results[9]['total_incidents_removed'] if len(cumulative_results) > 9 else cumulative_results[-1]['total_incidents_removed']} incidents)
 
@@ -323,14 +340,14 @@ This demonstrates **extreme tail risk concentration** where a small number of ev
 
 ### Cascading Analysis
 
-"""
+""")
 
 events_with_cascades = len([e for e in event_impacts if e['cascade_count'] > 0])
 total_cascade_incidents = sum([e['cascade_count'] for e in event_impacts])
 max_cascade = max([e['cascade_count'] for e in event_impacts])
 avg_cascade = total_cascade_incidents / len(event_impacts)
 
-output += f"""- **Event Systems with Cascades:** {events_with_cascades} ({events_with_cascades/len(event_impacts)*100:.1f}%)
+output.append(f"""- **Event Systems with Cascades:** {events_with_cascades} ({events_with_cascades/len(event_impacts)*100:.1f}%)
 - **Total Cascading Outages:** {cascading_outages}
 - **Maximum Cascade Depth:** {max_cascade} outages from single event
 - **Average Cascades per Event System:** {avg_cascade:.1f}
@@ -358,14 +375,15 @@ Preventing high-impact events eliminates not just the root incident but all down
 **Methodology:** Event systems identified via RootResponsibleIncidentId (all levels)  
 **Total Event Systems Analyzed:** {len(event_impacts)}  
 **Baseline Dataset:** {baseline_count} incidents from October 2025  
-"""
+""")
 
 # Write output
+report = ''.join(output)
 with open("WhatIf.md", "w", encoding="utf-8") as f:
-    f.write(output)
+    f.write(report)
 
 # Summary stats
-line_count = len(output.split('\n'))
+line_count = len(report.split('\n'))
 
 print(f"\n✅ Created WhatIf.md with event system analysis")
 print(f"  - Total lines: {line_count}")
@@ -5,9 +5,14 @@ Provides detailed counts, percentages, and incident citations
 
 import pandas as pd
 import numpy as np
+from ttm_data import load_ttm_data
+from ttm_tagger import HOW_FIXED, HOW_FIXED_EXACT, KeywordTagger
 
 # Read data
-df = pd.read_csv('october_2025_ttm_filtered.csv', encoding='utf-8-sig')
+df = load_ttm_data('october_2025_ttm_filtered.csv', columns=[
+    'OutageIncidentId', 'RootResponsibleIncidentId', 'ServiceName', 'Severity', 'TTM', 'TTO',
+    'RootCauseCategory', 'RootCauses', 'Symptoms', 'HowFixed', 'MitigationDescription'
+])
 
 print("="*80)
 print("OCTOBER 2025 TTM ANALYSIS - DETAILED EXECUTIVE SUMMARY")
@@ -97,6 +102,14 @@ for idx, (_, event) in enumerate(top_events.iterrows(), 1):
 # Question 4: P75 TTM if we remove TTO
 print(f"\n4. P75 TTM ANALYSIS: DETECTION vs MITIGATION")
 df['Mitigation_Time'] = df['TTM'] - df['TTO']
+
+# Tag HowFixed once (automation / ad-hoc / TSG) so the groups below are bit tests
+# (Automation and TSG in exact case, ad-hoc in any case)
+how_fixed_tagger = KeywordTagger({'HowFixedTags': HOW_FIXED, 'HowFixedExactTags': HOW_FIXED_EXACT},
+                                 case_sensitive=['HowFixedExactTags'])
+how_fixed_tags = how_fixed_tagger.tag(df['HowFixed'])
+df['HowFixedTags'] = how_fixed_tags['HowFixedTags']
+df['HowFixedExactTags'] = how_fixed_tags['HowFixedExactTags']
 mitigation_p75 = df['Mitigation_Time'].quantile(0.75)
 tto_p75 = df['TTO'].quantile(0.75)
 ttm_p75 = df['TTM'].quantile(0.75)
@@ -128,10 +141,10 @@ print("A. AUTOMATION GAPS")
 print(f"{'='*80}")
 
 # Automation analysis
-automation_high = high_mit[high_mit['HowFixed'].str.contains('Automation', na=False)]
-automation_normal = normal_mit[normal_mit['HowFixed'].str.contains('Automation', na=False)]
-adhoc_high = high_mit[high_mit['HowFixed'].str.contains('Ad-Hoc', case=False, na=False)]
-adhoc_normal = normal_mit[normal_mit['HowFixed'].str.contains('Ad-Hoc', case=False, na=False)]
+automation_high = high_mit[how_fixed_tagger.has('HowFixedExactTags', high_mit['HowFixedExactTags'], 'automation')]
+automation_normal = normal_mit[how_fixed_tagger.has('HowFixedExactTags', normal_mit['HowFixedExactTags'], 'automation')]
+adhoc_high = high_mit[how_fixed_tagger.has('HowFixedTags', high_mit['HowFixedTags'], 'adhoc')]
+adhoc_normal = normal_mit[how_fixed_tagger.has('HowFixedTags', normal_mit['HowFixedTags'], 'adhoc')]
 
 print(f"\nAutomation-Resolved Incidents:")
 print(f"  High Mitigation: {len(automation_high)}/{len(high_mit)} ({len(automation_high)/len(high_mit)*100:.1f}%)")
@@ -195,7 +208,7 @@ print(f"\n{'='*80}")
 print("C. SERVICE-SPECIFIC PATTERNS")
 print(f"{'='*80}")
 
-service_high = high_mit.groupby('ServiceName').agg({
+service_high = high_mit.groupby('ServiceName', observed=True).agg({
     'Mitigation_Time': ['count', 'mean', 'sum'],
     'OutageIncidentId': lambda x: list(x)
 }).round(0)
@@ -223,7 +236,7 @@ print("D. SEVERITY ANALYSIS")
 print(f"{'='*80}")
 
 print(f"\nHigh Mitigation Time by Severity:")
-for sev in sorted(high_mit['Severity'].unique()):
+for sev in sorted(high_mit['Severity'].dropna().unique()):
     sev_incidents = high_mit[high_mit['Severity'] == sev]
     count = len(sev_incidents)
     pct = count / len(high_mit) * 100
@@ -239,8 +252,8 @@ print(f"\n{'='*80}")
 print("E. PROCESS GAPS: TSG vs Ad-Hoc Resolution")
 print(f"{'='*80}")
 
-tsg_high = high_mit[high_mit['HowFixed'].str.contains('TSG', na=False)]
-tsg_normal = normal_mit[normal_mit['HowFixed'].str.contains('TSG', na=False)]
+tsg_high = high_mit[how_fixed_tagger.has('HowFixedExactTags', high_mit['HowFixedExactTags'], 'tsg')]
+tsg_normal = normal_mit[how_fixed_tagger.has('HowFixedExactTags', normal_mit['HowFixedExactTags'], 'tsg')]
 
 print(f"\nTSG-Resolved Incidents:")
 print(f"  High Mitigation: {len(tsg_high)}/{len(high_mit)} ({len(tsg_high)/len(high_mit)*100:.1f}%)")
@@ -1,6 +1,10 @@
 import pandas as pd
+from ttm_data import load_ttm_data
 
-df = pd.read_csv('october_2025_ttm_full_month.csv')
+df = load_ttm_data('october_2025_ttm_full_month.csv', columns=[
+    'OutageIncidentId', 'ServiceName', 'TTM', 'Severity', 'CreatedDate', 'MitigatedDate',
+    'Impacts', 'Symptoms', 'RootCauses', 'HowFixed'
+])
 
 # Get the 3 incidents
 incident_ids = [694602140, 694752515, 694624704]
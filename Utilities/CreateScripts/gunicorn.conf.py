@@ -0,0 +1,40 @@
+"""
+Gunicorn Settings for the TTM Dashboard
+Serves ttm_dashboard.py with several worker processes. The app (data load,
+preprocessing and filter index) is loaded once in the master and the workers
+are forked from it, so they share the loaded data copy-on-write instead of each
+re-parsing the export.
+
+Run from the month folder (e.g. OctTTM):
+    gunicorn -c ../Utilities/CreateScripts/gunicorn.conf.py
+"""
+
+import gc
+import multiprocessing
+import os
+
+wsgi_app = "ttm_dashboard:server"
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+
+bind = os.environ.get("TTM_DASHBOARD_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("TTM_DASHBOARD_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = "gthread"
+threads = int(os.environ.get("TTM_DASHBOARD_THREADS", 4))
+timeout = 120
+
+# Load the app before forking so every worker shares the master's pages
+preload_app = True
+
+accesslog = "-"
+
+
+def when_ready(server):
+    """Move the loaded objects out of the garbage collector's reach before forking,
+    so collections in the workers do not touch (and copy) the shared pages"""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Start the dataset watcher in each worker; the master only loads the data"""
+    import ttm_dashboard
+    ttm_dashboard.datasets.ensure_watching()
@@ -0,0 +1,399 @@
+"""
+Run Full TTM Analysis
+Pipeline runner for a month's report regeneration. Each stage declares the script
+it runs and the files it reads and writes; stages are ordered by those
+dependencies (export -> metrics -> reports/visualizations -> presentation).
+
+A stage is skipped when the content hashes of its inputs (including its own
+script and the shared ttm_data/ttm_metrics modules) match the last successful
+run and all of its outputs exist. Independent stages run in parallel, each in
+its own Python process, with the month folder as working directory.
+
+Run from the month folder (e.g. OctTTM):
+    python ../Utilities/CreateScripts/run_full_analysis.py
+    python ../Utilities/CreateScripts/run_full_analysis.py --jobs 4 --force
+    python ../Utilities/CreateScripts/run_full_analysis.py narrative --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+UTILITIES_DIR = SCRIPTS_DIR.parent
+
+STATE_FILE = ".pipeline_state.json"
+LOG_FILE = "workflow_execution_log.json"
+MONTH = "October 2025"
+
+EXPORT_CSV = "october_2025_ttm_full_month.csv"
+METRICS_BUNDLE = "october_2025_ttm_full_month.metrics.json"
+
+# Shared modules every analysis stage imports; editing them re-runs the stages
+SHARED_MODULES = [SCRIPTS_DIR / "ttm_data.py", SCRIPTS_DIR / "ttm_metrics.py"]
+
+# Pipeline stages. Inputs/outputs are relative to the month folder; an input that
+# no stage produces is a source file, and a stage whose source files are missing
+# is skipped (e.g. the comparison when there is no September export).
+STAGES = [
+    {
+        "name": "export",
+        "description": "Query and CSV Generation",
+        "script": UTILITIES_DIR / "execute_kusto_query_to_csv.py",
+        "inputs": [UTILITIES_DIR / "ttm_query.csl"],
+        "outputs": [EXPORT_CSV],
+        "manual": True  # needs interactive Azure sign-in; only runs with --with-export
+    },
+    {
+        "name": "metrics",
+        "description": "Metrics Bundle",
+        "script": SCRIPTS_DIR / "ttm_metrics.py",
+        "args": [EXPORT_CSV],
+        "inputs": [EXPORT_CSV],
+        "outputs": [METRICS_BUNDLE]
+    },
+    {
+        "name": "summary",
+        "description": "Summary Statistics",
+        "script": SCRIPTS_DIR / "create_summary.py",
+        "inputs": [EXPORT_CSV, METRICS_BUNDLE],
+        "outputs": ["October_Summary_Statistics.md"]
+    },
+    {
+        "name": "key_metrics",
+        "description": "Key Metrics",
+        "script": SCRIPTS_DIR / "create_metrics.py",
+        "inputs": [EXPORT_CSV, METRICS_BUNDLE],
+        "outputs": ["October_Key_Metrics.md"]
+    },
+    {
+        "name": "comparison",
+        "description": "Month-over-Month Comparison",
+        "script": SCRIPTS_DIR / "create_comparison.py",
+        "inputs": [EXPORT_CSV, METRICS_BUNDLE, "../SeptTTM/september_ttm_analysis.csv"],
+        "outputs": ["October_vs_September_Comparison.md"]
+    },
+    {
+        "name": "narrative",
+        "description": "Comprehensive Narrative",
+        "script": SCRIPTS_DIR / "create_narrative.py",
+        "inputs": [EXPORT_CSV, METRICS_BUNDLE],
+        "outputs": ["October_Narrative.md"]
+    },
+    {
+        "name": "visualizations",
+        "description": "Visualizations",
+        "script": SCRIPTS_DIR / "create_visualizations.py",
+        "inputs": [EXPORT_CSV],
+        "outputs": ["October_TTM_Distribution.png", "October_Top_Services.png",
+                    "October_Daily_Timeline.png", "October_Severity_Distribution.png"]
+    },
+    {
+        "name": "whatif",
+        "description": "What-If Event Analysis",
+        "script": SCRIPTS_DIR / "create_whatif.py",
+        "inputs": [EXPORT_CSV],
+        "outputs": ["WhatIf.md"]
+    },
+    {
+        "name": "whatif_plot",
+        "description": "What-If Cumulative Charts",
+        "script": SCRIPTS_DIR / "create_whatif_plot.py",
+        "inputs": [],
+        "outputs": ["WhatIf_Cumulative_Impact.png", "WhatIf_Cumulative_Marginal.png"]
+    },
+    {
+        "name": "presentation",
+        "description": "PowerPoint Presentation",
+        "script": SCRIPTS_DIR / "create_presentation_v2.py",
+        "inputs": ["October_TTM_Distribution.png", "October_Top_Services.png",
+                   "October_Daily_Timeline.png", "October_Severity_Distribution.png",
+                   "WhatIf_Cumulative_Impact.png", "WhatIf_Cumulative_Marginal.png"],
+        "outputs": ["October_2025_TTM_Analysis.pptx"]
+    }
+]
+
+
+def stage_dependencies(stages):
+    """Map each stage name to the stages producing its inputs"""
+    producers = {}
+    for stage in stages:
+        for output in stage["outputs"]:
+            producers[str(output)] = stage["name"]
+    return {stage["name"]: sorted({producers[str(i)] for i in stage["inputs"] if str(i) in producers} - {stage["name"]})
+            for stage in stages}
+
+
+def topological_order(stages, deps):
+    """Stage names in an order where every stage follows its dependencies"""
+    order, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle at stage '{name}'")
+        visiting.add(name)
+        for dep in deps[name]:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for stage in stages:
+        visit(stage["name"])
+    return order
+
+
+class FileHasher:
+    """SHA-256 of file contents, reusing earlier hashes while size and mtime are unchanged"""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def hash(self, path):
+        path = Path(path)
+        if not path.exists():
+            return None
+        stat = path.stat()
+        key = str(path.resolve())
+        cached = self.known.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        self.known[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+        return digest.hexdigest()
+
+
+def stage_fingerprint(stage, hasher, workdir):
+    """Combined hash of a stage's script, shared modules, arguments and input files"""
+    files = [stage["script"]] + SHARED_MODULES + list(stage["inputs"])
+    parts = {str(f): hasher.hash(workdir / f) for f in files}
+    parts["args"] = stage.get("args", [])
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_state(workdir):
+    path = workdir / STATE_FILE
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"stages": {}, "files": {}}
+
+
+def save_state(workdir, state):
+    with open(workdir / STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def run_stage(stage, workdir, timeout=None):
+    """Run one stage's script in its own Python process; returns (returncode, seconds, output tail)
+
+    Raises subprocess.TimeoutExpired if the script runs longer than `timeout` seconds.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(stage["script"])] + [str(a) for a in stage.get("args", [])],
+        cwd=workdir, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=timeout,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SCRIPTS_DIR), os.environ.get("PYTHONPATH")])))
+    )
+    output = (result.stdout + result.stderr).strip().splitlines()
+    return result.returncode, time.perf_counter() - started, output[-15:]
+
+
+def write_execution_log(workdir, state):
+    """Write workflow_execution_log.json from the recorded stage runs and the metrics bundle"""
+    steps = []
+    for number, stage in enumerate([s for s in STAGES if s["name"] in state["stages"]], 1):
+        record = state["stages"][stage["name"]]
+        steps.append({
+            "step": number,
+            "stage": stage["name"],
+            "description": stage["description"],
+            "script": Path(stage["script"]).name,
+            "outputs": [str(o) for o in stage["outputs"]],
+            "status": record.get("status"),
+            "last_run": record.get("finished"),
+            "seconds": record.get("seconds")
+        })
+
+    log_data = {
+        "timestamp": datetime.now().isoformat(),
+        "month": MONTH,
+        "workflow": "run_full_analysis.py",
+        "status": "failed" if any(s["status"] == "failed" for s in steps) else "completed",
+        "steps_completed": steps
+    }
+
+    bundle_path = workdir / METRICS_BUNDLE
+    if bundle_path.exists():
+        with open(bundle_path, "r", encoding="utf-8") as f:
+            metrics = json.load(f)
+        ttm = metrics["overall"].get("TTM", {})
+        log_data["key_metrics"] = {
+            "total_incidents": metrics["rows"],
+            "mean_ttm_minutes": round(ttm["mean"]) if ttm.get("mean") is not None else None,
+            "median_ttm_minutes": round(ttm["p50"]) if ttm.get("p50") is not None else None,
+            "p75_ttm_minutes": round(ttm["p75"]) if ttm.get("p75") is not None else None,
+            "severity_2_count": metrics["counts"]["severity_2"]
+        }
+
+    with open(workdir / LOG_FILE, "w", encoding="utf-8") as f:
+        json.dump(log_data, f, indent=2)
+    return workdir / LOG_FILE
+
+
+def select_stages(targets, deps, with_export):
+    """Requested stages plus everything they depend on"""
+    selected = set()
+
+    def add(name):
+        if name not in selected:
+            selected.add(name)
+            for dep in deps[name]:
+                add(dep)
+
+    for name in targets or [s["name"] for s in STAGES]:
+        add(name)
+    if not with_export:
+        selected -= {s["name"] for s in STAGES if s.get("manual")}
+    return selected
+
+
+def run_pipeline(workdir, targets=None, jobs=None, force=False, with_export=False, dry_run=False):
+    """Run the out-of-date stages, in parallel where dependencies allow. Returns True if nothing failed."""
+    stages = {s["name"]: s for s in STAGES}
+    deps = stage_dependencies(STAGES)
+    order = topological_order(STAGES, deps)
+    selected = select_stages(targets, deps, with_export)
+
+    state = load_state(workdir)
+    hasher = FileHasher(state.get("files"))
+    produced = {str(o) for s in STAGES if s["name"] in selected for o in s["outputs"]}
+
+    print("=" * 80)
+    print(f"TTM ANALYSIS PIPELINE - {MONTH}")
+    print("=" * 80)
+    print(f"Working directory: {workdir}")
+    print(f"Stages: {', '.join(n for n in order if n in selected)}")
+
+    status = {}
+    pending = [n for n in order if n in selected]
+    running = {}
+
+    def ready(name):
+        return all(status.get(d) in ("ran", "skipped") for d in deps[name] if d in selected)
+
+    def blocked(name):
+        return any(status.get(d) in ("failed", "blocked", "missing") for d in deps[name] if d in selected)
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        while pending or running:
+            for name in list(pending):
+                stage = stages[name]
+                if blocked(name):
+                    status[name] = "blocked"
+                    pending.remove(name)
+                    print(f"⏭️  {name}: blocked by a failed dependency")
+                    continue
+                if not ready(name):
+                    continue
+                pending.remove(name)
+
+                missing = [str(i) for i in stage["inputs"]
+                           if str(i) not in produced and not (workdir / i).exists()]
+                if missing:
+                    status[name] = "missing"
+                    print(f"⚠️  {name}: skipped, missing input(s): {', '.join(missing)}")
+                    continue
+
+                fingerprint = stage_fingerprint(stage, hasher, workdir)
+                previous = state["stages"].get(name, {})
+                outputs_exist = all((workdir / o).exists() for o in stage["outputs"])
+                if not force and previous.get("fingerprint") == fingerprint and outputs_exist:
+                    status[name] = "skipped"
+                    print(f"✅ {name}: up to date")
+                    continue
+
+                if dry_run:
+                    status[name] = "ran"
+                    print(f"🔄 {name}: would run {Path(stage['script']).name}")
+                    continue
+
+                print(f"🔄 {name}: running {Path(stage['script']).name}...")
+                running[executor.submit(run_stage, stage, workdir)] = name
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                returncode, seconds, tail = future.result()
+                record = {"finished": datetime.now().isoformat(), "seconds": round(seconds, 2)}
+                if returncode == 0:
+                    status[name] = "ran"
+                    # Hash after the run so the stage's own outputs are not part of its fingerprint
+                    record.update(status="completed", fingerprint=stage_fingerprint(stages[name], hasher, workdir))
+                    print(f"   ✅ {name} finished in {seconds:.1f}s")
+                else:
+                    status[name] = "failed"
+                    record.update(status="failed", fingerprint=None)
+                    print(f"   ❌ {name} failed (exit code {returncode}) after {seconds:.1f}s:")
+                    for line in tail:
+                        print(f"      {line}")
+                state["stages"][name] = record
+
+    if not dry_run:
+        state["files"] = hasher.known
+        save_state(workdir, state)
+        log_path = write_execution_log(workdir, state)
+        print(f"\n📝 Execution log: {log_path}")
+
+    counts = {s: sum(1 for v in status.values() if v == s) for s in ("ran", "skipped", "failed", "blocked", "missing")}
+    print(f"\n{'='*80}")
+    print(f"Ran {counts['ran']}, up to date {counts['skipped']}, failed {counts['failed']}, "
+          f"blocked {counts['blocked']}, missing inputs {counts['missing']}")
+    print("=" * 80)
+    return counts["failed"] == 0 and counts["blocked"] == 0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Regenerate a month's TTM reports, re-running only what changed")
+    parser.add_argument("stages", nargs="*", metavar="stage",
+                        help=f"Stages to bring up to date, with their dependencies (default: all). "
+                             f"Choices: {', '.join(s['name'] for s in STAGES)}")
+    parser.add_argument("--workdir", type=Path, default=Path.cwd(),
+                        help="Month folder holding the export and reports (default: current directory)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Stages to run in parallel (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-run stages even if they are up to date")
+    parser.add_argument("--with-export", action="store_true",
+                        help="Include the Kusto export stage (requires Azure sign-in)")
+    parser.add_argument("--dry-run", action="store_true", help="Show which stages would run without running them")
+    args = parser.parse_args()
+    unknown = [name for name in args.stages if name not in {s["name"] for s in STAGES}]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    return args
+
+
+def main():
+    args = parse_args()
+    ok = run_pipeline(args.workdir.resolve(), args.stages, args.jobs, args.force, args.with_export, args.dry_run)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,230 @@
+"""
+TTM Benchmark
+Times the toolkit on synthetic months (ttm_synthetic.py) of increasing size:
+generating and loading the export, building the dashboard dataset and its
+callback work for a few filter states, and the report, what-if and regression
+scripts run as pipeline stages. Results are written to JSON so runs can be
+compared after a change.
+
+Each size gets its own month folder holding the synthetic export (and the
+filtered copy the regression script reads); scripts run there in their own
+process, with a timeout so a slow stage at 1M rows does not stall the run.
+
+Run:
+    python ttm_benchmark.py                                   # 1k, 100k and 1M incidents
+    python ttm_benchmark.py --sizes 1000 100000 --compare ttm_benchmark_20251101_120000.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from run_full_analysis import EXPORT_CSV, SCRIPTS_DIR, STAGES, run_stage
+from ttm_data import load_ttm_data, parquet_path_for
+from ttm_synthetic import generate_incidents, write_incidents
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+STAGE_TIMEOUT = 1800
+
+# Filtered export read by the regression and automation scripts
+FILTERED_CSV = Path("data") / "october_2025_ttm_filtered.csv"
+
+# Pipeline stages timed per size, plus the regression model (not a pipeline stage)
+SCRIPT_STAGES = [s for s in STAGES if s["name"] in ("metrics", "summary", "key_metrics", "narrative",
+                                                     "visualizations", "whatif")] + [
+    {"name": "regression", "script": SCRIPTS_DIR / "create_mitigation_regression_model.py"}
+]
+
+# Dashboard filter states, as overrides of the initial filters
+FILTER_STATES = {
+    'all': {},
+    'sev2': {'severities': [2]},
+    'no_cascades': {'exclude_cascade': ['exclude']},
+    'ttm_range': {'ttm_range': [30, 600]},  # narrower than the month: charts fall back to the rows
+}
+
+
+def timed(results, name, func):
+    """Call func(), storing its wall time (or its error) under `name`; returns its result"""
+    started = time.perf_counter()
+    try:
+        value = func()
+    except Exception as e:
+        results[name] = {'seconds': time.perf_counter() - started, 'error': f"{type(e).__name__}: {e}"}
+        return None
+    results[name] = {'seconds': time.perf_counter() - started}
+    return value
+
+
+def prepare_month(workdir, size, seed, results):
+    """Write a synthetic month of `size` incidents into `workdir` and time loading it"""
+    workdir.mkdir(parents=True, exist_ok=True)
+    csv_path = workdir / EXPORT_CSV
+    df = timed(results, 'generate', lambda: generate_incidents(size, seed=seed))
+    timed(results, 'write', lambda: write_incidents(df, csv_path))
+
+    filtered = workdir / FILTERED_CSV
+    filtered.parent.mkdir(exist_ok=True)
+    shutil.copyfile(csv_path, filtered)
+    if parquet_path_for(csv_path).exists():
+        shutil.copyfile(parquet_path_for(csv_path), parquet_path_for(filtered))
+
+    timed(results, 'load_csv', lambda: load_ttm_data(csv_path, prefer_parquet=False))
+    if parquet_path_for(csv_path).exists():
+        timed(results, 'load_parquet', lambda: load_ttm_data(csv_path))
+    return csv_path
+
+
+def initial_filters(dataset, **overrides):
+    """The dashboard's filter-store filters right after loading `dataset`, with overrides"""
+    filters = {
+        'start_date': dataset.start.date().isoformat() if pd.notna(dataset.start) else None,
+        'end_date': dataset.end.date().isoformat() if pd.notna(dataset.end) else None,
+        'exclude_cascade': [], 'exclude_bcdr': ['exclude'],
+        'severities': [], 'services': [], 'ttm_range': [0, dataset.ttm_max],
+        'quintiles': [], 'critsit': 'All', 'p70p80': False, 'event': 'All',
+        'chart': {}, 'dataset': dataset.name
+    }
+    filters.update(overrides)
+    return filters
+
+
+def bench_dashboard(csv_path, size, results):
+    """Time the dashboard's dataset build and, per filter state, the work behind each panel
+
+    Every filter state is new to the dataset's caches, so each step is a cache miss.
+    """
+    # The dashboard loads its data folder on import: point it at this month
+    os.environ.setdefault('TTM_DASHBOARD_DATA_DIR', str(csv_path.parent))
+    import ttm_dashboard as dashboard
+
+    dataset = timed(results, 'dashboard_build',
+                    lambda: dashboard.build_dataset(csv_path, name='benchmark', version=str(size)))
+    if dataset is None:
+        return
+    for state, overrides in FILTER_STATES.items():
+        key = dashboard.filter_key(initial_filters(dataset, **overrides))
+        timed(results, f'dashboard_{state}_rows', lambda: dashboard.filtered_rows(dataset, key))
+        fdf = timed(results, f'dashboard_{state}_frame', lambda: dashboard.filtered_frame(dataset, key))
+        if fdf is None:
+            continue
+        timed(results, f'dashboard_{state}_cards',
+              lambda: dashboard.build_cards(fdf, dashboard.filtered_sorted(dataset, key)))
+        timed(results, f'dashboard_{state}_charts',
+              lambda: dashboard.build_charts(dashboard.chart_aggregates(dataset, key)))
+        timed(results, f'dashboard_{state}_service_analysis', lambda: dashboard.build_service_analysis(fdf))
+        timed(results, f'dashboard_{state}_pattern_analysis', lambda: dashboard.build_pattern_analysis(fdf))
+
+
+def bench_scripts(workdir, results, timeout):
+    """Run each script stage in the month folder, in pipeline order"""
+    for stage in SCRIPT_STAGES:
+        name = f"script_{stage['name']}"
+        try:
+            returncode, seconds, output = run_stage(stage, workdir, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            results[name] = {'seconds': timeout, 'timeout': True}
+            continue
+        results[name] = {'seconds': seconds, 'returncode': returncode}
+        if returncode != 0:
+            results[name]['output'] = output[-3:]
+
+
+def run_benchmark(sizes, workdir, seed=0, timeout=STAGE_TIMEOUT, dashboard=True, scripts=True, keep=False):
+    """Benchmark every size; returns the results document"""
+    document = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'packages': {'pandas': pd.__version__, 'numpy': np.__version__},
+        'seed': seed,
+        'results': {}
+    }
+    for size in sizes:
+        print(f"\n{'=' * 80}\nBenchmarking {size:,} incidents\n{'=' * 80}")
+        results = {}
+        month_dir = workdir / f"n{size}"
+        csv_path = prepare_month(month_dir, size, seed, results)
+        if dashboard:
+            bench_dashboard(csv_path, size, results)
+        if scripts:
+            bench_scripts(month_dir, results, timeout)
+        if not keep:
+            shutil.rmtree(month_dir, ignore_errors=True)
+        document['results'][str(size)] = results
+        print_results(size, results)
+    return document
+
+
+def status(entry):
+    if entry.get('timeout'):
+        return 'timeout'
+    if entry.get('error') or entry.get('returncode', 0) != 0:
+        return 'failed'
+    return ''
+
+
+def print_results(size, results, previous=None):
+    """Table of stage times for one size, against a previous run's when given"""
+    for name, entry in results.items():
+        line = f"  {name:<40} {entry['seconds']:>10.3f}s {status(entry)}"
+        before = (previous or {}).get(name)
+        if before and not status(before) and not status(entry) and before['seconds'] > 0:
+            line += f"   was {before['seconds']:.3f}s ({entry['seconds'] / before['seconds']:.2f}x)"
+        print(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the TTM toolkit on synthetic incidents")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Incident counts to benchmark (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results JSON (default: ttm_benchmark_<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous results JSON to compare against")
+    parser.add_argument("--workdir", type=Path, default=None,
+                        help="Folder for the synthetic months (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic months after the run")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic data (default: 0)")
+    parser.add_argument("--timeout", type=int, default=STAGE_TIMEOUT,
+                        help=f"Seconds before a script stage is stopped (default: {STAGE_TIMEOUT})")
+    parser.add_argument("--skip-dashboard", action="store_true", help="Do not time the dashboard")
+    parser.add_argument("--skip-scripts", action="store_true", help="Do not time the script stages")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="ttm_benchmark_"))
+    document = run_benchmark(args.sizes, workdir.resolve(), args.seed, args.timeout,
+                             dashboard=not args.skip_dashboard, scripts=not args.skip_scripts, keep=args.keep)
+
+    output = args.output or Path(f"ttm_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"\n✅ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)['results']
+        print(f"\nCompared with {args.compare}:")
+        for size, results in document['results'].items():
+            print(f"\n{int(size):,} incidents")
+            print_results(size, results, previous.get(size))
+    if not args.workdir and not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
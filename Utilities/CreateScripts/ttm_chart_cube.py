@@ -0,0 +1,108 @@
+"""
+TTM Chart Cube
+Aggregates for the dashboard charts over the main filter dimensions (severity,
+quintile and flag columns, plus the one dimension a chart is drawn over), built
+once per dataset so a filtered chart reads a slice of a cube instead of scanning
+incident rows.
+
+Every distinct combination of dimension values is one cell holding its incident
+count, the count and sum of a value column (TTM) and, optionally, a histogram of
+that value over fixed bins (stored for the non-empty cell/bin pairs only).
+Filters on cube dimensions select cells with one lookup per dimension, and each
+chart is a weighted bincount over the selected cells. A cube only pays off while
+it has far fewer cells than the DataFrame has rows, so keep its dimensions few
+and coarse.
+
+Usage:
+    cube = ChartCube(df, ['Severity', 'Service'], value='TTM', bins=50)
+    cells = cube.select({'Severity': [2, 3]})
+    by_service = cube.sums('Service', cells)
+    edges, counts = cube.histogram(cells)
+    by_date = ChartCube(df, ['Severity', 'Date'], bins=None)   # no histogram
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ChartCube:
+    """Per-cell counts, value sums and value histograms over a fixed DataFrame
+
+    Missing dimension values form their own cells but never match a selection,
+    like FilterIndex.isin(). Histogram bins are fixed over the value range of the
+    whole DataFrame; with `bins=None` the cube keeps no histogram.
+    """
+
+    def __init__(self, df, dimensions, value='TTM', bins=50):
+        self.dimensions = [d for d in dimensions if d in df.columns]
+        self.labels = {}
+        self.codes = {}
+        self.missing = {}
+        row_codes = []
+        for dim in self.dimensions:
+            codes, uniques = pd.factorize(df[dim])
+            row_codes.append(codes)
+            self.labels[dim] = list(uniques)
+            self.codes[dim] = {label: code for code, label in enumerate(self.labels[dim])}
+            self.missing[dim] = bool((codes < 0).any())
+
+        stacked = np.column_stack(row_codes) if row_codes else np.zeros((len(df), 1), dtype=np.intp)
+        cells, cell_of_row = np.unique(stacked, axis=0, return_inverse=True)
+        cell_of_row = cell_of_row.reshape(-1)
+        self.cell_count = len(cells)
+        self.cells = {dim: cells[:, i] for i, dim in enumerate(self.dimensions)}
+
+        values = df[value].astype('float64').to_numpy() if value in df.columns else np.full(len(df), np.nan)
+        valid = ~np.isnan(values)
+        self.count = np.bincount(cell_of_row, minlength=self.cell_count)
+        self.value_count = np.bincount(cell_of_row, weights=valid, minlength=self.cell_count)
+        self.value_sum = np.bincount(cell_of_row, weights=np.where(valid, values, 0), minlength=self.cell_count)
+
+        low, high = (values[valid].min(), values[valid].max()) if valid.any() else (0.0, 1.0)
+        self.edges = np.linspace(low, high if high > low else low + 1, bins + 1) if bins else None
+        if bins:
+            # Bins are [e0, e1), [e1, e2), ... with the top edge in the last one, as np.histogram
+            bin_of_row = np.clip(np.searchsorted(self.edges, values[valid], side='right') - 1, 0, bins - 1)
+            pairs, pair_count = np.unique(cell_of_row[valid] * bins + bin_of_row, return_counts=True)
+            self._hist_cell, self._hist_bin, self._hist_count = pairs // bins, pairs % bins, pair_count
+
+    def select(self, allowed):
+        """Cells whose value in each dimension is one of `allowed[dim]` ({dim: values})"""
+        mask = np.ones(self.cell_count, dtype=bool)
+        for dim, values in allowed.items():
+            lookup = np.zeros(len(self.labels[dim]) + 1, dtype=bool)
+            lookup[[self.codes[dim][v] for v in values if v in self.codes[dim]]] = True
+            # Missing values have code -1, which indexes the always-False last slot
+            mask &= lookup[self.cells[dim]]
+        return mask
+
+    def covers(self, dim, values):
+        """True if selecting `values` in `dim` keeps every row (all labels, no missing values)"""
+        return not self.missing[dim] and set(self.labels[dim]) <= set(values)
+
+    def total(self, cells):
+        """Incident count of the selected cells"""
+        return int(self.count[cells].sum())
+
+    def counts(self, dim, cells):
+        """Incident count per value of `dim` over the selected cells (values with incidents only)"""
+        return self._by(dim, cells, self.count)
+
+    def sums(self, dim, cells):
+        """Value sum per value of `dim` over the selected cells (values with incidents only)"""
+        return self._by(dim, cells, self.value_sum)
+
+    def histogram(self, cells):
+        """Bin edges and the value histogram of the selected cells"""
+        bins = len(self.edges) - 1
+        selected = cells[self._hist_cell]
+        return self.edges, np.bincount(self._hist_bin[selected], weights=self._hist_count[selected],
+                                       minlength=bins).astype(np.int64)
+
+    def _by(self, dim, cells, weights):
+        codes = self.cells[dim][cells]
+        present = codes >= 0
+        totals = np.bincount(codes[present], weights=weights[cells][present], minlength=len(self.labels[dim]))
+        incidents = np.bincount(codes[present], weights=self.count[cells][present], minlength=len(self.labels[dim]))
+        keep = incidents > 0
+        return pd.Series(totals[keep], index=[label for label, k in zip(self.labels[dim], keep) if k])
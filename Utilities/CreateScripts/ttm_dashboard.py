@@ -3,116 +3,56 @@ TTM Analysis Interactive Dashboard - Simplified & Robust Version
 ================================================================
 Run: python ttm_dashboard.py
 Then open: http://127.0.0.1:8050
+
+Production (several workers sharing one preloaded copy of the data):
+    gunicorn -c ../Utilities/CreateScripts/gunicorn.conf.py
+Health check: http://<host>:8050/healthz
+Stage timings, response sizes and cache counters (per worker): http://<host>:8050/metrics
+Set TTM_DASHBOARD_DATA_DIR to serve the monthly exports of another folder (default: current directory).
+With more than one export loaded, "All months" in the Month dropdown views them together.
 """
 
+import hashlib
+import os
 import dash
-from dash import dcc, html, Input, Output
+import operator
+import time
+from dash import dash_table, dcc, html, Input, Output, State, MATCH, no_update
+from dash.exceptions import PreventUpdate
+from datetime import datetime
+from flask import g, jsonify, request
+from pathlib import Path
+from types import SimpleNamespace
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from ttm_chart_cube import ChartCube
+from ttm_data import load_ttm_data
+from ttm_dataset_manager import ALL_DATASETS, POLL_SECONDS, DatasetManager
+from ttm_filter_index import FilterIndex
+from ttm_metrics import monthly_stats, pair_stats, sorted_quantile, sorted_quintile_counts
+from ttm_partitioned_store import PartitionedStore
+from ttm_result_cache import RESULT_CACHE_SIZE, ResultCache
+from ttm_tagger import KeywordTagger
+from ttm_timings import Timings
 
 # ============================================================================
 # LOAD AND PREPARE DATA
 # ============================================================================
 
-print("Loading data...")
-df = pd.read_csv('october_2025_ttm_full_month.csv', encoding='utf-8-sig')
-print(f"Loaded {len(df)} incidents with {len(df.columns)} columns")
-
-# Map column names to standard names
-column_mapping = {
-    'OutageCreateDate': 'CreateDate',
-    'OutageIncidentId': 'IncidentId',
-    'ServiceName': 'Service',
-    'Severity': 'Severity',
-    'TTM': 'TTM',
-    'IsCritSit': 'CritSit',
-    'OwningTeamName': 'Team',
-    'ImpactedRegion': 'Region',
-    'RootCauses': 'RootCause'
-}
+# Folder holding the monthly exports (*_ttm_full_month.csv / .parquet); new or
+# re-exported months are loaded in the background while the dashboard runs
+DATA_DIR = os.environ.get('TTM_DASHBOARD_DATA_DIR', '.')
 
-# Rename columns that exist
-for old_col, new_col in column_mapping.items():
-    if old_col in df.columns:
-        df[new_col] = df[old_col]
-
-# Handle date parsing
-if 'CreateDate' in df.columns:
-    df['CreateDate'] = pd.to_datetime(df['CreateDate'], errors='coerce')
-    df['Date'] = df['CreateDate'].dt.date
-    df['Hour'] = df['CreateDate'].dt.hour
-    df['DayOfWeek'] = df['CreateDate'].dt.day_name()
-
-# Calculate metrics
-if 'TTM' in df.columns:
-    df['TTM_Quintile'] = pd.qcut(df['TTM'].fillna(0), q=5, labels=['Q1', 'Q2', 'Q3', 'Q4', 'Q5 (High)'], duplicates='drop')
-    
-    # Calculate percentiles for P70-P80 filter
-    p70 = df['TTM'].quantile(0.70)
-    p80 = df['TTM'].quantile(0.80)
-    df['IsP70P80'] = (df['TTM'] >= p70) & (df['TTM'] <= p80)
-    print(f"P70-P80 Range: {p70:.0f} - {p80:.0f} minutes ({df['IsP70P80'].sum()} incidents)")
-
-# Load exclusions
-exclusions = [694602140, 694752515, 694624704]
-if 'IncidentId' in df.columns:
-    df['IsExcluded'] = df['IncidentId'].isin(exclusions)
-    df['Dataset'] = df['IsExcluded'].map({True: 'Excluded (BCDR/EUAP)', False: 'Production'})
-else:
-    df['Dataset'] = 'Production'
-
-# Identify events (groups of incidents with same OutageCorrelationId)
-if 'OutageCorrelationId' in df.columns:
-    event_counts = df.groupby('OutageCorrelationId').size()
-    multi_incident_events = event_counts[event_counts > 1].index.tolist()
-    df['IsPartOfEvent'] = df['OutageCorrelationId'].isin(multi_incident_events)
-    df['EventSize'] = df['OutageCorrelationId'].map(event_counts)
-    print(f"Events identified: {len(multi_incident_events)} events with {df['IsPartOfEvent'].sum()} total incidents")
-else:
-    df['IsPartOfEvent'] = False
-    df['EventSize'] = 1
-
-# Pre-compute keyword matches for performance optimization
-# Root Cause themes
-if 'RootCauses' in df.columns:
-    df['has_connectivity'] = df['RootCauses'].str.lower().str.contains('connectivity|connection|network|endpoint|unreachable', na=False)
-    df['has_configuration'] = df['RootCauses'].str.lower().str.contains('configuration|config|misconfigur|setting|drift', na=False)
-    df['has_capacity'] = df['RootCauses'].str.lower().str.contains('capacity|resource|memory|cpu|throttl|scaling|exhaust', na=False)
-    df['has_deployment'] = df['RootCauses'].str.lower().str.contains('deployment|deploy|rollout|release|code change', na=False)
-    df['has_certificate'] = df['RootCauses'].str.lower().str.contains('certificate|cert|ssl|tls|authentication', na=False)
-    df['has_timeout'] = df['RootCauses'].str.lower().str.contains('timeout|latency|slow|performance', na=False)
-    df['has_dependency'] = df['RootCauses'].str.lower().str.contains('dependency|dependent|downstream|upstream|cascading', na=False)
-else:
-    for theme in ['connectivity', 'configuration', 'capacity', 'deployment', 'certificate', 'timeout', 'dependency']:
-        df[f'has_{theme}'] = False
-
-# Mitigation actions
-if 'Mitigations' in df.columns:
-    df['has_restart'] = df['Mitigations'].str.lower().str.contains('restart|reboot|recycle|bounce', na=False)
-    df['has_rollback'] = df['Mitigations'].str.lower().str.contains('rollback|revert|roll back', na=False)
-    df['has_scaling'] = df['Mitigations'].str.lower().str.contains('scal|add capacity|increase resource', na=False)
-    df['has_failover'] = df['Mitigations'].str.lower().str.contains('failover|fail over|redirect|switch', na=False)
-    df['has_config_change'] = df['Mitigations'].str.lower().str.contains('config|setting|parameter|adjust|modify', na=False)
-    df['has_traffic_mgmt'] = df['Mitigations'].str.lower().str.contains('throttle|rate limit|block|traffic|load', na=False)
-else:
-    for action in ['restart', 'rollback', 'scaling', 'failover', 'config_change', 'traffic_mgmt']:
-        df[f'has_{action}'] = False
-
-# Impact types
-if 'Impacts' in df.columns:
-    df['has_availability'] = df['Impacts'].str.lower().str.contains('availability|unavailable|down|outage', na=False)
-    df['has_performance'] = df['Impacts'].str.lower().str.contains('performance|slow|latency|delay', na=False)
-    df['has_functionality'] = df['Impacts'].str.lower().str.contains('functionality|function|feature|capabilit', na=False)
-    df['has_data_issue'] = df['Impacts'].str.lower().str.contains('data|corruption|loss|inconsisten', na=False)
-    df['has_authentication'] = df['Impacts'].str.lower().str.contains('authentication|auth|login|access denied', na=False)
-else:
-    for impact in ['availability', 'performance', 'functionality', 'data_issue', 'authentication']:
-        df[f'has_{impact}'] = False
-
-print(f"Pre-computed {18} keyword matching columns for performance optimization")
+# Export columns the dashboard reads; the rest of the export is never loaded
+SOURCE_COLUMNS = [
+    'OutageIncidentId', 'OutageCreateDate', 'ServiceName', 'OwningTeamName', 'ImpactedRegion',
+    'Severity', 'TTM', 'IsCritSit', 'IsCausedByChange', 'OutageCorrelationId',
+    'IncidentTitle', 'RootCauses', 'Mitigations', 'Impacts'
+]
 
 # Define high-entropy columns for table display (based on entropy analysis)
 TABLE_COLUMNS = [
@@ -122,19 +62,265 @@ TABLE_COLUMNS = [
     'OutageCorrelationId', 'EventSize'
 ]
 
-# Get list of events for dropdown
-if 'OutageCorrelationId' in df.columns:
-    event_list = df[df['IsPartOfEvent'] == True].groupby('OutageCorrelationId').agg({
-        'OutageIncidentId': 'count'
-    }).sort_values('OutageIncidentId', ascending=False).reset_index()
-    event_list.columns = ['EventName', 'IncidentCount']
-    EVENT_OPTIONS = [{'label': f'{row["EventName"]} ({row["IncidentCount"]} incidents)', 
-                     'value': row['EventName']} 
-                    for _, row in event_list.iterrows()]
-else:
-    EVENT_OPTIONS = []
-
-print(f"Date range: {df['CreateDate'].min()} to {df['CreateDate'].max()}" if 'CreateDate' in df.columns else "No date column found")
+# Each dataset version keeps its own result cache (row positions plus the cards,
+# charts and analysis panels per filter state) and a smaller cache of the
+# materialized frames for the latest states, which every panel callback for one
+# interaction reads
+FRAME_CACHE_SIZE = 2
+
+# Incident table: rows per server-side page, text truncation, and the
+# DataTable filter_query operators handled on the server
+TABLE_PAGE_SIZE = 50
+TABLE_TEXT_LIMIT = 100
+TABLE_FILTER_OPERATORS = [['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'],
+                          ['ne ', '!='], ['eq ', '='], ['contains '], ['datestartswith ']]
+TABLE_COMPARISONS = {'ge': operator.ge, 'le': operator.le, 'lt': operator.lt,
+                     'gt': operator.gt, 'ne': operator.ne, 'eq': operator.eq}
+
+# TTM quintile labels, for the month's quintiles and those of the current filter
+TTM_QUINTILE_LABELS = ['Q1', 'Q2', 'Q3', 'Q4', 'Q5 (High)']
+
+# Chart cubes: the coarse filter dimensions and flags every chart is aggregated over
+# (HasTTM stands for the TTM slider, which drops incidents without a TTM), the
+# fine-grained dimensions that each get a cube of their own for their chart, and
+# the TTM distribution bins. Cubes with more cells than CUBE_MAX_CELL_FRACTION of
+# the rows are slower to slice than the rows are to scan, so the dataset skips them.
+CUBE_DIMENSIONS = ['Severity', 'TTM_Quintile', 'CritSit']
+CUBE_FLAGS = ['IsPartOfEvent', 'IsExcluded', 'IsP70P80']
+CUBE_CHART_DIMENSIONS = ['Service', 'Date', 'Region']
+CUBE_MAX_CELL_FRACTION = 0.1
+TTM_HISTOGRAM_BINS = 50
+
+# Monthly trend chart: per-month aggregate columns from ttm_metrics.monthly_stats
+TREND_METRICS = [{'label': 'P75 TTM', 'value': 'TTM_p75'}, {'label': 'Median TTM', 'value': 'TTM_p50'},
+                 {'label': 'Mean TTM', 'value': 'TTM_mean'}, {'label': 'Incidents', 'value': 'incidents'}]
+
+# Keyword themes per text column (has_<tag> flags); a tag matches when any of its
+# keywords occurs in the lower-cased text
+ROOT_CAUSE_THEMES = {
+    'connectivity': ['connectivity', 'connection', 'network', 'endpoint', 'unreachable'],
+    'configuration': ['configuration', 'config', 'misconfigur', 'setting', 'drift'],
+    'capacity': ['capacity', 'resource', 'memory', 'cpu', 'throttl', 'scaling', 'exhaust'],
+    'deployment': ['deployment', 'deploy', 'rollout', 'release', 'code change'],
+    'certificate': ['certificate', 'cert', 'ssl', 'tls', 'authentication'],
+    'timeout': ['timeout', 'latency', 'slow', 'performance'],
+    'dependency': ['dependency', 'dependent', 'downstream', 'upstream', 'cascading']
+}
+MITIGATION_ACTIONS = {
+    'restart': ['restart', 'reboot', 'recycle', 'bounce'],
+    'rollback': ['rollback', 'revert', 'roll back'],
+    'scaling': ['scal', 'add capacity', 'increase resource'],
+    'failover': ['failover', 'fail over', 'redirect', 'switch'],
+    'config_change': ['config', 'setting', 'parameter', 'adjust', 'modify'],
+    'traffic_mgmt': ['throttle', 'rate limit', 'block', 'traffic', 'load']
+}
+IMPACT_TYPES = {
+    'availability': ['availability', 'unavailable', 'down', 'outage'],
+    'performance': ['performance', 'slow', 'latency', 'delay'],
+    'functionality': ['functionality', 'function', 'feature', 'capabilit'],
+    'data_issue': ['data', 'corruption', 'loss', 'inconsisten'],
+    'authentication': ['authentication', 'auth', 'login', 'access denied']
+}
+# Themes named in the Service Analysis summaries (per team and across all services)
+SUMMARY_ROOT_CAUSE_THEMES = {
+    'connectivity': ['connectivity', 'connection', 'network', 'endpoint'],
+    'configuration': ['configuration', 'config', 'misconfiguration', 'setting'],
+    'capacity': ['capacity', 'resource exhaustion', 'memory', 'cpu', 'throttling'],
+    'deployment': ['deployment', 'rollout', 'release', 'code change'],
+    'certificate': ['certificate', 'cert', 'ssl', 'tls', 'authentication'],
+    'timeout': ['timeout', 'timed out', 'latency', 'slow'],
+    'failure': ['failure', 'failed', 'error', 'exception'],
+    'dependency': ['dependency', 'dependent', 'downstream', 'upstream']
+}
+SUMMARY_MITIGATION_ACTIONS = {
+    'restart/reboot': ['restart', 'reboot', 'recycle', 'bounce'],
+    'rollback': ['rollback', 'rolled back', 'reverted', 'revert'],
+    'scaling': ['scale', 'scaled', 'scaling', 'capacity increase'],
+    'failover': ['failover', 'failed over', 'switched', 'redirected'],
+    'configuration change': ['config change', 'reconfigured', 'updated settings'],
+    'traffic management': ['traffic', 'throttle', 'rate limit', 'blocked'],
+    'repair': ['repair', 'fixed', 'patched', 'resolved'],
+    'isolation': ['isolated', 'quarantine', 'disabled', 'removed']
+}
+SUMMARY_IMPACT_TYPES = {
+    'availability': ['availability', 'downtime', 'unavailable', 'outage'],
+    'performance degradation': ['degradation', 'slow', 'latency', 'delay'],
+    'customer impact': ['customer', 'user', 'client', 'tenant'],
+    'data issues': ['data', 'data loss', 'corruption', 'inconsistency'],
+    'API failures': ['api', 'endpoint', 'request', 'call'],
+    'authentication': ['authentication', 'login', 'access', 'authorization'],
+    'service errors': ['error', 'failure', 'failed', 'exception'],
+    'regional impact': ['region', 'regional', 'geography', 'geo']
+}
+TEXT_TAGGERS = {
+    'RootCauses': KeywordTagger({'RootCauseTags': ROOT_CAUSE_THEMES,
+                                 'RootCauseSummaryTags': SUMMARY_ROOT_CAUSE_THEMES}),
+    'Mitigations': KeywordTagger({'MitigationTags': MITIGATION_ACTIONS,
+                                  'MitigationSummaryTags': SUMMARY_MITIGATION_ACTIONS}),
+    'Impacts': KeywordTagger({'ImpactTags': IMPACT_TYPES,
+                              'ImpactSummaryTags': SUMMARY_IMPACT_TYPES})
+}
+# Taxonomies unpacked into has_<tag> flags; the others stay bitset columns only
+FLAG_TAXONOMIES = ['RootCauseTags', 'MitigationTags', 'ImpactTags']
+TAXONOMY_TAGGERS = {taxonomy: tagger for tagger in TEXT_TAGGERS.values() for taxonomy in tagger.tags}
+
+def build_dataset(path, name=None, version=None):
+    """Load one monthly export and derive everything the callbacks filter and chart on"""
+    print(f"Loading {Path(path).name}...")
+    df = load_ttm_data(path, columns=SOURCE_COLUMNS)
+    print(f"Loaded {len(df)} incidents with {len(df.columns)} columns")
+    
+    # Map column names to standard names
+    column_mapping = {
+        'OutageCreateDate': 'CreateDate',
+        'OutageIncidentId': 'IncidentId',
+        'ServiceName': 'Service',
+        'Severity': 'Severity',
+        'TTM': 'TTM',
+        'IsCritSit': 'CritSit',
+        'OwningTeamName': 'Team',
+        'ImpactedRegion': 'Region',
+        'RootCauses': 'RootCause'
+    }
+    
+    # Rename columns that exist
+    for old_col, new_col in column_mapping.items():
+        if old_col in df.columns:
+            df[new_col] = df[old_col]
+    
+    # Handle date parsing
+    if 'CreateDate' in df.columns:
+        df['CreateDate'] = pd.to_datetime(df['CreateDate'], errors='coerce')
+        df['Date'] = df['CreateDate'].dt.date
+        df['Hour'] = df['CreateDate'].dt.hour
+        df['DayOfWeek'] = df['CreateDate'].dt.day_name()
+    
+    # Calculate metrics
+    if 'TTM' in df.columns:
+        df['TTM_Quintile'] = pd.qcut(df['TTM'].fillna(0), q=5, labels=TTM_QUINTILE_LABELS, duplicates='drop')
+    
+        # Calculate percentiles for P70-P80 filter
+        p70 = df['TTM'].quantile(0.70)
+        p80 = df['TTM'].quantile(0.80)
+        df['IsP70P80'] = (df['TTM'] >= p70) & (df['TTM'] <= p80)
+        print(f"P70-P80 Range: {p70:.0f} - {p80:.0f} minutes ({df['IsP70P80'].sum()} incidents)")
+    
+    # Load exclusions
+    exclusions = [694602140, 694752515, 694624704]
+    if 'IncidentId' in df.columns:
+        df['IsExcluded'] = df['IncidentId'].isin(exclusions)
+        df['Dataset'] = df['IsExcluded'].map({True: 'Excluded (BCDR/EUAP)', False: 'Production'})
+    else:
+        df['Dataset'] = 'Production'
+    
+    # Identify events (groups of incidents with same OutageCorrelationId)
+    if 'OutageCorrelationId' in df.columns:
+        event_counts = df.groupby('OutageCorrelationId').size()
+        multi_incident_events = event_counts[event_counts > 1].index.tolist()
+        df['IsPartOfEvent'] = df['OutageCorrelationId'].isin(multi_incident_events)
+        df['EventSize'] = df['OutageCorrelationId'].map(event_counts)
+        print(f"Events identified: {len(multi_incident_events)} events with {df['IsPartOfEvent'].sum()} total incidents")
+    else:
+        df['IsPartOfEvent'] = False
+        df['EventSize'] = 1
+    
+    # Pre-compute keyword tags: one scan per distinct text, kept as a bitset column
+    # per taxonomy; the filter taxonomies are also unpacked into the has_* flags
+    for column, tagger in TEXT_TAGGERS.items():
+        if column in df.columns:
+            tags = tagger.tag(df[column])
+        else:
+            tags = {taxonomy: np.zeros(len(df), dtype=np.uint8) for taxonomy in tagger.tags}
+        for taxonomy, bits in tags.items():
+            df[taxonomy] = bits
+            if taxonomy in FLAG_TAXONOMIES:
+                for tag in tagger.tags[taxonomy]:
+                    df[f'has_{tag}'] = tagger.has(taxonomy, bits, tag)
+    
+    print(f"Pre-computed {sum(len(TAXONOMY_TAGGERS[t].tags[t]) for t in TAXONOMY_TAGGERS)} keyword tags in {len(TAXONOMY_TAGGERS)} bitset columns for performance optimization")
+    
+    # Get list of events for dropdown
+    if 'OutageCorrelationId' in df.columns:
+        event_list = df[df['IsPartOfEvent'] == True].groupby('OutageCorrelationId').agg({
+            'OutageIncidentId': 'count'
+        }).sort_values('OutageIncidentId', ascending=False).reset_index()
+        event_list.columns = ['EventName', 'IncidentCount']
+        event_options = [{'label': f'{row["EventName"]} ({row["IncidentCount"]} incidents)', 
+                         'value': row['EventName']} 
+                        for _, row in event_list.iterrows()]
+    else:
+        event_options = []
+    
+    # Filter index: per-value masks and sorted range arrays for the callback filters,
+    # over only the columns the callback reads
+    keyword_columns = [c for c in df.columns if c.startswith('has_')]
+    callback_columns = list(dict.fromkeys(TABLE_COLUMNS + [
+        'CreateDate', 'Date', 'Service', 'Severity', 'TTM', 'TTM_Quintile', 'Region', 'Team', 'CritSit',
+        'IsPartOfEvent', 'IsExcluded', 'IsP70P80', 'IsCausedByChange'
+    ] + keyword_columns + list(TAXONOMY_TAGGERS)))
+    index = FilterIndex(
+        df,
+        categorical=['Severity', 'ServiceName', 'Service', 'TTM_Quintile', 'Region', 'Date', 'CritSit',
+                     'OutageCorrelationId'],
+        flags=['IsPartOfEvent', 'IsExcluded', 'IsP70P80'],
+        ranges=['CreateDate', 'TTM'],
+        columns=callback_columns
+    )
+    print(f"Built filter index over {len(df)} incidents")
+    
+    # Chart cubes: counts, TTM sums and TTM bins per combination of the coarse filter
+    # dimensions, and counts and TTM sums per chart dimension within those
+    cube, chart_cubes = None, {}
+    if 'TTM' in df.columns:
+        cube_frame = df[[c for c in CUBE_DIMENSIONS + CUBE_CHART_DIMENSIONS + ['TTM'] if c in df.columns]].copy()
+        for col in CUBE_FLAGS:
+            if col in df.columns:
+                cube_frame[col] = df[col].fillna(False).astype(bool)
+        cube_frame['HasTTM'] = df['TTM'].notna()
+        filter_dimensions = CUBE_DIMENSIONS + CUBE_FLAGS + ['HasTTM']
+        cube = ChartCube(cube_frame, filter_dimensions, value='TTM', bins=TTM_HISTOGRAM_BINS)
+        chart_cubes = {dim: ChartCube(cube_frame, filter_dimensions + [dim], value='TTM', bins=None)
+                       for dim in CUBE_CHART_DIMENSIONS if dim in cube_frame.columns}
+        cells = cube.cell_count + sum(c.cell_count for c in chart_cubes.values())
+        if cells > CUBE_MAX_CELL_FRACTION * len(df):
+            print(f"Chart cubes skipped: {cells} cells for {len(df)} incidents, charts read the rows")
+            cube, chart_cubes = None, {}
+        else:
+            print(f"Built chart cubes with {cells} cells")
+    
+    if 'CreateDate' in df.columns and df['CreateDate'].notna().any():
+        start, end = df['CreateDate'].min(), df['CreateDate'].max()
+        print(f"Date range: {start} to {end}")
+        label = start.strftime('%B %Y')
+        # Per-month aggregates read by the multi-month trend without rescanning incidents
+        monthly = monthly_stats(df, 'CreateDate', ['TTM'])
+    else:
+        start, end = pd.NaT, pd.NaT
+        print("No date column found")
+        label = name
+        monthly = pd.DataFrame()
+    
+    return SimpleNamespace(
+        name=name, version=version, label=label, sort_key=(start.isoformat() if pd.notna(start) else '', str(name)),
+        df=df, index=index, cube=cube, chart_cubes=chart_cubes, event_options=event_options,
+        start=start, end=end, loaded_at=datetime.now().isoformat(), monthly=monthly,
+        # Filter option values, kept so the combined view can merge them without the incidents
+        severities=sorted(df['Severity'].dropna().unique()),
+        services=sorted(df['Service'].dropna().unique()[:50]),
+        ttm_max=int(np.ceil(df['TTM'].max())) if 'TTM' in df.columns else 1000,
+        table_columns=[c for c in TABLE_COLUMNS if c in df.columns],
+        # Per-version caches: a reloaded export starts with empty ones
+        result_cache=ResultCache(RESULT_CACHE_SIZE), frames=ResultCache(FRAME_CACHE_SIZE)
+    )
+
+
+def combine_datasets(partitions):
+    """All loaded months as one store partitioned by month ("All months" in the dropdown)"""
+    return PartitionedStore(partitions, name=ALL_DATASETS, frame_cache_size=FRAME_CACHE_SIZE)
+
+
+datasets = DatasetManager(DATA_DIR, build=build_dataset, combine=combine_datasets)
+datasets.scan()
 print(f"Ready to start dashboard!")
 
 # ============================================================================
@@ -142,328 +328,660 @@ print(f"Ready to start dashboard!")
 # ============================================================================
 
 app = dash.Dash(__name__, title="TTM Dashboard")
+server = app.server  # WSGI entry point: gunicorn ttm_dashboard:server
+timings = Timings()  # Stage and response timings of this process, served on /metrics
 BLUE = '#0078D4'
 GRAY_BG = '#F3F2F1'
 BORDER = '#EDEBE9'
 
+# Default figure template: the look of plotly's default template without its
+# colorscales and per-trace defaults, which would otherwise be serialized into
+# every figure a callback returns
+_plotly_layout = pio.templates['plotly'].layout
+_plotly_axis = {key: _plotly_layout.xaxis[key] for key in
+                ('automargin', 'gridcolor', 'linecolor', 'ticks', 'zerolinecolor', 'zerolinewidth')}
+pio.templates['ttm'] = go.layout.Template(
+    layout=dict(colorway=_plotly_layout.colorway, font=_plotly_layout.font, hovermode=_plotly_layout.hovermode,
+                paper_bgcolor=_plotly_layout.paper_bgcolor, plot_bgcolor=_plotly_layout.plot_bgcolor,
+                xaxis=_plotly_axis, yaxis=_plotly_axis),
+    data=dict(pie=[go.Pie(automargin=True)])
+)
+pio.templates.default = 'ttm'
+
 # ============================================================================
 # LAYOUT
 # ============================================================================
 
-app.layout = html.Div([
-    # Hidden stores for interactive chart clicks
-    dcc.Store(id='chart-click-store', data={}),
+def dataset_options():
+    """Month dropdown options for the loaded datasets, oldest first, plus all months together"""
+    options = [{'label': datasets.get(name).label, 'value': name} for name in datasets.names()]
+    if len(options) > 1:
+        options.append({'label': datasets.get(ALL_DATASETS).label, 'value': ALL_DATASETS})
+    return options
+
+
+def dataset_controls(dataset):
+    """Filter options and initial values that depend on the selected dataset"""
+    has_dates = pd.notna(dataset.start)
+    return {
+        'header': f"{dataset.label} - Quality Engineering Insights",
+        'start_date': dataset.start.date() if has_dates else None,
+        'end_date': dataset.end.date() if has_dates else None,
+        'severity_options': [{'label': str(s), 'value': s} for s in dataset.severities],
+        'service_options': [{'label': s, 'value': s} for s in dataset.services],
+        'ttm_max': dataset.ttm_max,
+        'event_options': [{'label': 'All Events', 'value': 'All'}] + dataset.event_options,
+        'table_columns': [{'name': c, 'id': c} for c in dataset.table_columns]
+    }
+
+
+def serve_layout():
+    """Page layout for the latest loaded month, built per page load so a reloaded month is picked up"""
+    dataset = datasets.get()
+    controls = dataset_controls(dataset)
+
+    return html.Div([
+        # Hidden stores for interactive chart clicks and the resolved filter state
+        dcc.Store(id='chart-click-store', data={}),
+        dcc.Store(id='filter-store'),
+        dcc.Interval(id='dataset-poll', interval=POLL_SECONDS * 1000),
     
-    # Header
-    html.Div([
-        html.H1("TTM Analysis Dashboard", style={'color': 'white', 'margin': '0', 'padding': '20px'}),
-        html.P("October 2025 - Quality Engineering Insights", 
-               style={'color': 'white', 'margin': '0', 'padding': '0 20px 20px'})
-    ], style={'backgroundColor': BLUE}),
+        # Header
+        html.Div([
+            html.H1("TTM Analysis Dashboard", style={'color': 'white', 'margin': '0', 'padding': '20px'}),
+            html.P(controls['header'], id='header-month',
+                   style={'color': 'white', 'margin': '0', 'padding': '0 20px 20px'})
+        ], style={'backgroundColor': BLUE}),
     
-    # Container with flexbox layout
-    html.Div([
-        # Left Sidebar - Filters
+        # Container with flexbox layout
         html.Div([
-            html.H3("Filters", style={'color': BLUE, 'borderBottom': f'2px solid {BLUE}', 'paddingBottom': '10px'}),
-            
-            html.Label("Date Range:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            html.Div([
-                html.Label("Start:", style={'fontSize': '12px', 'marginRight': '5px'}),
-                dcc.DatePickerSingle(
-                    id='start-date-filter',
-                    date=df['CreateDate'].min().date() if 'CreateDate' in df.columns and df['CreateDate'].notna().any() else None,
-                    display_format='YYYY-MM-DD',
-                    style={'marginBottom': '5px'}
-                ),
-            ]),
+            # Left Sidebar - Filters
             html.Div([
-                html.Label("End:", style={'fontSize': '12px', 'marginRight': '5px'}),
-                dcc.DatePickerSingle(
-                    id='end-date-filter',
-                    date=df['CreateDate'].max().date() if 'CreateDate' in df.columns and df['CreateDate'].notna().any() else None,
-                    display_format='YYYY-MM-DD'
-                ),
-            ]),
+                html.H3("Filters", style={'color': BLUE, 'borderBottom': f'2px solid {BLUE}', 'paddingBottom': '10px'}),
             
-            html.Div([
-                dcc.Checklist(
-                    id='exclude-cascade-filter',
-                    options=[{'label': ' Exclude Cascade (Events)', 'value': 'exclude'}],
-                    value=[],
-                    style={'marginTop': '15px'}
-                ),
-            ]),
+                html.Label("Month:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='dataset-select', options=dataset_options(), value=dataset.name,
+                             clearable=False),
             
-            html.Div([
-                dcc.Checklist(
-                    id='exclude-bcdr-filter',
-                    options=[{'label': ' Exclude BCDR/EUAP', 'value': 'exclude'}],
-                    value=['exclude'],
-                    style={'marginTop': '5px'}
-                ),
-            ]),
+                html.Label("Date Range:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                html.Div([
+                    html.Label("Start:", style={'fontSize': '12px', 'marginRight': '5px'}),
+                    dcc.DatePickerSingle(
+                        id='start-date-filter',
+                        date=controls['start_date'],
+                        display_format='YYYY-MM-DD',
+                        style={'marginBottom': '5px'}
+                    ),
+                ]),
+                html.Div([
+                    html.Label("End:", style={'fontSize': '12px', 'marginRight': '5px'}),
+                    dcc.DatePickerSingle(
+                        id='end-date-filter',
+                        date=controls['end_date'],
+                        display_format='YYYY-MM-DD'
+                    ),
+                ]),
+            
+                html.Div([
+                    dcc.Checklist(
+                        id='exclude-cascade-filter',
+                        options=[{'label': ' Exclude Cascade (Events)', 'value': 'exclude'}],
+                        value=[],
+                        style={'marginTop': '15px'}
+                    ),
+                ]),
+            
+                html.Div([
+                    dcc.Checklist(
+                        id='exclude-bcdr-filter',
+                        options=[{'label': ' Exclude BCDR/EUAP', 'value': 'exclude'}],
+                        value=['exclude'],
+                        style={'marginTop': '5px'}
+                    ),
+                ]),
             
-            html.Label("Severity:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.Dropdown(id='severity-filter',
-                options=[{'label': str(s), 'value': s} for s in sorted(df['Severity'].dropna().unique())],
-                multi=True, placeholder='All Severities'),
+                html.Label("Severity:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='severity-filter',
+                    options=controls['severity_options'],
+                    multi=True, placeholder='All Severities'),
             
-            html.Label("Service:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.Dropdown(id='service-filter',
-                options=[{'label': s, 'value': s} for s in sorted(df['Service'].dropna().unique()[:50])],
-                multi=True, placeholder='All Services'),
+                html.Label("Service:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='service-filter',
+                    options=controls['service_options'],
+                    multi=True, placeholder='All Services'),
             
-            html.Label("TTM Range (minutes):", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.RangeSlider(id='ttm-filter',
-                min=0, max=int(df['TTM'].max()) if 'TTM' in df.columns else 1000,
-                value=[0, int(df['TTM'].max()) if 'TTM' in df.columns else 1000],
-                marks={0: '0', 180: '3h', 720: '12h', 1440: '24h'},
-                tooltip={'placement': 'bottom', 'always_visible': False}),
+                html.Label("TTM Range (minutes):", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.RangeSlider(id='ttm-filter',
+                    min=0, max=controls['ttm_max'],
+                    value=[0, controls['ttm_max']],
+                    marks={0: '0', 180: '3h', 720: '12h', 1440: '24h'},
+                    tooltip={'placement': 'bottom', 'always_visible': False}),
             
-            html.Label("Quintile:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.Dropdown(id='quintile-filter',
-                options=[{'label': q, 'value': q} for q in ['Q1', 'Q2', 'Q3', 'Q4', 'Q5 (High)']],
-                multi=True, placeholder='All Quintiles'),
+                html.Label("Quintile:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='quintile-filter',
+                    options=[{'label': q, 'value': q} for q in TTM_QUINTILE_LABELS],
+                    multi=True, placeholder='All Quintiles'),
             
-            html.Label("CritSit:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.Dropdown(id='critsit-filter',
-                options=[{'label': 'Yes', 'value': True}, {'label': 'No', 'value': False}, {'label': 'All', 'value': 'All'}],
-                value='All', clearable=False),
+                html.Label("CritSit:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='critsit-filter',
+                    options=[{'label': 'Yes', 'value': True}, {'label': 'No', 'value': False}, {'label': 'All', 'value': 'All'}],
+                    value='All', clearable=False),
             
-            html.Label("P70-P80 Only:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.Dropdown(id='p70p80-filter',
-                options=[{'label': 'Yes (70th-80th percentile)', 'value': True}, 
-                        {'label': 'No (All)', 'value': False}],
-                value=False, clearable=False),
+                html.Label("P70-P80 Only:", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='p70p80-filter',
+                    options=[{'label': 'Yes (70th-80th percentile)', 'value': True}, 
+                            {'label': 'No (All)', 'value': False}],
+                    value=False, clearable=False),
             
-            html.Label("Event (Cascading):", style={'fontWeight': 'bold', 'marginTop': '15px'}),
-            dcc.Dropdown(id='event-filter',
-                options=[{'label': 'All Events', 'value': 'All'}] + EVENT_OPTIONS,
-                value='All', clearable=False,
-                placeholder='Select specific event'),
+                html.Label("Event (Cascading):", style={'fontWeight': 'bold', 'marginTop': '15px'}),
+                dcc.Dropdown(id='event-filter',
+                    options=controls['event_options'],
+                    value='All', clearable=False,
+                    placeholder='Select specific event'),
             
-            html.Div([
-                html.Button('Reset Filters', id='reset-btn', n_clicks=0,
-                    style={'marginTop': '20px', 'width': '100%', 'padding': '10px',
-                          'backgroundColor': BLUE, 'color': 'white', 'border': 'none',
-                          'borderRadius': '4px', 'cursor': 'pointer'}),
-                html.Button('Clear Chart Filters', id='clear-chart-btn', n_clicks=0,
-                    style={'marginTop': '10px', 'width': '100%', 'padding': '10px',
-                          'backgroundColor': '#666', 'color': 'white', 'border': 'none',
-                          'borderRadius': '4px', 'cursor': 'pointer'})
-            ])
-        ], style={'width': '280px', 'padding': '20px',
-                 'backgroundColor': 'white', 'minHeight': '100vh', 'overflowY': 'auto',
-                 'borderRight': f'1px solid {BORDER}', 'flexShrink': '0'}),
+                html.Div([
+                    html.Button('Reset Filters', id='reset-btn', n_clicks=0,
+                        style={'marginTop': '20px', 'width': '100%', 'padding': '10px',
+                              'backgroundColor': BLUE, 'color': 'white', 'border': 'none',
+                              'borderRadius': '4px', 'cursor': 'pointer'}),
+                    html.Button('Clear Chart Filters', id='clear-chart-btn', n_clicks=0,
+                        style={'marginTop': '10px', 'width': '100%', 'padding': '10px',
+                              'backgroundColor': '#666', 'color': 'white', 'border': 'none',
+                              'borderRadius': '4px', 'cursor': 'pointer'})
+                ])
+            ], style={'width': '280px', 'padding': '20px',
+                     'backgroundColor': 'white', 'minHeight': '100vh', 'overflowY': 'auto',
+                     'borderRight': f'1px solid {BORDER}', 'flexShrink': '0'}),
         
-        # Main Content
-        html.Div([
-            # Active Chart Filters Banner
-            html.Div(id='chart-filter-banner', style={'marginBottom': '15px'}),
-            
-            # Summary Cards
+            # Main Content
             html.Div([
+                # Active Chart Filters Banner
+                html.Div(id='chart-filter-banner', style={'marginBottom': '15px'}),
+            
+                # Summary Cards
                 html.Div([
-                    html.H4("Total", style={'margin': '0', 'fontSize': '14px'}),
-                    html.H2(id='card-total', style={'color': BLUE, 'margin': '5px 0'})
-                ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
-                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
-                         'display': 'inline-block', 'marginRight': '2%'}),
+                    html.Div([
+                        html.H4("Total", style={'margin': '0', 'fontSize': '14px'}),
+                        html.H2(id='card-total', style={'color': BLUE, 'margin': '5px 0'})
+                    ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
+                             'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
+                             'display': 'inline-block', 'marginRight': '2%'}),
                 
-                html.Div([
-                    html.H4("P75 TTM", style={'margin': '0', 'fontSize': '14px'}),
-                    html.H2(id='card-p75', style={'color': BLUE, 'margin': '5px 0'})
-                ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
-                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
-                         'display': 'inline-block', 'marginRight': '2%'}),
+                    html.Div([
+                        html.H4("P75 TTM", style={'margin': '0', 'fontSize': '14px'}),
+                        html.H2(id='card-p75', style={'color': BLUE, 'margin': '5px 0'})
+                    ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
+                             'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
+                             'display': 'inline-block', 'marginRight': '2%'}),
                 
-                html.Div([
-                    html.H4("Mean TTM", style={'margin': '0', 'fontSize': '14px'}),
-                    html.H2(id='card-mean', style={'color': BLUE, 'margin': '5px 0'})
-                ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
-                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
-                         'display': 'inline-block', 'marginRight': '2%'}),
+                    html.Div([
+                        html.H4("Mean TTM", style={'margin': '0', 'fontSize': '14px'}),
+                        html.H2(id='card-mean', style={'color': BLUE, 'margin': '5px 0'})
+                    ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
+                             'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
+                             'display': 'inline-block', 'marginRight': '2%'}),
                 
-                html.Div([
-                    html.H4("P90 TTM", style={'margin': '0', 'fontSize': '14px'}),
-                    html.H2(id='card-p90', style={'color': BLUE, 'margin': '5px 0'})
-                ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
-                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
-                         'display': 'inline-block', 'marginRight': '2%'}),
+                    html.Div([
+                        html.H4("P90 TTM", style={'margin': '0', 'fontSize': '14px'}),
+                        html.H2(id='card-p90', style={'color': BLUE, 'margin': '5px 0'})
+                    ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
+                             'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
+                             'display': 'inline-block', 'marginRight': '2%'}),
                 
+                    html.Div([
+                        html.H4("CritSits", style={'margin': '0', 'fontSize': '14px'}),
+                        html.H2(id='card-critsit', style={'color': '#D13438', 'margin': '5px 0'})
+                    ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
+                             'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
+                             'display': 'inline-block'})
+                ], style={'marginBottom': '20px'}),
+            
+                # Charts Row 1
                 html.Div([
-                    html.H4("CritSits", style={'margin': '0', 'fontSize': '14px'}),
-                    html.H2(id='card-critsit', style={'color': '#D13438', 'margin': '5px 0'})
-                ], style={'backgroundColor': 'white', 'padding': '15px', 'borderRadius': '8px',
-                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'width': '18%',
-                         'display': 'inline-block'})
-            ], style={'marginBottom': '20px'}),
+                    html.Div([dcc.Graph(id='chart-dist')], 
+                            style={'width': '48%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
+                    html.Div([dcc.Graph(id='chart-services')], 
+                            style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
+                ], style={'marginBottom': '20px', 'width': '100%'}),
             
-            # Charts Row 1
-            html.Div([
-                html.Div([dcc.Graph(id='chart-dist')], 
-                        style={'width': '48%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
-                html.Div([dcc.Graph(id='chart-services')], 
-                        style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
-            ], style={'marginBottom': '20px', 'width': '100%'}),
+                # Charts Row 2
+                html.Div([
+                    html.Div([dcc.Graph(id='chart-timeline')], 
+                            style={'width': '48%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
+                    html.Div([dcc.Graph(id='chart-severity')], 
+                            style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
+                ], style={'marginBottom': '20px', 'width': '100%'}),
             
-            # Charts Row 2
-            html.Div([
-                html.Div([dcc.Graph(id='chart-timeline')], 
-                        style={'width': '48%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
-                html.Div([dcc.Graph(id='chart-severity')], 
-                        style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
-            ], style={'marginBottom': '20px', 'width': '100%'}),
+                # Charts Row 3
+                html.Div([
+                    html.Div([
+                        dcc.Graph(id='chart-quintile'),
+                        dcc.RadioItems(id='quintile-basis',
+                            options=[{'label': 'Quintiles of the month', 'value': 'month'},
+                                     {'label': 'Quintiles of the current filter', 'value': 'filter'}],
+                            value='month', inline=True, style={'fontSize': '12px'},
+                            inputStyle={'marginRight': '4px', 'marginLeft': '10px'})
+                    ], style={'width': '48%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
+                    html.Div([dcc.Graph(id='chart-region')], 
+                            style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
+                ], style={'marginBottom': '20px', 'width': '100%'}),
             
-            # Charts Row 3
-            html.Div([
-                html.Div([dcc.Graph(id='chart-quintile')], 
-                        style={'width': '48%', 'display': 'inline-block', 'marginRight': '2%', 'verticalAlign': 'top'}),
-                html.Div([dcc.Graph(id='chart-region')], 
-                        style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
-            ], style={'marginBottom': '20px', 'width': '100%'}),
+                # Monthly trend across the loaded exports (per-month aggregates, all incidents)
+                html.Div([
+                    html.Div([
+                        html.H3("Monthly Trend (Year over Year)", style={'color': BLUE, 'display': 'inline-block', 'marginRight': '20px'}),
+                        html.Div(dcc.Dropdown(id='trend-metric', options=TREND_METRICS, value='TTM_p75', clearable=False),
+                                 style={'width': '200px', 'display': 'inline-block', 'verticalAlign': 'middle'})
+                    ]),
+                    dcc.Graph(id='chart-trend')
+                ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
+                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
             
-            # Data Table
-            html.Div([
+                # Data Table
                 html.Div([
-                    html.H3("Incident Details", style={'color': BLUE, 'display': 'inline-block', 'marginRight': '20px'}),
-                    html.Span(id='table-count', style={'color': '#666', 'fontSize': '16px'})
-                ]),
-                html.Div(id='table-incidents', style={'overflowX': 'auto', 'maxHeight': '600px', 'overflowY': 'auto'})
-            ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
-                     'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
+                    html.Div([
+                        html.H3("Incident Details", style={'color': BLUE, 'display': 'inline-block', 'marginRight': '20px'}),
+                        html.Span(id='table-count', style={'color': '#666', 'fontSize': '16px'})
+                    ]),
+                    dash_table.DataTable(
+                        id='table-incidents',
+                        columns=controls['table_columns'],
+                        page_action='custom', page_current=0, page_size=TABLE_PAGE_SIZE,
+                        sort_action='custom', sort_mode='multi',
+                        sort_by=[{'column_id': 'TTM', 'direction': 'desc'}],
+                        filter_action='custom', filter_query='',
+                        style_table={'overflowX': 'auto', 'maxHeight': '600px', 'overflowY': 'auto'},
+                        style_header={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'backgroundColor': 'white',
+                                      'fontSize': '12px', 'whiteSpace': 'nowrap', 'fontWeight': 'bold'},
+                        style_cell={'padding': '6px', 'borderBottom': f'1px solid {BORDER}', 'fontSize': '11px',
+                                    'maxWidth': '300px', 'overflow': 'hidden', 'textOverflow': 'ellipsis',
+                                    'textAlign': 'left', 'fontFamily': 'Segoe UI, sans-serif'},
+                        fixed_rows={'headers': True}
+                    )
+                ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
+                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
             
-            # Service Analysis Table (Hierarchical)
-            html.Div([
-                html.H3("Service Analysis: Root Causes, Mitigations & Impacts by Team", style={'color': BLUE}),
-                dcc.Loading(
-                    id="loading-service",
-                    type="circle",
-                    children=html.Div(id='table-service-analysis', style={'overflowX': 'auto', 'maxHeight': '600px', 'overflowY': 'auto'})
-                )
-            ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
-                     'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
+                # Service Analysis Table (Hierarchical)
+                html.Div([
+                    html.H3("Service Analysis: Root Causes, Mitigations & Impacts by Team", style={'color': BLUE}),
+                    dcc.Loading(
+                        id="loading-service",
+                        type="circle",
+                        children=html.Div(id='table-service-analysis', style={'overflowX': 'auto', 'maxHeight': '600px', 'overflowY': 'auto'})
+                    )
+                ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
+                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
             
-            # Pattern Analysis Section (New)
-            html.Div([
-                html.H3("Pattern & Correlation Analysis", style={'color': BLUE, 'marginBottom': '20px'}),
-                dcc.Loading(
-                    id="loading-pattern",
-                    type="circle",
-                    children=html.Div(id='pattern-analysis', style={'overflowX': 'auto'})
-                )
-            ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
-                     'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
+                # Pattern Analysis Section (New)
+                html.Div([
+                    html.H3("Pattern & Correlation Analysis", style={'color': BLUE, 'marginBottom': '20px'}),
+                    dcc.Loading(
+                        id="loading-pattern",
+                        type="circle",
+                        children=html.Div(id='pattern-analysis', style={'overflowX': 'auto'})
+                    )
+                ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
+                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
             
-            # Data Dictionary Section
-            html.Div([
-                html.H3("📖 Data Dictionary", style={'color': BLUE, 'marginBottom': '20px'}),
-                
-                # Root Cause Themes
+                # Data Dictionary Section
                 html.Div([
-                    html.H4("Root Cause Themes", style={'color': BLUE, 'fontSize': '16px', 'marginBottom': '10px', 'marginTop': '0'}),
-                    html.Table([
-                        html.Tbody([
-                            html.Tr([
-                                html.Td("Connectivity", style={'padding': '8px', 'fontWeight': 'bold', 'width': '180px', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Issues related to network connections, endpoints becoming unreachable, connection timeouts, or network infrastructure failures", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Configuration", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Problems caused by incorrect settings, misconfigurations, configuration drift, or missing configuration parameters", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Capacity", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Resource exhaustion including memory limits, CPU constraints, throttling, or insufficient scaling to handle load", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Deployment", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Issues introduced during software deployments, rollouts, releases, or code changes that caused service degradation", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Certificate", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Certificate expiration, invalid certificates, SSL/TLS handshake failures, or authentication certificate issues", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Timeout", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Request timeouts, operation timeouts, slow performance leading to timeout errors, or latency-related failures", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Dependency", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top'}),
-                                html.Td("Failures in dependent services, downstream/upstream service issues, or cascading failures from external dependencies", 
-                                       style={'padding': '8px'})
+                    html.H3("📖 Data Dictionary", style={'color': BLUE, 'marginBottom': '20px'}),
+                
+                    # Root Cause Themes
+                    html.Div([
+                        html.H4("Root Cause Themes", style={'color': BLUE, 'fontSize': '16px', 'marginBottom': '10px', 'marginTop': '0'}),
+                        html.Table([
+                            html.Tbody([
+                                html.Tr([
+                                    html.Td("Connectivity", style={'padding': '8px', 'fontWeight': 'bold', 'width': '180px', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Issues related to network connections, endpoints becoming unreachable, connection timeouts, or network infrastructure failures", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Configuration", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Problems caused by incorrect settings, misconfigurations, configuration drift, or missing configuration parameters", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Capacity", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Resource exhaustion including memory limits, CPU constraints, throttling, or insufficient scaling to handle load", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Deployment", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Issues introduced during software deployments, rollouts, releases, or code changes that caused service degradation", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Certificate", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Certificate expiration, invalid certificates, SSL/TLS handshake failures, or authentication certificate issues", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Timeout", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Request timeouts, operation timeouts, slow performance leading to timeout errors, or latency-related failures", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Dependency", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top'}),
+                                    html.Td("Failures in dependent services, downstream/upstream service issues, or cascading failures from external dependencies", 
+                                           style={'padding': '8px'})
+                                ])
                             ])
-                        ])
-                    ], style={'width': '100%', 'marginBottom': '25px', 'backgroundColor': 'white', 'border': '1px solid #eee'})
-                ]),
+                        ], style={'width': '100%', 'marginBottom': '25px', 'backgroundColor': 'white', 'border': '1px solid #eee'})
+                    ]),
                 
-                # Mitigation Actions
-                html.Div([
-                    html.H4("Mitigation Actions", style={'color': BLUE, 'fontSize': '16px', 'marginBottom': '10px'}),
-                    html.Table([
-                        html.Tbody([
-                            html.Tr([
-                                html.Td("Restart/Reboot", style={'padding': '8px', 'fontWeight': 'bold', 'width': '180px', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Restarting services, rebooting servers, recycling application pools, or bouncing processes to clear state and recover", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Rollback", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Reverting to a previous known-good version of code, configuration, or deployment to undo problematic changes", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Scaling", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Adding more resources by scaling up (vertical) or scaling out (horizontal) to handle increased load or resource demands", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Failover", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Switching to backup systems, redirecting traffic to healthy instances, or failing over to secondary regions/datacenters", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Config Change", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
-                                html.Td("Modifying configuration settings, updating parameters, adjusting thresholds, or reconfiguring services to resolve issues", 
-                                       style={'padding': '8px', 'borderBottom': '1px solid #eee'})
-                            ]),
-                            html.Tr([
-                                html.Td("Traffic Mgmt", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top'}),
-                                html.Td("Throttling requests, implementing rate limits, blocking problematic traffic, or managing load distribution to protect services", 
-                                       style={'padding': '8px'})
+                    # Mitigation Actions
+                    html.Div([
+                        html.H4("Mitigation Actions", style={'color': BLUE, 'fontSize': '16px', 'marginBottom': '10px'}),
+                        html.Table([
+                            html.Tbody([
+                                html.Tr([
+                                    html.Td("Restart/Reboot", style={'padding': '8px', 'fontWeight': 'bold', 'width': '180px', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Restarting services, rebooting servers, recycling application pools, or bouncing processes to clear state and recover", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Rollback", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Reverting to a previous known-good version of code, configuration, or deployment to undo problematic changes", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Scaling", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Adding more resources by scaling up (vertical) or scaling out (horizontal) to handle increased load or resource demands", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Failover", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Switching to backup systems, redirecting traffic to healthy instances, or failing over to secondary regions/datacenters", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Config Change", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top', 'borderBottom': '1px solid #eee'}),
+                                    html.Td("Modifying configuration settings, updating parameters, adjusting thresholds, or reconfiguring services to resolve issues", 
+                                           style={'padding': '8px', 'borderBottom': '1px solid #eee'})
+                                ]),
+                                html.Tr([
+                                    html.Td("Traffic Mgmt", style={'padding': '8px', 'fontWeight': 'bold', 'verticalAlign': 'top'}),
+                                    html.Td("Throttling requests, implementing rate limits, blocking problematic traffic, or managing load distribution to protect services", 
+                                           style={'padding': '8px'})
+                                ])
                             ])
-                        ])
-                    ], style={'width': '100%', 'backgroundColor': 'white', 'border': '1px solid #eee'})
-                ])
-            ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
-                     'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'})
+                        ], style={'width': '100%', 'backgroundColor': 'white', 'border': '1px solid #eee'})
+                    ])
+                ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px',
+                         'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
+            
+                # Debug: result cache counters and stage timings (also on /metrics)
+                html.Details([
+                    html.Summary("🛠️ Debug: result cache and timings", style={'cursor': 'pointer', 'color': '#666', 'fontSize': '12px'}),
+                    html.Div(id='cache-debug', style={'fontSize': '12px', 'color': '#666', 'padding': '10px'}),
+                    html.Div(id='timings-debug', style={'fontSize': '12px', 'color': '#666', 'padding': '0 10px 10px'})
+                ], style={'marginBottom': '20px'})
             
-        ], style={'flex': '1', 'padding': '20px', 'minWidth': '0',
-                 'backgroundColor': GRAY_BG, 'minHeight': '100vh', 'overflowX': 'hidden'})
-    ], style={'display': 'flex'})
-], style={'fontFamily': 'Segoe UI, sans-serif'})
+            ], style={'flex': '1', 'padding': '20px', 'minWidth': '0',
+                     'backgroundColor': GRAY_BG, 'minHeight': '100vh', 'overflowX': 'hidden'})
+        ], style={'display': 'flex'})
+    ], style={'fontFamily': 'Segoe UI, sans-serif'})
+
+
+app.layout = serve_layout
 
 # ============================================================================
 # CALLBACKS
 # ============================================================================
 
 @app.callback(
-    [Output('card-total', 'children'), Output('card-p75', 'children'),
-     Output('card-mean', 'children'), Output('card-p90', 'children'),
-     Output('card-critsit', 'children'),
-     Output('chart-dist', 'figure'), Output('chart-services', 'figure'),
-     Output('chart-timeline', 'figure'), Output('chart-severity', 'figure'),
-     Output('chart-quintile', 'figure'), Output('chart-region', 'figure'),
-     Output('table-incidents', 'children'), Output('table-count', 'children'),
-     Output('table-service-analysis', 'children'), Output('pattern-analysis', 'children'),
-     Output('chart-filter-banner', 'children'), Output('chart-click-store', 'data')],
+    [Output('dataset-select', 'options'), Output('header-month', 'children'),
+     Output('start-date-filter', 'date'), Output('end-date-filter', 'date'),
+     Output('severity-filter', 'options'), Output('service-filter', 'options'),
+     Output('ttm-filter', 'max'), Output('ttm-filter', 'value'),
+     Output('event-filter', 'options'), Output('event-filter', 'value'),
+     Output('table-incidents', 'columns')],
+    [Input('dataset-select', 'value'), Input('dataset-poll', 'n_intervals')],
+    [State('filter-store', 'data')]
+)
+def update_dataset_controls(dataset_name, poll, store):
+    """Refresh the month list on every poll; reset the data-dependent filters when
+    another month is selected or the selected month was re-exported"""
+    triggered_id = dash.callback_context.triggered[0]['prop_id'] if dash.callback_context.triggered else None
+    dataset = datasets.get(dataset_name)
+    reloaded = bool(store) and store.get('version') != dataset.version
+    if triggered_id == 'dataset-poll.n_intervals' and not reloaded:
+        return [dataset_options()] + [no_update] * 10
+    
+    c = dataset_controls(dataset)
+    return (dataset_options(), c['header'], c['start_date'], c['end_date'],
+            c['severity_options'], c['service_options'], c['ttm_max'], [0, c['ttm_max']],
+            c['event_options'], 'All', c['table_columns'])
+
+
+# Filters whose values are sets, so their order does not change the cache key
+FILTER_SET_KEYS = ['exclude_cascade', 'exclude_bcdr', 'severities', 'services', 'quintiles']
+
+
+def filter_key(filters):
+    """Normalized, hashable key for a filter state (sorted sets, empty lists as None)"""
+    key = {}
+    for name, value in filters.items():
+        if name == 'chart':
+            value = tuple(sorted(value.items()))
+        elif isinstance(value, list):
+            value = tuple(sorted(value, key=str) if name in FILTER_SET_KEYS else value) or None
+        key[name] = value
+    return tuple(sorted(key.items()))
+
+
+def filter_masks(dataset, key):
+    """Filter-index masks for a normalized filter key"""
+    index = dataset.index
+    filters = dict(key)
+    chart_filters = dict(filters['chart'])
+    start_date, end_date = filters['start_date'], filters['end_date']
+    exclude_cascade, exclude_bcdr = filters['exclude_cascade'], filters['exclude_bcdr']
+    severities, services, ttm_range = filters['severities'], filters['services'], filters['ttm_range']
+    quintiles, critsit, p70p80, event = filters['quintiles'], filters['critsit'], filters['p70p80'], filters['event']
+    masks = []
+    
+    # Chart filters
+    if 'severity' in chart_filters and 'Severity' in index.values:
+        masks.append(index.equals('Severity', chart_filters['severity']))
+    
+    if 'service' in chart_filters and 'ServiceName' in index.values:
+        masks.append(index.equals('ServiceName', chart_filters['service']))
+    
+    if 'quintile' in chart_filters and 'TTM_Quintile' in index.values:
+        masks.append(index.equals('TTM_Quintile', chart_filters['quintile']))
+    
+    if 'region' in chart_filters and 'Region' in index.values:
+        masks.append(index.equals('Region', chart_filters['region']))
+    
+    if 'date' in chart_filters and 'Date' in index.values:
+        clicked_date_obj = pd.to_datetime(chart_filters['date']).date()
+        masks.append(index.equals('Date', clicked_date_obj))
+    
+    # Date range filter (naive dates are treated as UTC)
+    try:
+        if (start_date or end_date) and 'CreateDate' in index.ranges:
+            start_dt = pd.to_datetime(start_date) if start_date else None
+            end_dt = pd.to_datetime(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1) if end_date else None
+            masks.append(index.between('CreateDate', start_dt, end_dt))
+    except Exception as e:
+        print(f"Date filter error: {e}")
+    
+    # Exclude cascade (events with multiple incidents)
+    if exclude_cascade and 'exclude' in exclude_cascade and 'IsPartOfEvent' in index.flags:
+        masks.append(index.flag('IsPartOfEvent', False))
+    
+    # Exclude BCDR/EUAP
+    if exclude_bcdr and 'exclude' in exclude_bcdr and 'IsExcluded' in index.flags:
+        masks.append(index.flag('IsExcluded', False))
+    
+    if severities:
+        masks.append(index.isin('Severity', severities))
+    if services:
+        masks.append(index.isin('Service', services))
+    if ttm_range and 'TTM' in index.ranges:
+        masks.append(index.between('TTM', ttm_range[0], ttm_range[1]))
+    if quintiles and 'TTM_Quintile' in index.values:
+        masks.append(index.isin('TTM_Quintile', quintiles))
+    if critsit != 'All' and 'CritSit' in index.values:
+        masks.append(index.equals('CritSit', critsit))
+    if p70p80 and 'IsP70P80' in index.flags:
+        masks.append(index.flag('IsP70P80'))
+    if event != 'All' and 'OutageCorrelationId' in index.values:
+        masks.append(index.equals('OutageCorrelationId', event))
+    
+    return masks
+
+
+def cube_filters(dataset, key):
+    """Allowed values per chart-cube dimension for a normalized filter key, or None when a
+    filter needs the raw rows (an event, a TTM range narrower than the month, a date bound
+    within a day, a date range, service or region that leaves out incidents, all months)"""
+    cube = getattr(dataset, 'cube', None)
+    if cube is None:
+        return None
+    chart_cubes = dataset.chart_cubes
+    index = dataset.index
+    filters = dict(key)
+    chart_filters = dict(filters['chart'])
+    start_date, end_date, ttm_range = filters['start_date'], filters['end_date'], filters['ttm_range']
+    allowed = {}
+
+    def narrow(dim, values):
+        allowed[dim] = allowed[dim] & set(values) if dim in allowed else set(values)
+
+    # Same filters and column checks as filter_masks()
+    if 'severity' in chart_filters and 'Severity' in index.values:
+        narrow('Severity', [chart_filters['severity']])
+    if 'service' in chart_filters and 'ServiceName' in index.values:
+        narrow('Service', [chart_filters['service']])
+    if 'quintile' in chart_filters and 'TTM_Quintile' in index.values:
+        narrow('TTM_Quintile', [chart_filters['quintile']])
+    if 'region' in chart_filters and 'Region' in index.values:
+        narrow('Region', [chart_filters['region']])
+    if 'date' in chart_filters and 'Date' in index.values:
+        narrow('Date', [pd.to_datetime(chart_filters['date']).date()])
+
+    if (start_date or end_date) and 'CreateDate' in index.ranges:
+        try:
+            start = pd.to_datetime(start_date) if start_date else None
+            end = pd.to_datetime(end_date) if end_date else None
+        except Exception:
+            return None
+        tz = getattr(dataset.df['CreateDate'].dtype, 'tz', None)
+        # The cube holds whole days of the export's own dates, which match the UTC window only in UTC
+        if any(t is not None and t != t.normalize() for t in (start, end)) or (tz is not None and str(tz) != 'UTC'):
+            return None
+        if 'Date' not in chart_cubes:
+            return None
+        narrow('Date', [d for d in chart_cubes['Date'].labels['Date']
+                        if (start is None or d >= start.date()) and (end is None or d <= end.date())])
+
+    if filters['exclude_cascade'] and 'exclude' in filters['exclude_cascade'] and 'IsPartOfEvent' in index.flags:
+        narrow('IsPartOfEvent', [False])
+    if filters['exclude_bcdr'] and 'exclude' in filters['exclude_bcdr'] and 'IsExcluded' in index.flags:
+        narrow('IsExcluded', [False])
+    if filters['severities']:
+        narrow('Severity', filters['severities'])
+    if filters['services']:
+        narrow('Service', filters['services'])
+    if ttm_range and 'TTM' in index.ranges:
+        if ttm_range[0] > cube.edges[0] or ttm_range[1] < cube.edges[-1]:
+            return None
+        narrow('HasTTM', [True])
+    if filters['quintiles'] and 'TTM_Quintile' in index.values:
+        narrow('TTM_Quintile', filters['quintiles'])
+    if filters['critsit'] != 'All' and 'CritSit' in index.values:
+        narrow('CritSit', [filters['critsit']])
+    if filters['p70p80'] and 'IsP70P80' in index.flags:
+        narrow('IsP70P80', [True])
+    if filters['event'] != 'All' and 'OutageCorrelationId' in index.values:
+        return None
+
+    # Chart dimensions are not in the shared cube: a filter on one only fits if it keeps every incident
+    for dim in [d for d in allowed if d in chart_cubes]:
+        if not chart_cubes[dim].covers(dim, allowed.pop(dim)):
+            return None
+    if any(dim not in cube.dimensions for dim in allowed):
+        return None
+    return allowed
+
+
+def store_state(store):
+    """Current dataset and filter key of the filter-store state; no update until the store is set"""
+    if not store:
+        raise PreventUpdate
+    return datasets.get(store['filters']['dataset']), filter_key(store['filters'])
+
+
+def filter_window(key):
+    """Date window [start, end] selected by a filter key, used to skip months outside it"""
+    filters = dict(key)
+    chart_filters = dict(filters['chart'])
+    start = pd.to_datetime(filters['start_date']) if filters['start_date'] else None
+    end = pd.to_datetime(filters['end_date']) + pd.Timedelta(days=1) if filters['end_date'] else None
+    if 'date' in chart_filters:
+        start = pd.to_datetime(chart_filters['date'])
+        end = start + pd.Timedelta(days=1)
+    return start, end
+
+
+def partition_key(partition, key):
+    """Filter key of the combined view as seen by one month, so it shares that month's caches"""
+    return tuple((name, partition.name if name == 'dataset' else value) for name, value in key)
+
+
+def filtered_rows(dataset, key):
+    """Row positions matching a filter key (None for all rows); for all months, the
+    positions per month, skipping months outside the date window"""
+    if isinstance(dataset, PartitionedStore):
+        return {p.name: filtered_rows(p, partition_key(p, key)) for p in dataset.prune(*filter_window(key))}
+    return dataset.result_cache.get(key, 'rows', lambda: dataset.index.rows(filter_masks(dataset, key)))
+
+
+def rows_signature(rows):
+    """Short hash of filtered_rows() output, to tell whether a filter change selects other incidents"""
+    if rows is None:
+        return 'all'
+    if isinstance(rows, dict):
+        return hashlib.sha1('|'.join(f"{name}:{rows_signature(r)}" for name, r in rows.items()).encode()).hexdigest()
+    return hashlib.sha1(rows.tobytes()).hexdigest()
+
+
+def filtered_frame(dataset, key):
+    """Filtered incidents for a filter key, materialized once and shared by the panel callbacks"""
+    if isinstance(dataset, PartitionedStore):
+        def combine():
+            parts = [filtered_frame(p, partition_key(p, key)) for p in dataset.prune(*filter_window(key))]
+            return pd.concat(parts, ignore_index=True) if parts else dataset.partitions[-1].index.take([])
+        return dataset.frames.get(key, 'frame', combine)
+    return dataset.frames.get(key, 'frame', lambda: dataset.index.take(filtered_rows(dataset, key)))
+
+
+def filtered_sorted(dataset, key, col='TTM'):
+    """Non-missing `col` values of the filtered incidents in ascending order, read from the
+    presorted index; all months merge the per-month runs (a merge, not a full sort)"""
+    if isinstance(dataset, PartitionedStore):
+        rows = filtered_rows(dataset, key)
+        runs = [p.index.sorted_values(col, rows[p.name]) for p in dataset.prune(*filter_window(key))
+                if col in p.index.ranges]
+        return np.sort(np.concatenate(runs), kind='stable') if runs else np.array([], dtype='float64')
+    if col not in dataset.index.ranges:
+        return np.array([], dtype='float64')
+    return dataset.index.sorted_values(col, filtered_rows(dataset, key))
+
+
+def cached_panel(store, part, build):
+    """A panel's outputs for the filter-store state, built from the filtered rows on a cache miss"""
+    dataset, key = store_state(store)
+    return dataset.result_cache.get(key, part, lambda: build(filtered_frame(dataset, key)))
+
+
+@app.callback(
+    [Output('filter-store', 'data'), Output('chart-filter-banner', 'children'),
+     Output('chart-click-store', 'data')],
     [Input('start-date-filter', 'date'), Input('end-date-filter', 'date'),
      Input('exclude-cascade-filter', 'value'), Input('exclude-bcdr-filter', 'value'),
      Input('severity-filter', 'value'), Input('service-filter', 'value'), 
@@ -473,12 +991,21 @@ app.layout = html.Div([
      Input('clear-chart-btn', 'n_clicks'),
      Input('chart-severity', 'clickData'), Input('chart-services', 'clickData'),
      Input('chart-quintile', 'clickData'), Input('chart-region', 'clickData'),
-     Input('chart-timeline', 'clickData')],
+     Input('chart-timeline', 'clickData'),
+     Input('dataset-select', 'value'), Input('dataset-poll', 'n_intervals')],
+    [State('filter-store', 'data')],
     prevent_initial_call=False
 )
-def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities, services, 
-               ttm_range, quintiles, critsit, p70p80, event, reset, clear_chart,
-               severity_click, services_click, quintile_click, region_click, timeline_click):
+@timings.timed('filter')
+def update_filters(start_date, end_date, exclude_cascade, exclude_bcdr, severities, services, 
+                   ttm_range, quintiles, critsit, p70p80, event, reset, clear_chart,
+                   severity_click, services_click, quintile_click, region_click, timeline_click,
+                   dataset_name, poll, current):
+    """Resolve the filter inputs and chart clicks into the filter-store state
+    
+    The store only changes when the filtered rows change, so the panel
+    callbacks below do not re-run for interactions that select the same incidents.
+    """
     
     # Determine which input triggered the callback
     ctx = dash.callback_context
@@ -534,186 +1061,406 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
     else:
         banner = html.Div()
     
-    # Filter
-    fdf = df.copy()
-    
-    # Apply chart filters FIRST (before other filters)
-    if 'severity' in chart_filters and 'Severity' in fdf.columns:
-        fdf = fdf[fdf['Severity'] == chart_filters['severity']]
-    
-    if 'service' in chart_filters and 'ServiceName' in fdf.columns:
-        fdf = fdf[fdf['ServiceName'] == chart_filters['service']]
+    filters = {
+        'start_date': start_date, 'end_date': end_date,
+        'exclude_cascade': exclude_cascade, 'exclude_bcdr': exclude_bcdr,
+        'severities': severities, 'services': services, 'ttm_range': ttm_range,
+        'quintiles': quintiles, 'critsit': critsit, 'p70p80': p70p80, 'event': event,
+        'chart': chart_filters
+    }
+    dataset = datasets.get(dataset_name)
+    filters['dataset'] = dataset.name
+    rows = filtered_rows(dataset, filter_key(filters))
+    store = {'filters': filters, 'version': dataset.version, 'rows': rows_signature(rows)}
+    # Polls and reloads only reach the panels when the data or selected rows changed
+    if current and (current.get('version'), current.get('rows')) == (store['version'], store['rows']):
+        store = no_update
     
-    if 'quintile' in chart_filters and 'TTM_Quintile' in fdf.columns:
-        fdf = fdf[fdf['TTM_Quintile'] == chart_filters['quintile']]
-    
-    if 'region' in chart_filters and 'Region' in fdf.columns:
-        fdf = fdf[fdf['Region'] == chart_filters['region']]
-    
-    if 'date' in chart_filters and 'Date' in fdf.columns:
-        clicked_date_obj = pd.to_datetime(chart_filters['date']).date()
-        fdf = fdf[fdf['Date'] == clicked_date_obj]
-    
-    # Date range filter with timezone handling
-    try:
-        if start_date and 'CreateDate' in fdf.columns:
-            start_dt = pd.to_datetime(start_date)
-            # Make timezone aware if the column is timezone aware
-            if fdf['CreateDate'].dt.tz is not None:
-                start_dt = start_dt.tz_localize('UTC')
-            fdf = fdf[fdf['CreateDate'] >= start_dt]
-        
-        if end_date and 'CreateDate' in fdf.columns:
-            end_dt = pd.to_datetime(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-            # Make timezone aware if the column is timezone aware
-            if fdf['CreateDate'].dt.tz is not None:
-                end_dt = end_dt.tz_localize('UTC')
-            fdf = fdf[fdf['CreateDate'] <= end_dt]
-    except Exception as e:
-        print(f"Date filter error: {e}")
-    
-    # Exclude cascade (events with multiple incidents)
-    if exclude_cascade and 'exclude' in exclude_cascade and 'IsPartOfEvent' in fdf.columns:
-        fdf = fdf[fdf['IsPartOfEvent'] == False]
-    
-    # Exclude BCDR/EUAP
-    if exclude_bcdr and 'exclude' in exclude_bcdr and 'IsExcluded' in fdf.columns:
-        fdf = fdf[fdf['IsExcluded'] == False]
-    
-    if severities:
-        fdf = fdf[fdf['Severity'].isin(severities)]
-    if services:
-        fdf = fdf[fdf['Service'].isin(services)]
-    if ttm_range and 'TTM' in fdf.columns:
-        fdf = fdf[(fdf['TTM'] >= ttm_range[0]) & (fdf['TTM'] <= ttm_range[1])]
-    if quintiles and 'TTM_Quintile' in fdf.columns:
-        fdf = fdf[fdf['TTM_Quintile'].isin(quintiles)]
-    if critsit != 'All' and 'CritSit' in fdf.columns:
-        fdf = fdf[fdf['CritSit'] == critsit]
-    if p70p80 and 'IsP70P80' in fdf.columns:
-        fdf = fdf[fdf['IsP70P80'] == True]
-    if event != 'All' and 'OutageCorrelationId' in fdf.columns:
-        fdf = fdf[fdf['OutageCorrelationId'] == event]
+    return store, banner, chart_filters
+
+
+@app.callback(
+    [Output('card-total', 'children'), Output('card-p75', 'children'),
+     Output('card-mean', 'children'), Output('card-p90', 'children'),
+     Output('card-critsit', 'children')],
+    Input('filter-store', 'data')
+)
+def update_cards(store):
+    dataset, key = store_state(store)
+    return dataset.result_cache.get(
+        key, 'cards', lambda: build_cards(filtered_frame(dataset, key), filtered_sorted(dataset, key)))
+
+
+@timings.timed('cards')
+def build_cards(fdf, ttm):
+    """Card values; `ttm` holds the filtered TTM values already sorted, so percentiles are lookups"""
     
     # Metrics
     total = len(fdf)
-    p75 = f"{int(fdf['TTM'].quantile(0.75))} min" if total > 0 and 'TTM' in fdf.columns else "N/A"
-    mean = f"{int(fdf['TTM'].mean())} min" if total > 0 and 'TTM' in fdf.columns else "N/A"
-    p90 = f"{int(fdf['TTM'].quantile(0.90))} min" if total > 0 and 'TTM' in fdf.columns else "N/A"
+    p75, p90 = sorted_quantile(ttm, [0.75, 0.90])
+    p75 = f"{int(p75)} min" if total > 0 and len(ttm) else "N/A"
+    mean = f"{int(ttm.mean())} min" if total > 0 and len(ttm) else "N/A"
+    p90 = f"{int(p90)} min" if total > 0 and len(ttm) else "N/A"
     critsits = int(fdf['CritSit'].sum()) if 'CritSit' in fdf.columns and total > 0 else 0
     
-    # Charts with error handling
-    try:
-        if total > 0 and 'TTM' in fdf.columns:
-            fig_dist = px.histogram(fdf, x='TTM', nbins=50, title='TTM Distribution')
-            fig_dist.update_layout(
-                showlegend=False, 
-                plot_bgcolor='white',
-                margin=dict(l=40, r=20, t=40, b=40),
-                height=300
-            )
-        else:
-            fig_dist = go.Figure().update_layout(title='TTM Distribution (No Data)', height=300)
-    except Exception as e:
-        fig_dist = go.Figure().update_layout(title=f'TTM Distribution (Error: {str(e)[:30]})')
+    return total, p75, mean, p90, critsits
+
+
+@app.callback(
+    [Output('chart-dist', 'figure'), Output('chart-services', 'figure'),
+     Output('chart-timeline', 'figure'), Output('chart-severity', 'figure'),
+     Output('chart-quintile', 'figure'), Output('chart-region', 'figure')],
+    [Input('filter-store', 'data'), Input('quintile-basis', 'value')]
+)
+def update_charts(store, quintile_basis):
+    dataset, key = store_state(store)
+    if quintile_basis != 'filter':
+        return dataset.result_cache.get(key, 'charts', lambda: build_charts(chart_aggregates(dataset, key)))
+    # Quintiles relative to the current filter: edges and counts from the sorted filtered TTM
+    return dataset.result_cache.get(key, 'charts_filter_quintiles', lambda: build_charts(
+        chart_aggregates(dataset, key),
+        quintiles=sorted_quintile_counts(filtered_sorted(dataset, key), TTM_QUINTILE_LABELS)))
+
+
+@timings.timed('aggregates')
+def chart_aggregates(dataset, key):
+    """Chart inputs for a filter key: slices of the chart cubes, or the filtered rows
+    when a filter needs them"""
+    allowed = cube_filters(dataset, key)
+    if allowed is None:
+        cube = getattr(dataset, 'cube', None)
+        return frame_aggregates(filtered_frame(dataset, key), cube.edges if cube is not None else None)
+    cube, cells = dataset.cube, dataset.cube.select(allowed)
+
+    def by(dim, read):
+        if dim in dataset.chart_cubes:
+            chart_cube = dataset.chart_cubes[dim]
+            return read(chart_cube, dim, chart_cube.select(allowed))
+        return read(cube, dim, cells) if dim in cube.dimensions else None
+
+    return SimpleNamespace(
+        total=cube.total(cells), hist=cube.histogram(cells),
+        services=by('Service', ChartCube.sums), daily=by('Date', ChartCube.counts),
+        severity=by('Severity', ChartCube.counts), quintile=by('TTM_Quintile', ChartCube.counts),
+        region=by('Region', ChartCube.counts)
+    )
+
+
+def frame_aggregates(fdf, edges=None):
+    """Chart inputs scanned from filtered rows; the TTM histogram is binned on `edges` (the
+    chart cube's, so bins do not move between the two paths) or else over the filtered range"""
+    has = lambda *cols: all(c in fdf.columns for c in cols)
+    ttm = fdf['TTM'].dropna().to_numpy(dtype='float64') if has('TTM') else np.array([])
+    bins = edges if edges is not None else TTM_HISTOGRAM_BINS
+    counts, edges = np.histogram(ttm, bins=bins) if len(ttm) else (None, None)
+    return SimpleNamespace(
+        total=len(fdf), hist=(edges, counts) if len(ttm) else None,
+        services=fdf.groupby('Service', observed=True)['TTM'].sum() if has('Service', 'TTM') else None,
+        daily=fdf.groupby('Date').size() if has('Date') else None,
+        severity=fdf['Severity'].value_counts() if has('Severity') else None,
+        quintile=fdf.groupby('TTM_Quintile', observed=True).size() if has('TTM_Quintile') else None,
+        region=fdf['Region'].value_counts() if has('Region') else None
+    )
+
+
+def build_charts(aggs, quintiles=None):
+    """The six charts from chart_aggregates(); `quintiles` (count per label) replaces the
+    month's TTM_Quintile counts"""
+    total = aggs.total
     
-    try:
-        if total > 0 and 'Service' in fdf.columns and 'TTM' in fdf.columns:
-            top_svc = fdf.groupby('Service')['TTM'].sum().nlargest(10).reset_index()
-            if len(top_svc) > 0:
-                fig_services = px.bar(top_svc, x='TTM', y='Service', orientation='h',
-                                     title='Top 10 Services by Total TTM')
-                fig_services.update_layout(yaxis={'categoryorder': 'total ascending'})
+    # Charts with error handling, each timed as its own stage
+    with timings.timed('figure dist'):
+        try:
+            if total > 0 and aggs.hist is not None:
+                # Bins computed on the server: the browser gets bin edges and counts, not the TTM values
+                edges, counts = aggs.hist
+                fig_dist = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+                fig_dist.update_layout(title='TTM Distribution', xaxis_title='TTM', yaxis_title='count', bargap=0)
+                fig_dist.update_layout(
+                    showlegend=False, 
+                    plot_bgcolor='white',
+                    margin=dict(l=40, r=20, t=40, b=40),
+                    height=300
+                )
+            else:
+                fig_dist = go.Figure().update_layout(title='TTM Distribution (No Data)', height=300)
+        except Exception as e:
+            fig_dist = go.Figure().update_layout(title=f'TTM Distribution (Error: {str(e)[:30]})')
+    
+    with timings.timed('figure services'):
+        try:
+            if total > 0 and aggs.services is not None:
+                top_svc = aggs.services.nlargest(10).rename_axis('Service').reset_index(name='TTM')
+                if len(top_svc) > 0:
+                    fig_services = px.bar(top_svc, x='TTM', y='Service', orientation='h',
+                                         title='Top 10 Services by Total TTM')
+                    fig_services.update_layout(yaxis={'categoryorder': 'total ascending'})
+                else:
+                    fig_services = go.Figure().update_layout(title='Top Services (No Data)')
             else:
                 fig_services = go.Figure().update_layout(title='Top Services (No Data)')
-        else:
-            fig_services = go.Figure().update_layout(title='Top Services (No Data)')
-    except Exception as e:
-        fig_services = go.Figure().update_layout(title=f'Top Services (Error: {str(e)[:30]})')
+        except Exception as e:
+            fig_services = go.Figure().update_layout(title=f'Top Services (Error: {str(e)[:30]})')
     
-    try:
-        if total > 0 and 'Date' in fdf.columns:
-            daily = fdf.groupby('Date').size().reset_index(name='Count')
-            fig_timeline = px.bar(daily, x='Date', y='Count', title='Daily Timeline')
-        else:
-            fig_timeline = go.Figure().update_layout(title='Timeline (No Data)')
-    except Exception as e:
-        fig_timeline = go.Figure().update_layout(title=f'Timeline (Error: {str(e)[:30]})')
+    with timings.timed('figure timeline'):
+        try:
+            if total > 0 and aggs.daily is not None:
+                daily = aggs.daily.sort_index().rename_axis('Date').reset_index(name='Count')
+                fig_timeline = px.bar(daily, x='Date', y='Count', title='Daily Timeline')
+            else:
+                fig_timeline = go.Figure().update_layout(title='Timeline (No Data)')
+        except Exception as e:
+            fig_timeline = go.Figure().update_layout(title=f'Timeline (Error: {str(e)[:30]})')
     
-    try:
-        if total > 0 and 'Severity' in fdf.columns:
-            sev_counts = fdf['Severity'].value_counts().reset_index()
-            sev_counts.columns = ['Severity', 'Count']
-            fig_severity = px.pie(sev_counts, values='Count', names='Severity', title='By Severity')
-        else:
-            fig_severity = go.Figure().update_layout(title='Severity (No Data)')
-    except Exception as e:
-        fig_severity = go.Figure().update_layout(title=f'Severity (Error: {str(e)[:30]})')
+    with timings.timed('figure severity'):
+        try:
+            if total > 0 and aggs.severity is not None:
+                sev_counts = aggs.severity.sort_values(ascending=False, kind='stable').reset_index()
+                sev_counts.columns = ['Severity', 'Count']
+                fig_severity = px.pie(sev_counts, values='Count', names='Severity', title='By Severity')
+            else:
+                fig_severity = go.Figure().update_layout(title='Severity (No Data)')
+        except Exception as e:
+            fig_severity = go.Figure().update_layout(title=f'Severity (Error: {str(e)[:30]})')
     
-    try:
-        if total > 0 and 'TTM_Quintile' in fdf.columns:
-            quint = fdf.groupby('TTM_Quintile').size().reset_index(name='Count')
-            fig_quintile = px.bar(quint, x='TTM_Quintile', y='Count', title='By Quintile')
-        else:
-            fig_quintile = go.Figure().update_layout(title='Quintile (No Data)')
-    except Exception as e:
-        fig_quintile = go.Figure().update_layout(title=f'Quintile (Error: {str(e)[:30]})')
+    with timings.timed('figure quintile'):
+        try:
+            if total > 0 and quintiles is not None and len(quintiles) > 0:
+                quint = quintiles.rename_axis('TTM_Quintile').reset_index(name='Count')
+                fig_quintile = px.bar(quint, x='TTM_Quintile', y='Count', title='By Quintile (current filter)')
+            elif total > 0 and aggs.quintile is not None:
+                quint = aggs.quintile.reindex(TTM_QUINTILE_LABELS, fill_value=0).rename_axis('TTM_Quintile').reset_index(name='Count')
+                fig_quintile = px.bar(quint, x='TTM_Quintile', y='Count', title='By Quintile')
+            else:
+                fig_quintile = go.Figure().update_layout(title='Quintile (No Data)')
+        except Exception as e:
+            fig_quintile = go.Figure().update_layout(title=f'Quintile (Error: {str(e)[:30]})')
     
-    try:
-        if total > 0 and 'Region' in fdf.columns:
-            reg_top = fdf['Region'].value_counts().nlargest(10).reset_index()
-            reg_top.columns = ['Region', 'Count']
-            if len(reg_top) > 0:
-                fig_region = px.bar(reg_top, x='Count', y='Region', orientation='h', title='Top 10 Regions')
-                fig_region.update_layout(yaxis={'categoryorder': 'total ascending'})
+    with timings.timed('figure region'):
+        try:
+            if total > 0 and aggs.region is not None:
+                reg_top = aggs.region[lambda c: c > 0].nlargest(10).reset_index()
+                reg_top.columns = ['Region', 'Count']
+                if len(reg_top) > 0:
+                    fig_region = px.bar(reg_top, x='Count', y='Region', orientation='h', title='Top 10 Regions')
+                    fig_region.update_layout(yaxis={'categoryorder': 'total ascending'})
+                else:
+                    fig_region = go.Figure().update_layout(title='Regions (No Data)')
             else:
                 fig_region = go.Figure().update_layout(title='Regions (No Data)')
-        else:
-            fig_region = go.Figure().update_layout(title='Regions (No Data)')
-    except Exception as e:
-        fig_region = go.Figure().update_layout(title=f'Regions (Error: {str(e)[:30]})')
+        except Exception as e:
+            fig_region = go.Figure().update_layout(title=f'Regions (Error: {str(e)[:30]})')
+    
+    return fig_dist, fig_services, fig_timeline, fig_severity, fig_quintile, fig_region
+
+
+@app.callback(
+    Output('chart-trend', 'figure'),
+    [Input('trend-metric', 'value'), Input('dataset-poll', 'n_intervals')]
+)
+@timings.timed('trend')
+def update_trend(metric, poll):
+    """One line per year over calendar months, from the per-month aggregates of every loaded export"""
+    store = datasets.get(ALL_DATASETS)
+    monthly = store.monthly if isinstance(store, PartitionedStore) else store.monthly.assign(Partition=store.name)
+    label = next(o['label'] for o in TREND_METRICS if o['value'] == metric)
+    if len(monthly) == 0 or metric not in monthly.columns:
+        return go.Figure().update_layout(title=f'{label} by Month (No Data)', height=300)
+    
+    trend = monthly.reset_index()
+    months = pd.to_datetime(trend['Month'], format='%Y-%m')
+    trend['Year'] = months.dt.year.astype(str)
+    trend['MonthName'] = months.dt.strftime('%b')
+    fig = px.line(trend, x='MonthName', y=metric, color='Year', markers=True, custom_data=['Partition'],
+                  title=f'{label} by Month (click a point to open that month)',
+                  category_orders={'MonthName': [datetime(2000, m, 1).strftime('%b') for m in range(1, 13)]})
+    fig.update_layout(plot_bgcolor='white', height=300, margin=dict(l=40, r=20, t=40, b=40),
+                      xaxis_title=None, yaxis_title=label)
+    return fig
+
+
+@app.callback(
+    Output('dataset-select', 'value'),
+    Input('chart-trend', 'clickData'),
+    prevent_initial_call=True
+)
+def open_trend_month(click):
+    """Switch the dashboard to the export behind a clicked trend point"""
+    if not click:
+        raise PreventUpdate
+    return click['points'][0]['customdata'][0]
+
+
+def split_filter_part(filter_part):
+    """Split one DataTable filter_query clause into (column, operator, value)"""
+    for operator_type in TABLE_FILTER_OPERATORS:
+        for op in operator_type:
+            if op in filter_part:
+                name_part, value_part = filter_part.split(op, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                
+                value_part = value_part.strip()
+                if value_part and value_part[0] == value_part[-1] and value_part[0] in ("'", '"', '`'):
+                    value = value_part[1: -1].replace('\\' + value_part[0], value_part[0])
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                
+                # word operators need spaces after them in the filter string,
+                # but we don't want these later
+                return name, operator_type[0].strip(), value
+    
+    return [None] * 3
+
+
+def table_filter_mask(tdf, filter_query):
+    """Boolean mask for the DataTable's custom filter_query over the table columns"""
+    mask = pd.Series(True, index=tdf.index)
+    for filter_part in filter_query.split(' && '):
+        col_name, op, filter_value = split_filter_part(filter_part)
+        if col_name not in tdf.columns:
+            continue
+        column = tdf[col_name]
+        if op in ('contains', 'datestartswith'):
+            text = column.astype('string')
+            if op == 'contains':
+                mask &= text.str.contains(str(filter_value), case=False, regex=False).fillna(False)
+            else:
+                mask &= text.str.startswith(str(filter_value)).fillna(False)
+        elif op in TABLE_COMPARISONS:
+            if not pd.api.types.is_numeric_dtype(column):
+                column = column.astype('string')
+                filter_value = str(filter_value)
+            mask &= TABLE_COMPARISONS[op](column, filter_value).fillna(False)
+    return mask
+
+
+def truncate_text(series, limit=TABLE_TEXT_LIMIT):
+    """Vectorized truncation of a text column to `limit` characters plus '...'"""
+    text = series.astype('string').fillna('')
+    return text.where(text.str.len() <= limit, text.str.slice(0, limit) + '...')
+
+
+@app.callback(
+    [Output('table-incidents', 'data'), Output('table-incidents', 'page_count'),
+     Output('table-incidents', 'page_current'), Output('table-count', 'children')],
+    [Input('filter-store', 'data'), Input('table-incidents', 'page_current'),
+     Input('table-incidents', 'page_size'), Input('table-incidents', 'sort_by'),
+     Input('table-incidents', 'filter_query')]
+)
+@timings.timed('table')
+def update_table(store, page_current, page_size, sort_by, filter_query):
+    """Serve one page of the incident table, sorted and filtered on the server"""
+    fdf = filtered_frame(*store_state(store))
+    total = len(fdf)
+    
+    # A new dashboard filter or table filter starts again from the first page
+    triggered_id = dash.callback_context.triggered[0]['prop_id'] if dash.callback_context.triggered else None
+    if triggered_id in ('filter-store.data', 'table-incidents.filter_query'):
+        page_current = 0
+    page_current = page_current or 0
+    page_size = page_size or TABLE_PAGE_SIZE
     
     # Table with all incidents and high-entropy columns
     table_count_text = f"Showing all {total} incidents" if total > 0 else "No incidents"
     
     try:
-        if total > 0:
-            # Use high-entropy columns that exist in the dataframe
-            display_cols = [c for c in TABLE_COLUMNS if c in fdf.columns]
-            tdf = fdf[display_cols].copy()
-            
-            # Round TTM to 1 decimal place for readability
-            if 'TTM' in tdf.columns:
-                tdf['TTM'] = tdf['TTM'].round(1)
-            
-            # Truncate long text fields
-            for col in ['IncidentTitle', 'RootCauses', 'Mitigations', 'Impacts']:
-                if col in tdf.columns:
-                    tdf[col] = tdf[col].apply(lambda x: str(x)[:100] + '...' if pd.notna(x) and len(str(x)) > 100 else str(x) if pd.notna(x) else '')
-            
-            # Sort by TTM descending
-            if 'TTM' in tdf.columns:
-                tdf = tdf.sort_values('TTM', ascending=False)
-            
-            table = html.Table([
-                html.Thead(html.Tr([html.Th(c, style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}',
-                                                      'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                                      'fontSize': '12px', 'whiteSpace': 'nowrap'}) 
-                                   for c in tdf.columns])),
-                html.Tbody([html.Tr([html.Td(str(row[c]) if pd.notna(row[c]) else '', 
-                                             style={'padding': '6px', 'borderBottom': f'1px solid {BORDER}',
-                                                   'fontSize': '11px', 'maxWidth': '300px', 'overflow': 'hidden',
-                                                   'textOverflow': 'ellipsis'}) 
-                                    for c in tdf.columns]) 
-                           for _, row in tdf.iterrows()])
-            ], style={'width': '100%', 'borderCollapse': 'collapse'})
+        display_cols = [c for c in TABLE_COLUMNS if c in fdf.columns]
+        tdf = fdf[display_cols]
+        
+        if filter_query:
+            tdf = tdf[table_filter_mask(tdf, filter_query)]
+            table_count_text = f"Showing {len(tdf)} of {total} incidents"
+        
+        # Sort only the sort keys, then take the rows of the visible page
+        sort_by = [s for s in (sort_by or []) if s['column_id'] in tdf.columns]
+        if sort_by:
+            order = tdf[[s['column_id'] for s in sort_by]].sort_values(
+                [s['column_id'] for s in sort_by],
+                ascending=[s['direction'] == 'asc' for s in sort_by],
+                kind='stable', na_position='last'
+            ).index
         else:
-            table = html.Div("No incidents match the current filters", 
-                           style={'padding': '20px', 'textAlign': 'center', 'color': '#666'})
+            order = tdf.index
+        
+        page_count = max(1, -(-len(tdf) // page_size))
+        page_current = min(page_current, page_count - 1)
+        page = tdf.loc[order[page_current * page_size: (page_current + 1) * page_size]].copy()
+        
+        # Round TTM to 1 decimal place for readability
+        if 'TTM' in page.columns:
+            page['TTM'] = page['TTM'].round(1)
+        
+        # Truncate long text fields
+        for col in ['IncidentTitle', 'RootCauses', 'Mitigations', 'Impacts']:
+            if col in page.columns:
+                page[col] = truncate_text(page[col])
+        
+        for col in page.columns:
+            if isinstance(page[col].dtype, (pd.CategoricalDtype, pd.DatetimeTZDtype)) or pd.api.types.is_datetime64_any_dtype(page[col]):
+                page[col] = page[col].astype('string')
+        data = page.astype(object).where(page.notna(), None).to_dict('records')
     except Exception as e:
-        table = html.Div(f"Error loading table: {str(e)}", 
-                        style={'padding': '20px', 'textAlign': 'center', 'color': 'red'})
-        table_count_text = "Error"
+        data, page_count, page_current = [], 1, 0
+        table_count_text = f"Error loading table: {str(e)}"
+    
+    return data, page_count, page_current, table_count_text
+
+
+def tags_present(fdf, taxonomy):
+    """Tags of `taxonomy` set on any incident in fdf, in taxonomy order (an OR over its bitset column)"""
+    tagger = TAXONOMY_TAGGERS[taxonomy]
+    bits = np.bitwise_or.reduce(fdf[taxonomy].to_numpy()) if taxonomy in fdf.columns and len(fdf) else 0
+    return [tag for tag in tagger.tags[taxonomy] if tagger.has(taxonomy, bits, tag)]
+
+
+def tag_pattern_stats(fdf, taxonomy, labels=None):
+    """P75 TTM, incident, service and severity counts per tag of `taxonomy`
+
+    Incidents are expanded to one row per tag they carry and reduced with one
+    groupby, so the cost follows the number of tags rather than the text.
+    `labels` renames tags for display.
+    """
+    if taxonomy not in fdf.columns or fdf.empty:
+        return []
+    tags = TAXONOMY_TAGGERS[taxonomy].tags[taxonomy]
+    bits = fdf[taxonomy].to_numpy()
+    rows, tag_ids = np.nonzero((bits[:, None] >> np.arange(len(tags), dtype=bits.dtype)) & 1)
+    if len(rows) == 0:
+        return []
+    columns = [c for c in ['TTM', 'ServiceName', 'Severity'] if c in fdf.columns]
+    tagged = fdf[columns].iloc[rows].assign(Tag=np.asarray(tags, dtype=object)[tag_ids])
+    grouped = tagged.groupby('Tag', sort=False)
+    counts = grouped.size()
+    p75 = grouped['TTM'].quantile(0.75) if 'TTM' in columns else None
+    services = grouped['ServiceName'].nunique() if 'ServiceName' in columns else None
+    severity = {}
+    if 'Severity' in columns:
+        by_severity = tagged.groupby(['Tag', 'Severity'], observed=True).size()
+        severity = {tag: counts_.droplevel(0).to_dict() for tag, counts_ in by_severity.groupby(level=0)}
+    labels = labels or {}
+    return [{
+        'tag': labels.get(tag, tag),
+        'p75': p75[tag] if p75 is not None else 0,
+        'count': int(counts[tag]),
+        'services': int(services[tag]) if services is not None else 0,
+        'severity': severity.get(tag, {})
+    } for tag in tags if tag in counts.index]
+
+
+@app.callback(
+    Output('table-service-analysis', 'children'),
+    Input('filter-store', 'data')
+)
+def update_service_analysis(store):
+    return cached_panel(store, 'service_analysis', build_service_analysis)
+
+
+@timings.timed('service_analysis')
+def build_service_analysis(fdf):
+    total = len(fdf)
     
     # Service Analysis Table (Hierarchical: Service > Team > Root Causes/Mitigations/Impacts)
     try:
@@ -726,7 +1473,6 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                 rc_all_data = fdf[['OutageIncidentId', 'RootCauses']].dropna(subset=['RootCauses'])
                 if len(rc_all_data) > 0:
                     unique_rcs_all = rc_all_data['RootCauses'].unique()
-                    all_text = ' '.join([str(rc).lower() for rc in unique_rcs_all])
                     
                     # Calculate additional statistics
                     event_count = fdf[fdf['IsPartOfEvent'] == True]['OutageIncidentId'].nunique() if 'IsPartOfEvent' in fdf.columns else 0
@@ -734,21 +1480,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                     critsit_count = fdf[fdf['IsCritSit'] == 'Yes']['OutageIncidentId'].nunique() if 'IsCritSit' in fdf.columns else 0
                     
                     # Identify themes across all services
-                    themes = []
-                    theme_keywords = {
-                        'connectivity': ['connectivity', 'connection', 'network', 'endpoint'],
-                        'configuration': ['configuration', 'config', 'misconfiguration', 'setting'],
-                        'capacity': ['capacity', 'resource exhaustion', 'memory', 'cpu', 'throttling'],
-                        'deployment': ['deployment', 'rollout', 'release', 'code change'],
-                        'certificate': ['certificate', 'cert', 'ssl', 'tls', 'authentication'],
-                        'timeout': ['timeout', 'timed out', 'latency', 'slow'],
-                        'failure': ['failure', 'failed', 'error', 'exception'],
-                        'dependency': ['dependency', 'dependent', 'downstream', 'upstream']
-                    }
-                    
-                    for theme, keywords in theme_keywords.items():
-                        if any(kw in all_text for kw in keywords):
-                            themes.append(theme)
+                    themes = tags_present(fdf, 'RootCauseSummaryTags')
                     
                     themes_str = ', '.join(themes) if themes else 'various issues'
                     rc_summary_text = f"📊 Across all services, {len(rc_all_data)} incidents occurred with {len(unique_rcs_all)} distinct root causes, primarily related to {themes_str}."
@@ -767,24 +1499,9 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                 mit_all_data = fdf[['OutageIncidentId', 'Mitigations']].dropna(subset=['Mitigations'])
                 if len(mit_all_data) > 0:
                     unique_mits_all = mit_all_data['Mitigations'].unique()
-                    all_text = ' '.join([str(m).lower() for m in unique_mits_all])
                     
                     # Identify actions across all services
-                    actions = []
-                    action_keywords = {
-                        'restart/reboot': ['restart', 'reboot', 'recycle', 'bounce'],
-                        'rollback': ['rollback', 'rolled back', 'reverted', 'revert'],
-                        'scaling': ['scale', 'scaled', 'scaling', 'capacity increase'],
-                        'failover': ['failover', 'failed over', 'switched', 'redirected'],
-                        'configuration change': ['config change', 'reconfigured', 'updated settings'],
-                        'traffic management': ['traffic', 'throttle', 'rate limit', 'blocked'],
-                        'repair': ['repair', 'fixed', 'patched', 'resolved'],
-                        'isolation': ['isolated', 'quarantine', 'disabled', 'removed']
-                    }
-                    
-                    for action, keywords in action_keywords.items():
-                        if any(kw in all_text for kw in keywords):
-                            actions.append(action)
+                    actions = tags_present(fdf, 'MitigationSummaryTags')
                     
                     # Calculate TTM statistics
                     avg_ttm = fdf['TTM'].mean() if 'TTM' in fdf.columns else 0
@@ -807,24 +1524,9 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                 imp_all_data = fdf[['OutageIncidentId', 'Impacts']].dropna(subset=['Impacts'])
                 if len(imp_all_data) > 0:
                     unique_imps_all = imp_all_data['Impacts'].unique()
-                    all_text = ' '.join([str(i).lower() for i in unique_imps_all])
                     
                     # Identify impact types across all services
-                    impact_types = []
-                    impact_keywords = {
-                        'availability': ['availability', 'downtime', 'unavailable', 'outage'],
-                        'performance degradation': ['degradation', 'slow', 'latency', 'delay'],
-                        'customer impact': ['customer', 'user', 'client', 'tenant'],
-                        'data issues': ['data', 'data loss', 'corruption', 'inconsistency'],
-                        'API failures': ['api', 'endpoint', 'request', 'call'],
-                        'authentication': ['authentication', 'login', 'access', 'authorization'],
-                        'service errors': ['error', 'failure', 'failed', 'exception'],
-                        'regional impact': ['region', 'regional', 'geography', 'geo']
-                    }
-                    
-                    for impact_type, keywords in impact_keywords.items():
-                        if any(kw in all_text for kw in keywords):
-                            impact_types.append(impact_type)
+                    impact_types = tags_present(fdf, 'ImpactSummaryTags')
                     
                     # Calculate severity breakdown
                     severity_counts = fdf['Severity'].value_counts().to_dict() if 'Severity' in fdf.columns else {}
@@ -865,503 +1567,23 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                 }
             )
             
-            service_rows = []
-            
-            # Group by Service
-            for service in sorted(fdf['ServiceName'].dropna().unique()):
-                svc_df = fdf[fdf['ServiceName'] == service]
-                svc_incidents = len(svc_df)
-                svc_ttm = svc_df['TTM'].mean() if 'TTM' in svc_df.columns else 0
-                
-                # Service header row (bold, larger)
-                service_rows.append(html.Tr([
-                    html.Td(service, colSpan=6, style={
+            # One collapsed section per service; its team rows are rendered by
+            # expand_service() when the section is opened
+            ttm = fdf['TTM'].astype(float).to_numpy() if 'TTM' in fdf.columns else np.nan
+            service_totals = pd.DataFrame({'ServiceName': fdf['ServiceName'].to_numpy(dtype=object), 'TTM': ttm}).groupby(
+                'ServiceName').agg(Incidents=('TTM', 'size'), TTM=('TTM', 'mean'))
+            service_sections = [
+                html.Details([
+                    html.Summary(f"{service} ({int(totals['Incidents'])} incidents, {totals['TTM']:.0f} min avg)", style={
                         'padding': '12px', 'backgroundColor': '#E1F5FE', 'fontWeight': 'bold',
-                        'fontSize': '14px', 'borderBottom': f'2px solid {BLUE}'
-                    })
-                ]))
-                
-                # Group by Team within Service
-                if 'OwningTeamName' in svc_df.columns:
-                    for team in sorted(svc_df['OwningTeamName'].dropna().unique()):
-                        team_df = svc_df[svc_df['OwningTeamName'] == team]
-                        team_incidents = len(team_df)
-                        team_ttm = team_df['TTM'].mean() if 'TTM' in team_df.columns else 0
-                        
-                        # Build detailed Root Causes breakdown
-                        root_causes_content = []
-                        if 'RootCauses' in team_df.columns and 'OutageIncidentId' in team_df.columns:
-                            # Include additional columns for symbols
-                            cols_to_select = ['OutageIncidentId', 'RootCauses']
-                            if 'IsPartOfEvent' in team_df.columns:
-                                cols_to_select.append('IsPartOfEvent')
-                            if 'IsCausedByChange' in team_df.columns:
-                                cols_to_select.append('IsCausedByChange')
-                            
-                            rc_data = team_df[cols_to_select].dropna(subset=['RootCauses'])
-                            if len(rc_data) > 0:
-                                # Extract key themes from root causes
-                                unique_rcs = rc_data['RootCauses'].unique()
-                                all_text = ' '.join([str(rc).lower() for rc in unique_rcs])
-                                
-                                # Identify common themes
-                                themes = []
-                                theme_keywords = {
-                                    'connectivity': ['connectivity', 'connection', 'network', 'endpoint'],
-                                    'configuration': ['configuration', 'config', 'misconfiguration', 'setting'],
-                                    'capacity': ['capacity', 'resource exhaustion', 'memory', 'cpu', 'throttling'],
-                                    'deployment': ['deployment', 'rollout', 'release', 'code change'],
-                                    'certificate': ['certificate', 'cert', 'ssl', 'tls', 'authentication'],
-                                    'timeout': ['timeout', 'timed out', 'latency', 'slow'],
-                                    'failure': ['failure', 'failed', 'error', 'exception'],
-                                    'dependency': ['dependency', 'dependent', 'downstream', 'upstream']
-                                }
-                                
-                                for theme, keywords in theme_keywords.items():
-                                    if any(kw in all_text for kw in keywords):
-                                        themes.append(theme)
-                                
-                                # Create summary sentence with themes
-                                rc_summary = f"This team experienced {len(rc_data)} incidents with {len(unique_rcs)} distinct root cause(s)"
-                                if themes:
-                                    themes_str = ', '.join(themes[:3])  # Limit to top 3 themes
-                                    rc_summary += f", primarily related to {themes_str} issues."
-                                else:
-                                    rc_summary += "."
-                                
-                                root_causes_content.append(html.P(rc_summary, style={'margin': '0 0 8px 0', 'fontWeight': '500', 'fontSize': '11px'}))
-                                
-                                # List each root cause with incident IDs
-                                for _, row in rc_data.iterrows():
-                                    inc_id = row['OutageIncidentId']
-                                    inc_url = f"https://portal.microsofticm.com/imp/v5/incidents/details/{inc_id}/summary"
-                                    
-                                    # Add symbols for Event and CausedByChange
-                                    symbols = []
-                                    if 'IsPartOfEvent' in row and row['IsPartOfEvent'] == True:
-                                        symbols.append(html.Span('🔗', title='Part of cascading event', style={'marginLeft': '4px'}))
-                                    if 'IsCausedByChange' in row and row['IsCausedByChange'] == 1:
-                                        symbols.append(html.Span('🔄', title='Caused by change', style={'marginLeft': '4px'}))
-                                    
-                                    root_causes_content.append(html.Div([
-                                        html.Span('• ', style={'color': BLUE, 'fontWeight': 'bold'}),
-                                        html.A(f"[INC {inc_id}]", 
-                                               href=inc_url, 
-                                               target="_blank",
-                                               style={'fontWeight': '600', 'color': BLUE, 'fontSize': '10px', 'textDecoration': 'none'}),
-                                        *symbols,
-                                        html.Span(": ", style={'fontWeight': '600', 'color': '#666', 'fontSize': '10px'}),
-                                        html.Span(str(row['RootCauses']), style={'fontSize': '10px'})
-                                    ], style={'marginLeft': '10px', 'marginBottom': '4px'}))
-                        
-                        if not root_causes_content:
-                            root_causes_content = [html.P('N/A', style={'color': '#999', 'fontSize': '11px'})]
-                        
-                        # Build detailed Mitigations breakdown
-                        mitigations_content = []
-                        if 'Mitigations' in team_df.columns and 'OutageIncidentId' in team_df.columns:
-                            # Include additional columns for symbols
-                            cols_to_select = ['OutageIncidentId', 'Mitigations']
-                            if 'IsPartOfEvent' in team_df.columns:
-                                cols_to_select.append('IsPartOfEvent')
-                            if 'IsCausedByChange' in team_df.columns:
-                                cols_to_select.append('IsCausedByChange')
-                            
-                            mit_data = team_df[cols_to_select].dropna(subset=['Mitigations'])
-                            if len(mit_data) > 0:
-                                # Extract key themes from mitigations
-                                unique_mits = mit_data['Mitigations'].unique()
-                                all_text = ' '.join([str(m).lower() for m in unique_mits])
-                                
-                                # Identify common mitigation actions
-                                actions = []
-                                action_keywords = {
-                                    'restart/reboot': ['restart', 'reboot', 'recycle', 'bounce'],
-                                    'rollback': ['rollback', 'rolled back', 'reverted', 'revert'],
-                                    'scaling': ['scale', 'scaled', 'scaling', 'capacity increase'],
-                                    'failover': ['failover', 'failed over', 'switched', 'redirected'],
-                                    'configuration change': ['config change', 'reconfigured', 'updated settings'],
-                                    'traffic management': ['traffic', 'throttle', 'rate limit', 'blocked'],
-                                    'repair': ['repair', 'fixed', 'patched', 'resolved'],
-                                    'isolation': ['isolated', 'quarantine', 'disabled', 'removed']
-                                }
-                                
-                                for action, keywords in action_keywords.items():
-                                    if any(kw in all_text for kw in keywords):
-                                        actions.append(action)
-                                
-                                # Create summary sentence with actions
-                                mit_summary = f"This team applied {len(unique_mits)} distinct mitigation(s) across {len(mit_data)} incidents"
-                                if actions:
-                                    actions_str = ', '.join(actions[:3])  # Limit to top 3 actions
-                                    mit_summary += f", including {actions_str}."
-                                else:
-                                    mit_summary += "."
-                                
-                                mitigations_content.append(html.P(mit_summary, style={'margin': '0 0 8px 0', 'fontWeight': '500', 'fontSize': '11px'}))
-                                
-                                # List each mitigation with incident IDs
-                                for _, row in mit_data.iterrows():
-                                    inc_id = row['OutageIncidentId']
-                                    inc_url = f"https://portal.microsofticm.com/imp/v5/incidents/details/{inc_id}/summary"
-                                    
-                                    # Add symbols for Event and CausedByChange
-                                    symbols = []
-                                    if 'IsPartOfEvent' in row and row['IsPartOfEvent'] == True:
-                                        symbols.append(html.Span('🔗', title='Part of cascading event', style={'marginLeft': '4px'}))
-                                    if 'IsCausedByChange' in row and row['IsCausedByChange'] == 1:
-                                        symbols.append(html.Span('🔄', title='Caused by change', style={'marginLeft': '4px'}))
-                                    
-                                    mitigations_content.append(html.Div([
-                                        html.Span('• ', style={'color': BLUE, 'fontWeight': 'bold'}),
-                                        html.A(f"[INC {inc_id}]", 
-                                               href=inc_url, 
-                                               target="_blank",
-                                               style={'fontWeight': '600', 'color': BLUE, 'fontSize': '10px', 'textDecoration': 'none'}),
-                                        *symbols,
-                                        html.Span(": ", style={'fontWeight': '600', 'color': '#666', 'fontSize': '10px'}),
-                                        html.Span(str(row['Mitigations']), style={'fontSize': '10px'})
-                                    ], style={'marginLeft': '10px', 'marginBottom': '4px'}))
-                        
-                        if not mitigations_content:
-                            mitigations_content = [html.P('N/A', style={'color': '#999', 'fontSize': '11px'})]
-                        
-                        # Build detailed Impacts breakdown
-                        impacts_content = []
-                        if 'Impacts' in team_df.columns and 'OutageIncidentId' in team_df.columns:
-                            # Include additional columns for symbols
-                            cols_to_select = ['OutageIncidentId', 'Impacts']
-                            if 'IsPartOfEvent' in team_df.columns:
-                                cols_to_select.append('IsPartOfEvent')
-                            if 'IsCausedByChange' in team_df.columns:
-                                cols_to_select.append('IsCausedByChange')
-                            
-                            imp_data = team_df[cols_to_select].dropna(subset=['Impacts'])
-                            if len(imp_data) > 0:
-                                # Extract key themes from impacts
-                                unique_imps = imp_data['Impacts'].unique()
-                                all_text = ' '.join([str(i).lower() for i in unique_imps])
-                                
-                                # Identify common impact types
-                                impact_types = []
-                                impact_keywords = {
-                                    'availability': ['availability', 'downtime', 'unavailable', 'outage'],
-                                    'performance degradation': ['degradation', 'slow', 'latency', 'delay'],
-                                    'customer impact': ['customer', 'user', 'client', 'tenant'],
-                                    'data issues': ['data', 'data loss', 'corruption', 'inconsistency'],
-                                    'API failures': ['api', 'endpoint', 'request', 'call'],
-                                    'authentication': ['authentication', 'login', 'access', 'authorization'],
-                                    'service errors': ['error', 'failure', 'failed', 'exception'],
-                                    'regional impact': ['region', 'regional', 'geography', 'geo']
-                                }
-                                
-                                for impact_type, keywords in impact_keywords.items():
-                                    if any(kw in all_text for kw in keywords):
-                                        impact_types.append(impact_type)
-                                
-                                # Create summary sentence with impact types
-                                imp_summary = f"This team's incidents resulted in {len(unique_imps)} distinct impact(s) across {len(imp_data)} incidents"
-                                if impact_types:
-                                    impacts_str = ', '.join(impact_types[:3])  # Limit to top 3 impact types
-                                    imp_summary += f", affecting {impacts_str}."
-                                else:
-                                    imp_summary += "."
-                                
-                                impacts_content.append(html.P(imp_summary, style={'margin': '0 0 8px 0', 'fontWeight': '500', 'fontSize': '11px'}))
-                                
-                                # List each impact with incident IDs
-                                for _, row in imp_data.iterrows():
-                                    inc_id = row['OutageIncidentId']
-                                    inc_url = f"https://portal.microsofticm.com/imp/v5/incidents/details/{inc_id}/summary"
-                                    
-                                    # Add symbols for Event and CausedByChange
-                                    symbols = []
-                                    if 'IsPartOfEvent' in row and row['IsPartOfEvent'] == True:
-                                        symbols.append(html.Span('🔗', title='Part of cascading event', style={'marginLeft': '4px'}))
-                                    if 'IsCausedByChange' in row and row['IsCausedByChange'] == 1:
-                                        symbols.append(html.Span('🔄', title='Caused by change', style={'marginLeft': '4px'}))
-                                    
-                                    impacts_content.append(html.Div([
-                                        html.Span('• ', style={'color': BLUE, 'fontWeight': 'bold'}),
-                                        html.A(f"[INC {inc_id}]", 
-                                               href=inc_url, 
-                                               target="_blank",
-                                               style={'fontWeight': '600', 'color': BLUE, 'fontSize': '10px', 'textDecoration': 'none'}),
-                                        *symbols,
-                                        html.Span(": ", style={'fontWeight': '600', 'color': '#666', 'fontSize': '10px'}),
-                                        html.Span(str(row['Impacts']), style={'fontSize': '10px'})
-                                    ], style={'marginLeft': '10px', 'marginBottom': '4px'}))
-                        
-                        if not impacts_content:
-                            impacts_content = [html.P('N/A', style={'color': '#999', 'fontSize': '11px'})]
-                                                
-                        if not impacts_content:
-                            impacts_content = [html.P('N/A', style={'color': '#999', 'fontSize': '11px'})]
-                        
-                        # Team row
-                        service_rows.append(html.Tr([
-                            html.Td(f'  └─ {team}', style={
-                                'padding': '8px', 'fontWeight': '500', 'fontSize': '12px',
-                                'borderBottom': f'1px solid {BORDER}', 'width': '15%',
-                                'verticalAlign': 'top'
-                            }),
-                            html.Td(f'{team_incidents} incidents', style={
-                                'padding': '8px', 'fontSize': '11px',
-                                'borderBottom': f'1px solid {BORDER}', 'width': '10%',
-                                'verticalAlign': 'top'
-                            }),
-                            html.Td(f'{team_ttm:.0f} min avg', style={
-                                'padding': '8px', 'fontSize': '11px',
-                                'borderBottom': f'1px solid {BORDER}', 'width': '10%',
-                                'verticalAlign': 'top'
-                            }),
-                            html.Td(html.Div(root_causes_content), style={
-                                'padding': '8px', 'fontSize': '11px',
-                                'borderBottom': f'1px solid {BORDER}', 'width': '25%',
-                                'verticalAlign': 'top'
-                            }),
-                            html.Td(html.Div(mitigations_content), style={
-                                'padding': '8px', 'fontSize': '11px',
-                                'borderBottom': f'1px solid {BORDER}', 'width': '20%',
-                                'verticalAlign': 'top'
-                            }),
-                            html.Td(html.Div(impacts_content), style={
-                                'padding': '8px', 'fontSize': '11px',
-                                'borderBottom': f'1px solid {BORDER}', 'width': '20%',
-                                'verticalAlign': 'top'
-                            })
-                        ]))
-            
-            # Build correlation analysis at the bottom
-            correlation_sections = []
-            
-            # Analyze Root Cause patterns
-            if 'RootCauses' in fdf.columns and len(fdf) > 0:
-                # Extract common root cause themes
-                rc_theme_mapping = {
-                    'Connectivity': ['connectivity', 'connection', 'network', 'endpoint'],
-                    'Configuration': ['configuration', 'config', 'misconfiguration'],
-                    'Capacity': ['capacity', 'resource exhaustion', 'memory', 'throttling'],
-                    'Deployment': ['deployment', 'rollout', 'release'],
-                    'Certificate': ['certificate', 'cert', 'ssl', 'tls'],
-                    'Timeout': ['timeout', 'timed out', 'latency'],
-                    'Dependency': ['dependency', 'dependent', 'downstream']
-                }
-                
-                rc_stats = []
-                for theme, keywords in rc_theme_mapping.items():
-                    # Find incidents matching this theme
-                    mask = fdf['RootCauses'].fillna('').str.lower().apply(
-                        lambda x: any(kw in x for kw in keywords)
-                    )
-                    theme_df = fdf[mask]
-                    
-                    if len(theme_df) > 0:
-                        p75_ttm = theme_df['TTM'].quantile(0.75) if 'TTM' in theme_df.columns else 0
-                        incident_count = len(theme_df)
-                        service_count = theme_df['ServiceName'].nunique() if 'ServiceName' in theme_df.columns else 0
-                        severity_counts = theme_df['Severity'].value_counts().to_dict() if 'Severity' in theme_df.columns else {}
-                        
-                        rc_stats.append({
-                            'theme': theme,
-                            'p75': p75_ttm,
-                            'count': incident_count,
-                            'services': service_count,
-                            'severity': severity_counts
-                        })
-                
-                if rc_stats:
-                    # Sort by P75 TTM descending
-                    rc_stats.sort(key=lambda x: x['p75'], reverse=True)
-                    
-                    rc_rows = []
-                    for stat in rc_stats[:5]:  # Top 5
-                        sev_text = ', '.join([f"{k}:{v}" for k, v in sorted(stat['severity'].items())])
-                        rc_rows.append(html.Tr([
-                            html.Td(stat['theme'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(f"{stat['p75']:.0f} min", style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee', 'fontWeight': 'bold', 'color': BLUE}),
-                            html.Td(str(stat['count']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(str(stat['services']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(sev_text, style={'padding': '8px', 'fontSize': '10px', 'borderBottom': '1px solid #eee'})
-                        ]))
-                    
-                    correlation_sections.append(html.Div([
-                        html.H4('Root Cause Pattern Analysis', style={'color': BLUE, 'marginTop': '20px', 'marginBottom': '10px', 'fontSize': '14px'}),
-                        html.Table([
-                            html.Thead(html.Tr([
-                                html.Th('Root Cause Theme', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold', 'textAlign': 'left'}),
-                                html.Th('P75 TTM', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Incidents', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Services', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Severity Breakdown', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'})
-                            ])),
-                            html.Tbody(rc_rows)
-                        ], style={'width': '100%', 'borderCollapse': 'collapse', 'backgroundColor': 'white'})
-                    ]))
-            
-            # Analyze Mitigation effectiveness
-            if 'Mitigations' in fdf.columns and len(fdf) > 0:
-                mit_action_mapping = {
-                    'Restart/Reboot': ['restart', 'reboot', 'recycle'],
-                    'Rollback': ['rollback', 'rolled back', 'reverted'],
-                    'Scaling': ['scale', 'scaled', 'scaling'],
-                    'Failover': ['failover', 'failed over', 'switched'],
-                    'Config Change': ['config change', 'reconfigured'],
-                    'Traffic Mgmt': ['throttle', 'rate limit', 'blocked']
-                }
-                
-                mit_stats = []
-                for action, keywords in mit_action_mapping.items():
-                    mask = fdf['Mitigations'].fillna('').str.lower().apply(
-                        lambda x: any(kw in x for kw in keywords)
-                    )
-                    action_df = fdf[mask]
-                    
-                    if len(action_df) > 0:
-                        p75_ttm = action_df['TTM'].quantile(0.75) if 'TTM' in action_df.columns else 0
-                        incident_count = len(action_df)
-                        service_count = action_df['ServiceName'].nunique() if 'ServiceName' in action_df.columns else 0
-                        severity_counts = action_df['Severity'].value_counts().to_dict() if 'Severity' in action_df.columns else {}
-                        
-                        mit_stats.append({
-                            'action': action,
-                            'p75': p75_ttm,
-                            'count': incident_count,
-                            'services': service_count,
-                            'severity': severity_counts
-                        })
-                
-                if mit_stats:
-                    # Sort by incident count descending
-                    mit_stats.sort(key=lambda x: x['count'], reverse=True)
-                    
-                    mit_rows = []
-                    for stat in mit_stats[:5]:  # Top 5
-                        sev_text = ', '.join([f"{k}:{v}" for k, v in sorted(stat['severity'].items())])
-                        mit_rows.append(html.Tr([
-                            html.Td(stat['action'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(f"{stat['p75']:.0f} min", style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee', 'fontWeight': 'bold', 'color': BLUE}),
-                            html.Td(str(stat['count']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(str(stat['services']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(sev_text, style={'padding': '8px', 'fontSize': '10px', 'borderBottom': '1px solid #eee'})
-                        ]))
-                    
-                    correlation_sections.append(html.Div([
-                        html.H4('Mitigation Effectiveness Analysis', style={'color': BLUE, 'marginTop': '20px', 'marginBottom': '10px', 'fontSize': '14px'}),
-                        html.Table([
-                            html.Thead(html.Tr([
-                                html.Th('Mitigation Action', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold', 'textAlign': 'left'}),
-                                html.Th('P75 TTM', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Incidents', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Services', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Severity Breakdown', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'})
-                            ])),
-                            html.Tbody(mit_rows)
-                        ], style={'width': '100%', 'borderCollapse': 'collapse', 'backgroundColor': 'white'})
-                    ]))
-            
-            # Analyze Impact patterns
-            if 'Impacts' in fdf.columns and len(fdf) > 0:
-                impact_type_mapping = {
-                    'Availability': ['availability', 'downtime', 'unavailable'],
-                    'Performance': ['degradation', 'slow', 'latency'],
-                    'Customer': ['customer', 'user', 'tenant'],
-                    'API Failures': ['api', 'endpoint', 'request'],
-                    'Regional': ['region', 'regional', 'geography']
-                }
-                
-                imp_stats = []
-                for imp_type, keywords in impact_type_mapping.items():
-                    mask = fdf['Impacts'].fillna('').str.lower().apply(
-                        lambda x: any(kw in x for kw in keywords)
-                    )
-                    imp_df = fdf[mask]
-                    
-                    if len(imp_df) > 0:
-                        p75_ttm = imp_df['TTM'].quantile(0.75) if 'TTM' in imp_df.columns else 0
-                        incident_count = len(imp_df)
-                        service_count = imp_df['ServiceName'].nunique() if 'ServiceName' in imp_df.columns else 0
-                        severity_counts = imp_df['Severity'].value_counts().to_dict() if 'Severity' in imp_df.columns else {}
-                        
-                        imp_stats.append({
-                            'type': imp_type,
-                            'p75': p75_ttm,
-                            'count': incident_count,
-                            'services': service_count,
-                            'severity': severity_counts
-                        })
-                
-                if imp_stats:
-                    # Sort by P75 TTM descending
-                    imp_stats.sort(key=lambda x: x['p75'], reverse=True)
-                    
-                    imp_rows = []
-                    for stat in imp_stats[:5]:  # Top 5
-                        sev_text = ', '.join([f"{k}:{v}" for k, v in sorted(stat['severity'].items())])
-                        imp_rows.append(html.Tr([
-                            html.Td(stat['type'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(f"{stat['p75']:.0f} min", style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee', 'fontWeight': 'bold', 'color': BLUE}),
-                            html.Td(str(stat['count']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(str(stat['services']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
-                            html.Td(sev_text, style={'padding': '8px', 'fontSize': '10px', 'borderBottom': '1px solid #eee'})
-                        ]))
-                    
-                    correlation_sections.append(html.Div([
-                        html.H4('Impact Pattern Analysis', style={'color': BLUE, 'marginTop': '20px', 'marginBottom': '10px', 'fontSize': '14px'}),
-                        html.Table([
-                            html.Thead(html.Tr([
-                                html.Th('Impact Type', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold', 'textAlign': 'left'}),
-                                html.Th('P75 TTM', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Incidents', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Services', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'}),
-                                html.Th('Severity Breakdown', style={'padding': '8px', 'borderBottom': f'2px solid {BLUE}', 'fontSize': '11px', 'fontWeight': 'bold'})
-                            ])),
-                            html.Tbody(imp_rows)
-                        ], style={'width': '100%', 'borderCollapse': 'collapse', 'backgroundColor': 'white'})
-                    ]))
+                        'fontSize': '14px', 'borderBottom': f'2px solid {BLUE}', 'cursor': 'pointer'
+                    }),
+                    html.Div(id={'type': 'service-body', 'service': service})
+                ], id={'type': 'service-details', 'service': service}, open=False)
+                for service, totals in service_totals.iterrows()
+            ]
             
-            # Create correlation analysis box
-            if correlation_sections:
-                correlation_analysis = html.Div(
-                    correlation_sections,
-                    style={
-                        'backgroundColor': '#F8F9FA',
-                        'padding': '20px',
-                        'borderRadius': '8px',
-                        'marginTop': '20px',
-                        'border': '2px solid #e0e0e0',
-                        'boxShadow': '0 2px 4px rgba(0,0,0,0.05)'
-                    }
-                )
-            else:
-                correlation_analysis = html.Div()
-            
-            service_analysis_table = html.Div([
-                all_up_summary,
-                html.Table([
-                    html.Thead(html.Tr([
-                        html.Th('Team', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
-                                              'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                              'fontSize': '12px', 'fontWeight': 'bold'}),
-                        html.Th('Count', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
-                                               'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                               'fontSize': '12px', 'fontWeight': 'bold'}),
-                        html.Th('Avg TTM', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
-                                                 'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                                 'fontSize': '12px', 'fontWeight': 'bold'}),
-                        html.Th('Root Causes', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
-                                                     'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                                     'fontSize': '12px', 'fontWeight': 'bold'}),
-                        html.Th('Mitigations', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
-                                                      'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                                      'fontSize': '12px', 'fontWeight': 'bold'}),
-                        html.Th('Impacts', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
-                                                 'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
-                                                 'fontSize': '12px', 'fontWeight': 'bold'})
-                    ])),
-                    html.Tbody(service_rows)
-                ], style={'width': '100%', 'borderCollapse': 'collapse'})
-            ])
+            service_analysis_table = html.Div([all_up_summary, *service_sections])
         else:
             service_analysis_table = html.Div("No data available for service analysis", 
                                              style={'padding': '20px', 'textAlign': 'center', 'color': '#666'})
@@ -1369,6 +1591,190 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
         service_analysis_table = html.Div(f"Error loading service analysis: {str(e)}", 
                                          style={'padding': '20px', 'textAlign': 'center', 'color': 'red'})
     
+    return service_analysis_table
+
+
+# Team table of an expanded service: summary sentence per text column, then its incidents
+SERVICE_TEXT_COLUMNS = {
+    'RootCauses': ('RootCauseSummaryTags', lambda n, distinct, themes: (
+        f"This team experienced {n} incidents with {distinct} distinct root cause(s)"
+        + (f", primarily related to {themes} issues." if themes else "."))),
+    'Mitigations': ('MitigationSummaryTags', lambda n, distinct, themes: (
+        f"This team applied {distinct} distinct mitigation(s) across {n} incidents"
+        + (f", including {themes}." if themes else "."))),
+    'Impacts': ('ImpactSummaryTags', lambda n, distinct, themes: (
+        f"This team's incidents resulted in {distinct} distinct impact(s) across {n} incidents"
+        + (f", affecting {themes}." if themes else ".")))
+}
+
+
+def service_team_stats(fdf):
+    """Incidents, mean TTM, text counts and summary themes per (service, team) from one groupby
+
+    Theme columns are named '<taxonomy>_<bit>' and hold 1 when any incident of
+    the team has that tag. None when the teams are not known.
+    """
+    if 'ServiceName' not in fdf.columns or 'OwningTeamName' not in fdf.columns:
+        return None
+    work = pd.DataFrame({
+        'ServiceName': fdf['ServiceName'].to_numpy(dtype=object),
+        'OwningTeamName': fdf['OwningTeamName'].to_numpy(dtype=object),
+        'TTM': fdf['TTM'].astype(float).to_numpy() if 'TTM' in fdf.columns else np.nan
+    })
+    aggs = {'Incidents': ('TTM', 'size'), 'TTM': ('TTM', 'mean')}
+    for column, (taxonomy, _) in SERVICE_TEXT_COLUMNS.items():
+        if column not in fdf.columns or 'OutageIncidentId' not in fdf.columns:
+            continue
+        work[column] = fdf[column].to_numpy(dtype=object)
+        aggs[f'{column}_n'] = (column, 'count')
+        aggs[f'{column}_distinct'] = (column, 'nunique')
+        bits = fdf[taxonomy].to_numpy()
+        for i in range(len(TAXONOMY_TAGGERS[taxonomy].tags[taxonomy])):
+            work[f'{taxonomy}_{i}'] = (bits >> i) & 1
+            aggs[f'{taxonomy}_{i}'] = (f'{taxonomy}_{i}', 'max')
+    return work.groupby(['ServiceName', 'OwningTeamName']).agg(**aggs)
+
+
+def incident_lines(team_df, column):
+    """One linked line per incident of the team with text in `column`"""
+    rows = team_df.dropna(subset=[column])
+    in_event = (rows['IsPartOfEvent'] == True).fillna(False).to_numpy(dtype=bool) if 'IsPartOfEvent' in rows.columns \
+        else np.zeros(len(rows), dtype=bool)
+    by_change = (rows['IsCausedByChange'] == 1).fillna(False).to_numpy(dtype=bool) if 'IsCausedByChange' in rows.columns \
+        else np.zeros(len(rows), dtype=bool)
+    lines = []
+    for inc_id, text, event, change in zip(rows['OutageIncidentId'], rows[column], in_event, by_change):
+        inc_url = f"https://portal.microsofticm.com/imp/v5/incidents/details/{inc_id}/summary"
+        
+        # Add symbols for Event and CausedByChange
+        symbols = []
+        if event:
+            symbols.append(html.Span('🔗', title='Part of cascading event', style={'marginLeft': '4px'}))
+        if change:
+            symbols.append(html.Span('🔄', title='Caused by change', style={'marginLeft': '4px'}))
+        
+        lines.append(html.Div([
+            html.Span('• ', style={'color': BLUE, 'fontWeight': 'bold'}),
+            html.A(f"[INC {inc_id}]", 
+                   href=inc_url, 
+                   target="_blank",
+                   style={'fontWeight': '600', 'color': BLUE, 'fontSize': '10px', 'textDecoration': 'none'}),
+            *symbols,
+            html.Span(": ", style={'fontWeight': '600', 'color': '#666', 'fontSize': '10px'}),
+            html.Span(str(text), style={'fontSize': '10px'})
+        ], style={'marginLeft': '10px', 'marginBottom': '4px'}))
+    return lines
+
+
+@timings.timed('service_teams')
+def build_service_teams(fdf, stats, service):
+    """Team table of one service, from the per-team statistics plus that service's incidents"""
+    if stats is None or service not in stats.index.get_level_values(0):
+        return html.P('No team data', style={'color': '#999', 'fontSize': '11px', 'padding': '8px'})
+    svc_df = fdf[(fdf['ServiceName'] == service).to_numpy(dtype=bool)]
+    team_frames = dict(tuple(svc_df.groupby(svc_df['OwningTeamName'].to_numpy(dtype=object))))
+    
+    team_rows = []
+    for team, team_stats in stats.loc[service].iterrows():
+        cells = []
+        for column, (taxonomy, summary) in SERVICE_TEXT_COLUMNS.items():
+            content = []
+            if team_stats.get(f'{column}_n', 0) > 0:
+                tags = TAXONOMY_TAGGERS[taxonomy].tags[taxonomy]
+                themes = [tag for i, tag in enumerate(tags) if team_stats[f'{taxonomy}_{i}']]
+                text = summary(int(team_stats[f'{column}_n']), int(team_stats[f'{column}_distinct']),
+                               ', '.join(themes[:3]))  # Limit to top 3 themes
+                content.append(html.P(text, style={'margin': '0 0 8px 0', 'fontWeight': '500', 'fontSize': '11px'}))
+                content.extend(incident_lines(team_frames[team], column))
+            cells.append(content or [html.P('N/A', style={'color': '#999', 'fontSize': '11px'})])
+        root_causes_content, mitigations_content, impacts_content = cells
+        
+        # Team row
+        team_rows.append(html.Tr([
+            html.Td(f'  └─ {team}', style={
+                'padding': '8px', 'fontWeight': '500', 'fontSize': '12px',
+                'borderBottom': f'1px solid {BORDER}', 'width': '15%',
+                'verticalAlign': 'top'
+            }),
+            html.Td(f"{int(team_stats['Incidents'])} incidents", style={
+                'padding': '8px', 'fontSize': '11px',
+                'borderBottom': f'1px solid {BORDER}', 'width': '10%',
+                'verticalAlign': 'top'
+            }),
+            html.Td(f"{team_stats['TTM']:.0f} min avg", style={
+                'padding': '8px', 'fontSize': '11px',
+                'borderBottom': f'1px solid {BORDER}', 'width': '10%',
+                'verticalAlign': 'top'
+            }),
+            html.Td(html.Div(root_causes_content), style={
+                'padding': '8px', 'fontSize': '11px',
+                'borderBottom': f'1px solid {BORDER}', 'width': '25%',
+                'verticalAlign': 'top'
+            }),
+            html.Td(html.Div(mitigations_content), style={
+                'padding': '8px', 'fontSize': '11px',
+                'borderBottom': f'1px solid {BORDER}', 'width': '20%',
+                'verticalAlign': 'top'
+            }),
+            html.Td(html.Div(impacts_content), style={
+                'padding': '8px', 'fontSize': '11px',
+                'borderBottom': f'1px solid {BORDER}', 'width': '20%',
+                'verticalAlign': 'top'
+            })
+        ]))
+    
+    return html.Table([
+        html.Thead(html.Tr([
+            html.Th('Team', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
+                                  'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
+                                  'fontSize': '12px', 'fontWeight': 'bold'}),
+            html.Th('Count', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
+                                   'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
+                                   'fontSize': '12px', 'fontWeight': 'bold'}),
+            html.Th('Avg TTM', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
+                                     'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
+                                     'fontSize': '12px', 'fontWeight': 'bold'}),
+            html.Th('Root Causes', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
+                                         'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
+                                         'fontSize': '12px', 'fontWeight': 'bold'}),
+            html.Th('Mitigations', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
+                                          'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
+                                          'fontSize': '12px', 'fontWeight': 'bold'}),
+            html.Th('Impacts', style={'padding': '10px', 'borderBottom': f'2px solid {BLUE}',
+                                     'position': 'sticky', 'top': '0', 'backgroundColor': 'white',
+                                     'fontSize': '12px', 'fontWeight': 'bold'})
+        ])),
+        html.Tbody(team_rows)
+    ], style={'width': '100%', 'borderCollapse': 'collapse'})
+
+
+@app.callback(
+    Output({'type': 'service-body', 'service': MATCH}, 'children'),
+    Input({'type': 'service-details', 'service': MATCH}, 'open'),
+    [State({'type': 'service-details', 'service': MATCH}, 'id'), State('filter-store', 'data')],
+    prevent_initial_call=True
+)
+def expand_service(is_open, details_id, store):
+    """Render a service's team table the first time its section is opened"""
+    if not is_open:
+        raise PreventUpdate
+    dataset, key = store_state(store)
+    fdf = filtered_frame(dataset, key)
+    stats = dataset.result_cache.get(key, 'service_teams', lambda: service_team_stats(fdf))
+    return build_service_teams(fdf, stats, details_id['service'])
+
+
+@app.callback(
+    Output('pattern-analysis', 'children'),
+    Input('filter-store', 'data')
+)
+def update_pattern_analysis(store):
+    return cached_panel(store, 'pattern_analysis', build_pattern_analysis)
+
+
+@timings.timed('pattern_analysis')
+def build_pattern_analysis(fdf):
+    
     # ========================================================================
     # PATTERN & CORRELATION ANALYSIS SECTION
     # ========================================================================
@@ -1376,70 +1782,50 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
         if not fdf.empty:
             pattern_sections = []
             
-            # Root cause theme mapping (same as used earlier)
-            rc_theme_mapping = {
-                'Connectivity': ['connectivity', 'connection', 'network', 'endpoint'],
-                'Configuration': ['configuration', 'config', 'misconfiguration'],
-                'Capacity': ['capacity', 'resource exhaustion', 'memory', 'throttling'],
-                'Deployment': ['deployment', 'rollout', 'release'],
-                'Certificate': ['certificate', 'cert', 'ssl', 'tls'],
-                'Timeout': ['timeout', 'timed out', 'latency'],
-                'Dependency': ['dependency', 'dependent', 'downstream']
-            }
-            
-            # Mitigation action mapping (same as used earlier)
-            mit_action_mapping = {
-                'Restart/Reboot': ['restart', 'reboot', 'recycle'],
-                'Rollback': ['rollback', 'rolled back', 'reverted'],
-                'Scaling': ['scale', 'scaled', 'scaling'],
-                'Failover': ['failover', 'failed over', 'switched'],
-                'Config Change': ['config change', 'reconfigured'],
-                'Traffic Mgmt': ['throttle', 'rate limit', 'blocked']
-            }
-            
             # Build Root Cause × Mitigation Combination Analysis (optimized with pre-computed columns)
             combination_stats = []
-            rc_column_map = {
-                'Connectivity': 'has_connectivity',
-                'Configuration': 'has_configuration',
-                'Capacity': 'has_capacity',
-                'Deployment': 'has_deployment',
-                'Certificate': 'has_certificate',
-                'Timeout': 'has_timeout',
-                'Dependency': 'has_dependency'
+            rc_labels = {
+                'connectivity': 'Connectivity',
+                'configuration': 'Configuration',
+                'capacity': 'Capacity',
+                'deployment': 'Deployment',
+                'certificate': 'Certificate',
+                'timeout': 'Timeout',
+                'dependency': 'Dependency'
             }
-            mit_column_map = {
-                'Restart/Reboot': 'has_restart',
-                'Rollback': 'has_rollback',
-                'Scaling': 'has_scaling',
-                'Failover': 'has_failover',
-                'Config Change': 'has_config_change',
-                'Traffic Mgmt': 'has_traffic_mgmt'
+            mit_labels = {
+                'restart': 'Restart/Reboot',
+                'rollback': 'Rollback',
+                'scaling': 'Scaling',
+                'failover': 'Failover',
+                'config_change': 'Config Change',
+                'traffic_mgmt': 'Traffic Mgmt'
             }
             
-            for rc_theme, rc_col in rc_column_map.items():
-                for mit_action, mit_col in mit_column_map.items():
-                    # Use pre-computed boolean columns (100x faster than keyword matching)
-                    if rc_col in fdf.columns and mit_col in fdf.columns:
-                        combo_df = fdf[fdf[rc_col] & fdf[mit_col]]
-                    else:
-                        combo_df = pd.DataFrame()
-                    
-                    if len(combo_df) >= 2:  # At least 2 incidents to avoid noise
-                        p75_ttm = combo_df['TTM'].quantile(0.75)
-                        incident_count = len(combo_df)
-                        service_count = combo_df['ServiceName'].nunique() if 'ServiceName' in combo_df.columns else 0
-                        severity_counts = combo_df['Severity'].value_counts().to_dict() if 'Severity' in combo_df.columns else {}
-                        severity_str = ', '.join([f"{sev}: {cnt}" for sev, cnt in sorted(severity_counts.items())])
-                        
-                        combination_stats.append({
-                            'root_cause': rc_theme,
-                            'mitigation': mit_action,
-                            'p75_ttm': p75_ttm,
-                            'count': incident_count,
-                            'services': service_count,
-                            'severity': severity_str
-                        })
+            # Every theme × action pair at once, as matrix products over the pre-computed flags
+            rc_cols = [f'has_{tag}' for tag in rc_labels]
+            mit_cols = [f'has_{tag}' for tag in mit_labels]
+            if all(c in fdf.columns for c in rc_cols + mit_cols):
+                severity_codes, severities = pd.factorize(fdf['Severity']) if 'Severity' in fdf.columns else (None, [])
+                matrix = pair_stats(
+                    fdf[rc_cols].to_numpy(dtype=bool), fdf[mit_cols].to_numpy(dtype=bool),
+                    fdf['TTM'].astype(float).to_numpy(), q=0.75, categories=severity_codes,
+                    distinct=pd.factorize(fdf['ServiceName'])[0] if 'ServiceName' in fdf.columns else None
+                )
+                for i, rc_theme in enumerate(rc_labels.values()):
+                    for j, mit_action in enumerate(mit_labels.values()):
+                        if matrix['count'][i, j] >= 2:  # At least 2 incidents to avoid noise
+                            severity_counts = {sev: int(matrix['categories'][k, i, j]) for k, sev in enumerate(severities)
+                                               if matrix['categories'][k, i, j]}
+                            combination_stats.append({
+                                'root_cause': rc_theme,
+                                'mitigation': mit_action,
+                                'p75_ttm': matrix['quantile'][i, j],
+                                'mean_ttm': matrix['mean'][i, j],
+                                'count': int(matrix['count'][i, j]),
+                                'services': int(matrix['distinct'][i, j]) if 'distinct' in matrix else 0,
+                                'severity': ', '.join([f"{sev}: {cnt}" for sev, cnt in sorted(severity_counts.items())])
+                            })
             
             # Sort by P75 TTM descending (highest TTM first)
             combination_stats.sort(key=lambda x: x['p75_ttm'], reverse=True)
@@ -1452,6 +1838,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                     html.Td(stat['mitigation'], style={'padding': '8px', 'borderBottom': '1px solid #ddd'}),
                     html.Td(f"{stat['p75_ttm']:.1f} min", style={'padding': '8px', 'borderBottom': '1px solid #ddd',
                                                                    'color': BLUE, 'fontWeight': 'bold'}),
+                    html.Td(f"{stat['mean_ttm']:.1f} min", style={'padding': '8px', 'borderBottom': '1px solid #ddd'}),
                     html.Td(str(stat['count']), style={'padding': '8px', 'borderBottom': '1px solid #ddd', 
                                                         'textAlign': 'center'}),
                     html.Td(str(stat['services']), style={'padding': '8px', 'borderBottom': '1px solid #ddd',
@@ -1471,6 +1858,8 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                                                             'borderBottom': '2px solid #dee2e6', 'textAlign': 'left'}),
                         html.Th('P75 TTM', style={'padding': '10px', 'backgroundColor': '#f8f9fa',
                                                   'borderBottom': '2px solid #dee2e6', 'textAlign': 'left'}),
+                        html.Th('Mean TTM', style={'padding': '10px', 'backgroundColor': '#f8f9fa',
+                                                   'borderBottom': '2px solid #dee2e6', 'textAlign': 'left'}),
                         html.Th('Incidents', style={'padding': '10px', 'backgroundColor': '#f8f9fa',
                                                     'borderBottom': '2px solid #dee2e6', 'textAlign': 'center'}),
                         html.Th('Services', style={'padding': '10px', 'backgroundColor': '#f8f9fa',
@@ -1486,24 +1875,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
             
             # Build Root Cause Pattern Analysis (optimized with pre-computed columns)
             if 'RootCauses' in fdf.columns:
-                rc_stats = []
-                for theme, col_name in rc_column_map.items():
-                    if col_name in fdf.columns:
-                        theme_df = fdf[fdf[col_name]]
-                        
-                        if len(theme_df) > 0:
-                            p75_ttm = theme_df['TTM'].quantile(0.75)
-                            incident_count = len(theme_df)
-                            service_count = theme_df['ServiceName'].nunique() if 'ServiceName' in theme_df.columns else 0
-                            severity_counts = theme_df['Severity'].value_counts().to_dict() if 'Severity' in theme_df.columns else {}
-                            
-                            rc_stats.append({
-                                'theme': theme,
-                                'p75': p75_ttm,
-                                'count': incident_count,
-                                'services': service_count,
-                                'severity': severity_counts
-                            })
+                rc_stats = tag_pattern_stats(fdf, 'RootCauseTags', labels=rc_labels)
                 
                 if rc_stats:
                     rc_stats.sort(key=lambda x: x['p75'], reverse=True)
@@ -1511,7 +1883,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                     for stat in rc_stats[:5]:
                         sev_text = ', '.join([f"{k}:{v}" for k, v in sorted(stat['severity'].items())])
                         rc_rows.append(html.Tr([
-                            html.Td(stat['theme'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
+                            html.Td(stat['tag'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
                             html.Td(f"{stat['p75']:.0f} min", style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee', 'fontWeight': 'bold', 'color': BLUE}),
                             html.Td(str(stat['count']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
                             html.Td(str(stat['services']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
@@ -1534,24 +1906,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
             
             # Build Mitigation Effectiveness Analysis (optimized with pre-computed columns)
             if 'Mitigations' in fdf.columns:
-                mit_stats = []
-                for action, col_name in mit_column_map.items():
-                    if col_name in fdf.columns:
-                        action_df = fdf[fdf[col_name]]
-                        
-                        if len(action_df) > 0:
-                            p75_ttm = action_df['TTM'].quantile(0.75)
-                            incident_count = len(action_df)
-                            service_count = action_df['ServiceName'].nunique() if 'ServiceName' in action_df.columns else 0
-                            severity_counts = action_df['Severity'].value_counts().to_dict() if 'Severity' in action_df.columns else {}
-                            
-                            mit_stats.append({
-                                'action': action,
-                                'p75': p75_ttm,
-                                'count': incident_count,
-                                'services': service_count,
-                                'severity': severity_counts
-                            })
+                mit_stats = tag_pattern_stats(fdf, 'MitigationTags', labels=mit_labels)
                 
                 if mit_stats:
                     mit_stats.sort(key=lambda x: x['count'], reverse=True)
@@ -1559,7 +1914,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                     for stat in mit_stats[:5]:
                         sev_text = ', '.join([f"{k}:{v}" for k, v in sorted(stat['severity'].items())])
                         mit_rows.append(html.Tr([
-                            html.Td(stat['action'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
+                            html.Td(stat['tag'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
                             html.Td(f"{stat['p75']:.0f} min", style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee', 'fontWeight': 'bold', 'color': BLUE}),
                             html.Td(str(stat['count']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
                             html.Td(str(stat['services']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
@@ -1582,32 +1937,14 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
             
             # Build Impact Pattern Analysis (optimized with pre-computed columns)
             if 'Impacts' in fdf.columns:
-                impact_column_map = {
-                    'Availability': 'has_availability',
-                    'Performance': 'has_performance',
-                    'Functionality': 'has_functionality',
-                    'Data Issue': 'has_data_issue',
-                    'Authentication': 'has_authentication'
+                imp_labels = {
+                    'availability': 'Availability',
+                    'performance': 'Performance',
+                    'functionality': 'Functionality',
+                    'data_issue': 'Data Issue',
+                    'authentication': 'Authentication'
                 }
-                
-                imp_stats = []
-                for imp_type, col_name in impact_column_map.items():
-                    if col_name in fdf.columns:
-                        imp_df = fdf[fdf[col_name]]
-                        
-                        if len(imp_df) > 0:
-                            p75_ttm = imp_df['TTM'].quantile(0.75)
-                            incident_count = len(imp_df)
-                            service_count = imp_df['ServiceName'].nunique() if 'ServiceName' in imp_df.columns else 0
-                            severity_counts = imp_df['Severity'].value_counts().to_dict() if 'Severity' in imp_df.columns else {}
-                            
-                            imp_stats.append({
-                                'type': imp_type,
-                                'p75': p75_ttm,
-                                'count': incident_count,
-                                'services': service_count,
-                                'severity': severity_counts
-                            })
+                imp_stats = tag_pattern_stats(fdf, 'ImpactTags', labels=imp_labels)
                 
                 if imp_stats:
                     imp_stats.sort(key=lambda x: x['p75'], reverse=True)
@@ -1615,7 +1952,7 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
                     for stat in imp_stats[:5]:
                         sev_text = ', '.join([f"{k}:{v}" for k, v in sorted(stat['severity'].items())])
                         imp_rows.append(html.Tr([
-                            html.Td(stat['type'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
+                            html.Td(stat['tag'], style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
                             html.Td(f"{stat['p75']:.0f} min", style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee', 'fontWeight': 'bold', 'color': BLUE}),
                             html.Td(str(stat['count']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
                             html.Td(str(stat['services']), style={'padding': '8px', 'fontSize': '11px', 'borderBottom': '1px solid #eee'}),
@@ -1648,8 +1985,95 @@ def update_all(start_date, end_date, exclude_cascade, exclude_bcdr, severities,
     except Exception as e:
         pattern_analysis = html.Div(f"Error loading pattern analysis: {str(e)}", 
                                     style={'padding': '20px', 'textAlign': 'center', 'color': 'red'})
-    
-    return total, p75, mean, p90, critsits, fig_dist, fig_services, fig_timeline, fig_severity, fig_quintile, fig_region, table, table_count_text, service_analysis_table, pattern_analysis, banner, chart_filters
+    return pattern_analysis
+
+
+@app.callback(
+    [Output('cache-debug', 'children'), Output('timings-debug', 'children')],
+    [Input('card-total', 'children'), Input('chart-dist', 'figure'),
+     Input('table-service-analysis', 'children'), Input('pattern-analysis', 'children')],
+    [State('filter-store', 'data')]
+)
+def update_cache_debug(*args):
+    """Result cache size and hit/miss counters and the rolling stage timings, refreshed
+    after the panels update"""
+    dataset, _ = store_state(args[-1])
+    stats = dataset.result_cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "n/a"
+    return html.Div([
+        html.Div(f"Entries: {stats['entries']}/{stats['max_entries']} | Hits: {stats['hits']} | "
+                 f"Misses: {stats['misses']} | Hit rate: {hit_rate} | Evictions: {stats['evictions']}"),
+        html.Div(' | '.join(f"{part}: {c['hits']}/{c['hits'] + c['misses']}" for part, c in stats['parts'].items()),
+                 style={'marginTop': '4px'})
+    ]), timings_table(timings.summary())
+
+
+def timings_table(summary):
+    """Rolling P50/P90/P99 per stage and response of this worker"""
+    header = ['Stage', 'Count', 'P50 ms', 'P90 ms', 'P99 ms', 'P50 KB', 'Max KB']
+    rows = []
+    for stage, stats in summary.items():
+        size = stats.get('bytes')
+        rows.append([stage, stats['count'], stats['ms']['p50'], stats['ms']['p90'], stats['ms']['p99'],
+                     f"{size['p50'] / 1024:.1f}" if size else '', f"{size['max'] / 1024:.1f}" if size else ''])
+    cell = {'padding': '2px 8px', 'textAlign': 'right'}
+    return html.Table([
+        html.Tr([html.Th(h, style=cell) for h in header])
+    ] + [
+        html.Tr([html.Td(v, style=cell) for v in row]) for row in rows
+    ], style={'borderCollapse': 'collapse'})
+
+
+@server.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@server.after_request
+def record_response(response):
+    """Time and size of each callback response, keyed by the callback's first output"""
+    if request.path.endswith('_dash-update-component') and 'request_start' in g:
+        outputs = (request.get_json(silent=True) or {}).get('outputs')
+        first = outputs[0] if isinstance(outputs, list) and outputs else outputs or {}
+        output_id = first.get('id', 'unknown')
+        if isinstance(output_id, dict):
+            output_id = output_id.get('type', 'unknown')
+        timings.record(f"response {output_id}", time.perf_counter() - g.request_start,
+                       size=response.calculate_content_length() or len(response.get_data()))
+    return response
+
+
+@server.route('/metrics')
+def metrics():
+    """Rolling stage/response timings and payload sizes, and the result cache counters, of this worker"""
+    return jsonify({
+        'pid': os.getpid(),
+        'window': timings.window,
+        'timings': timings.summary(),
+        'result_cache': {name: datasets.get(name).result_cache.stats() for name in datasets.names()}
+    })
+
+
+@server.route('/healthz')
+def healthz():
+    """Liveness/readiness probe: the loaded datasets and this worker's cache state"""
+    return jsonify({
+        'status': 'ok' if datasets.names() else 'no data',
+        'data_dir': str(Path(DATA_DIR).resolve()),
+        'pid': os.getpid(),
+        'datasets': {
+            name: {
+                'label': dataset.label,
+                'version': dataset.version,
+                'incidents': len(dataset.df),
+                'loaded_at': dataset.loaded_at,
+                'result_cache': dataset.result_cache.stats()
+            }
+            for name, dataset in ((n, datasets.get(n)) for n in datasets.names())
+        },
+        'errors': datasets.errors
+    })
 
 # ============================================================================
 # RUN
@@ -1661,4 +2085,5 @@ if __name__ == '__main__':
     print("Open browser: http://127.0.0.1:8050")
     print("Press Ctrl+C to stop")
     print("="*80 + "\n")
+    datasets.ensure_watching()
     app.run(debug=True, host='127.0.0.1', port=8050)
@@ -0,0 +1,208 @@
+"""
+TTM Data Loading
+Shared loader for the TTM export. Prefers the typed, compressed Parquet copy that
+execute_kusto_query_to_csv.py writes next to the CSV, and falls back to parsing
+the CSV when no up-to-date Parquet file exists. Either way the frame comes back
+with the in-memory schema declared below (categoricals, nullable ints, UTC
+timestamps), so only the requested columns are held and repeated strings are
+stored once.
+
+Usage:
+    from ttm_data import load_ttm_data
+    df = load_ttm_data("october_2025_ttm_full_month.csv", columns=['TTM', 'ServiceName'])
+"""
+
+import pandas as pd
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DEFAULT_CSV = "october_2025_ttm_full_month.csv"
+PARQUET_COMPRESSION = "zstd"
+
+# Explicit storage types for the key columns; everything else is inferred
+TIMESTAMP_COLUMNS = ['OutageCreateDate']
+DURATION_COLUMNS = ['TTM', 'TTO', 'TTD', 'TTN', 'TTEng', 'TTFix']
+ID_COLUMNS = ['OutageIncidentId', 'RootResponsibleIncidentId', 'IncidentId', 'EventId']
+
+# In-memory schema applied by load_ttm_data
+CATEGORY_COLUMNS = ['ServiceName', 'OwningTeamName', 'ImpactedRegion']
+SEVERITY_COLUMNS = ['OutageIncidentSeverity', 'Severity']  # nullable Int8 when numeric
+FREE_TEXT_COLUMNS = ['RootCauses', 'Mitigations', 'Impacts', 'Symptoms', 'set_Whys', 'AI_Summary']
+
+
+def parquet_path_for(csv_path):
+    """Parquet file that accompanies a CSV export"""
+    return Path(csv_path).with_suffix('.parquet')
+
+
+def to_typed_frame(df):
+    """Coerce an export DataFrame to the explicit storage schema
+
+    Key columns get fixed types (UTC timestamps, float minutes, nullable int64
+    IDs). Other object columns are narrowed to boolean/integer/float/string
+    where every non-null value agrees, so Parquet never sees mixed types.
+    """
+    typed = df.copy()
+
+    for col in typed.columns:
+        if col in TIMESTAMP_COLUMNS:
+            typed[col] = pd.to_datetime(typed[col], errors='coerce', utc=True, format='mixed')
+        elif col in DURATION_COLUMNS:
+            typed[col] = pd.to_numeric(typed[col], errors='coerce').astype('float64')
+        elif col in ID_COLUMNS:
+            typed[col] = pd.to_numeric(typed[col], errors='coerce').astype('Int64')
+        elif typed[col].dtype == object:
+            kind = pd.api.types.infer_dtype(typed[col], skipna=True)
+            if kind == 'boolean':
+                typed[col] = typed[col].astype('boolean')
+            elif kind == 'integer':
+                typed[col] = typed[col].astype('Int64')
+            elif kind in ('floating', 'mixed-integer-float'):
+                typed[col] = pd.to_numeric(typed[col], errors='coerce')
+            elif kind == 'datetime':
+                typed[col] = pd.to_datetime(typed[col], errors='coerce', utc=True)
+            else:
+                # Lists/dicts from dynamic columns are stored as their text form, as in the CSV
+                typed[col] = typed[col].where(typed[col].isna(), typed[col].astype(str)).astype('string')
+
+    return typed
+
+
+def arrow_schema(typed):
+    """Arrow schema for a typed frame with the key columns pinned explicitly"""
+    schema = pa.Schema.from_pandas(typed, preserve_index=False)
+
+    fields = []
+    for field in schema:
+        if field.name in TIMESTAMP_COLUMNS:
+            field = pa.field(field.name, pa.timestamp('us', tz='UTC'))
+        elif field.name in DURATION_COLUMNS:
+            field = pa.field(field.name, pa.float64())
+        elif field.name in ID_COLUMNS:
+            field = pa.field(field.name, pa.int64())
+        elif pa.types.is_null(field.type):
+            # All-null columns have no inferable type; store them as text
+            field = pa.field(field.name, pa.string())
+        fields.append(field)
+
+    return pa.schema(fields)
+
+
+def write_parquet(df, parquet_path):
+    """Write an export DataFrame as typed, compressed Parquet. Returns False if pyarrow is missing."""
+    if pa is None:
+        print("⚠️  pyarrow not installed, skipping Parquet output (pip install pyarrow)")
+        return False
+
+    typed = to_typed_frame(df)
+    table = pa.Table.from_pandas(typed, schema=arrow_schema(typed), preserve_index=False)
+    pq.write_table(table, parquet_path, compression=PARQUET_COMPRESSION)
+    return True
+
+
+class ParquetChunkWriter:
+    """Append DataFrame chunks to one Parquet file using the schema of the first chunk
+
+    If a later chunk cannot be cast to that schema the partial file is removed
+    and further chunks are ignored, leaving the CSV as the only output.
+    """
+
+    def __init__(self, parquet_path):
+        self.parquet_path = Path(parquet_path)
+        self.schema = None
+        self.writer = None
+        self.failed = pa is None
+        if pa is None:
+            print("⚠️  pyarrow not installed, skipping Parquet output (pip install pyarrow)")
+
+    def write(self, chunk):
+        if self.failed:
+            return
+        try:
+            typed = to_typed_frame(chunk)
+            if self.writer is None:
+                self.schema = arrow_schema(typed)
+                self.writer = pq.ParquetWriter(self.parquet_path, self.schema, compression=PARQUET_COMPRESSION)
+            self.writer.write_table(pa.Table.from_pandas(typed, schema=self.schema, preserve_index=False))
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            print(f"⚠️  Chunk does not match the Parquet schema ({e}), skipping Parquet output")
+            self.failed = True
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+            self.parquet_path.unlink(missing_ok=True)
+
+    def close(self):
+        """Finish the file. Returns True if a complete Parquet file was written."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        return not self.failed and self.schema is not None
+
+
+def apply_schema(df):
+    """Convert loaded columns to the in-memory schema
+
+    Service, team and region become categoricals, severities and IDs nullable
+    ints, durations float64 and OutageCreateDate a UTC timestamp. Severities
+    that are not numeric (e.g. 'Sev2') are left as text.
+    """
+    for col in df.columns:
+        if col in TIMESTAMP_COLUMNS:
+            df[col] = pd.to_datetime(df[col], errors='coerce', utc=True, format='mixed')
+        elif col in DURATION_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        elif col in ID_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+        elif col in SEVERITY_COLUMNS:
+            numeric = pd.to_numeric(df[col], errors='coerce')
+            if numeric.notna().sum() == df[col].notna().sum():
+                df[col] = numeric.astype('Int8')
+        elif col in CATEGORY_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def load_ttm_data(csv_path=DEFAULT_CSV, columns=None, prefer_parquet=True, include_text=True):
+    """Load a TTM export as a DataFrame with the shared in-memory schema
+
+    Args:
+        csv_path: Path of the CSV export. A sibling .parquet file is used instead
+            when it exists and is at least as new as the CSV.
+        columns: Optional list of columns to load. Columns missing from the
+            export are skipped, so scripts can keep their `in df.columns` checks.
+        prefer_parquet: Set False to always parse the CSV.
+        include_text: Set False to skip the free-text columns (RootCauses,
+            Mitigations, Impacts, ...) when loading every other column.
+
+    Categorical columns keep only observed values on load, but a filtered
+    subset still reports the full category list: use groupby(..., observed=True)
+    and drop zero counts from value_counts() on subsets.
+    """
+    csv_path = Path(csv_path)
+    parquet_path = parquet_path_for(csv_path)
+
+    use_parquet = (
+        prefer_parquet and pq is not None and parquet_path.exists()
+        and (not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime)
+    )
+
+    def keep(col):
+        if columns is not None:
+            return col in columns
+        return include_text or col not in FREE_TEXT_COLUMNS
+
+    if use_parquet:
+        selected = [c for c in pq.read_schema(parquet_path).names if keep(c)]
+        return apply_schema(pd.read_parquet(parquet_path, columns=selected))
+
+    # Categoricals are built while parsing so the repeated strings are never held as objects
+    dtype = {col: 'category' for col in CATEGORY_COLUMNS}
+    df = pd.read_csv(csv_path, usecols=keep, dtype=dtype, encoding='utf-8-sig', low_memory=False)
+    return apply_schema(df)
@@ -0,0 +1,123 @@
+"""
+TTM Dataset Manager
+Keeps one prepared dataset per monthly export found in a data folder and picks
+up new or re-exported months while the dashboard is running.
+
+The folder is polled for exports matching a pattern (CSV or its Parquet copy).
+A new or changed export is built in a background thread with the caller's build
+function, and the finished dataset replaces the previous one in a single
+assignment, so requests keep using the old version until the new one is ready.
+
+Usage:
+    datasets = DatasetManager('.', build=build_dataset)
+    datasets.scan()               # initial load, in the calling thread
+    datasets.ensure_watching()    # in each serving process (e.g. a gunicorn worker after fork)
+    dataset = datasets.get()      # latest month
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+DATA_PATTERN = "*_ttm_full_month"
+POLL_SECONDS = 30
+
+# Name under which get() returns the combined view of all months
+ALL_DATASETS = "__all__"
+
+
+class DatasetManager:
+    """Prepared datasets by export name, rebuilt in the background when their files change
+
+    `build(path, name, version)` returns the prepared dataset for one export; it
+    should expose a `sort_key` used to order months (the latest month is the
+    default). get() has no side effects: the watcher thread is started
+    explicitly with ensure_watching() in each serving process, so a preloading
+    master (gunicorn --preload) never polls or forks with the thread running.
+
+    With `combine(datasets)`, a combined view over all loaded datasets (oldest
+    first) is rebuilt after every change and returned by get(ALL_DATASETS).
+    """
+
+    def __init__(self, data_dir, build, pattern=DATA_PATTERN, poll_seconds=POLL_SECONDS, combine=None):
+        self.data_dir = Path(data_dir)
+        self.build = build
+        self.combine = combine
+        self.combined = None
+        self.pattern = pattern
+        self.poll_seconds = poll_seconds
+        self.datasets = {}
+        self.errors = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._watcher_pid = None
+
+    def sources(self):
+        """Export name -> (path to load, version) for every export in the data folder"""
+        found = {}
+        for path in sorted(self.data_dir.glob(f"{self.pattern}.csv")) + sorted(self.data_dir.glob(f"{self.pattern}.parquet")):
+            stat = path.stat()
+            name = path.stem
+            csv_path, version = found.get(name, (path.with_suffix('.csv'), ()))
+            found[name] = (csv_path, version + (path.suffix, stat.st_size, stat.st_mtime_ns))
+        return {name: (path, hashlib.sha1(repr(version).encode()).hexdigest()[:12]) for name, (path, version) in found.items()}
+
+    def scan(self):
+        """Build every new or changed export and swap it in; returns the names rebuilt"""
+        rebuilt = []
+        for name, (path, version) in self.sources().items():
+            if self._versions.get(name) == version:
+                continue
+            self._versions[name] = version
+            try:
+                started = time.perf_counter()
+                dataset = self.build(path, name, version)
+            except Exception as e:
+                self.errors[name] = str(e)
+                print(f"⚠️  Could not load {path.name}: {e}")
+                continue
+            with self._lock:
+                self.datasets = {**self.datasets, name: dataset}
+                self.errors.pop(name, None)
+            rebuilt.append(name)
+            print(f"✅ Loaded {path.name} ({time.perf_counter() - started:.1f}s)")
+
+        if rebuilt and self.combine:
+            self.combined = self.combine([self.datasets[name] for name in self.names()])
+        return rebuilt
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"⚠️  Dataset scan failed: {e}")
+
+    def ensure_watching(self):
+        """Start the background watcher in this process if it is not running yet"""
+        if self._watcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watcher_pid != os.getpid():
+                self._watcher_pid = os.getpid()
+                threading.Thread(target=self._watch, name='dataset-watcher', daemon=True).start()
+
+    def names(self):
+        """Loaded export names, oldest month first"""
+        datasets = self.datasets
+        return sorted(datasets, key=lambda name: datasets[name].sort_key)
+
+    def get(self, name=None):
+        """The current version of a dataset by name, or of the latest month"""
+        if name == ALL_DATASETS and self.combined is not None:
+            return self.combined
+        datasets = self.datasets
+        if name in datasets:
+            return datasets[name]
+        names = self.names()
+        if not names:
+            raise LookupError(f"No exports matching {self.pattern} in {self.data_dir.resolve()}")
+        return datasets[names[-1]]
@@ -0,0 +1,146 @@
+"""
+TTM Filter Index
+Precomputed row masks for the dashboard filters, built once at startup so a
+filter change ANDs a few NumPy bool arrays instead of re-slicing the DataFrame
+once per filter.
+
+- Categorical columns are factorized to integer codes. Low-cardinality columns
+  (severity, quintile, region, ...) keep one bool mask per value; the rest are
+  matched with a code lookup table.
+- Boolean flag columns are stored as bool arrays.
+- Range columns (dates, TTM) are stored sorted with their row order, so a range
+  filter is two binary searches and a filtered subset's values come out already
+  sorted (order statistics such as P75/P90 without a sort).
+
+Usage:
+    index = FilterIndex(df, categorical=['Severity'], flags=['IsExcluded'], ranges=['TTM'])
+    fdf = index.select([index.isin('Severity', [2, 3]), index.between('TTM', 0, 600)])
+"""
+
+import numpy as np
+import pandas as pd
+
+# Columns with more distinct values than this are matched through their codes
+# instead of keeping one mask per value
+MAX_BITMAP_VALUES = 256
+
+
+class FilterIndex:
+    """Bool masks, value codes and sorted range arrays over a fixed DataFrame
+
+    `columns` limits the frame returned by select() to the columns the caller
+    reads, so filtered results never copy the rest of the export.
+    """
+
+    def __init__(self, df, categorical=(), flags=(), ranges=(), columns=None):
+        self.row_count = len(df)
+        self.frame = df[[c for c in columns if c in df.columns]] if columns else df
+        self.codes = {}
+        self.values = {}
+        self.bitmaps = {}
+        self.flags = {}
+        self.ranges = {}
+
+        for col in categorical:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col])
+            self.codes[col] = codes
+            self.values[col] = {value: code for code, value in enumerate(list(uniques))}
+            if len(uniques) <= MAX_BITMAP_VALUES:
+                self.bitmaps[col] = [codes == code for code in range(len(uniques))]
+
+        for col in flags:
+            if col in df.columns:
+                self.flags[col] = df[col].fillna(False).to_numpy(dtype=bool)
+
+        for col in ranges:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if isinstance(series.dtype, pd.DatetimeTZDtype):
+                # Compare in naive UTC; bounds are converted the same way in _bound()
+                series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+            positions = np.flatnonzero(series.notna().to_numpy())
+            values = series.to_numpy()[positions]
+            order = np.argsort(values, kind='stable')
+            self.ranges[col] = (values[order], positions[order])
+
+    def all(self):
+        """Mask selecting every row"""
+        return np.ones(self.row_count, dtype=bool)
+
+    def none(self):
+        """Mask selecting no rows"""
+        return np.zeros(self.row_count, dtype=bool)
+
+    def equals(self, col, value):
+        """Rows where `col == value`"""
+        code = self.values[col].get(value)
+        if code is None:
+            return self.none()
+        if col in self.bitmaps:
+            return self.bitmaps[col][code]
+        return self.codes[col] == code
+
+    def isin(self, col, values):
+        """Rows where `col` is any of `values`"""
+        codes = [self.values[col][v] for v in values if v in self.values[col]]
+        if len(codes) == 1 and col in self.bitmaps:
+            return self.bitmaps[col][codes[0]]
+        lookup = np.zeros(len(self.values[col]) + 1, dtype=bool)
+        lookup[codes] = True
+        # Missing values have code -1, which indexes the always-False last slot
+        return lookup[self.codes[col]]
+
+    def flag(self, col, value=True):
+        """Rows where the boolean column `col` equals `value`"""
+        return self.flags[col] if value else ~self.flags[col]
+
+    def between(self, col, low=None, high=None):
+        """Rows where `low <= col <= high` (either bound may be None); missing values never match"""
+        values, order = self.ranges[col]
+        start = 0 if low is None else np.searchsorted(values, self._bound(values, low), side='left')
+        stop = len(values) if high is None else np.searchsorted(values, self._bound(values, high), side='right')
+        mask = self.none()
+        mask[order[start:stop]] = True
+        return mask
+
+    def sorted_values(self, col, rows=None):
+        """Non-missing values of range column `col` for the rows from rows(), in ascending order
+
+        The rows are picked out of the presorted column with one mask, so
+        percentiles of any filtered subset need no sort.
+        """
+        values, order = self.ranges[col]
+        if rows is None:
+            return values
+        mask = self.none()
+        mask[rows] = True
+        return values[mask[order]]
+
+    @staticmethod
+    def _bound(values, bound):
+        if np.issubdtype(values.dtype, np.datetime64):
+            bound = pd.Timestamp(bound)
+            if bound.tzinfo is not None:
+                bound = bound.tz_convert('UTC').tz_localize(None)
+            return bound.to_datetime64()
+        return bound
+
+    def rows(self, masks):
+        """Positions of the rows matching every mask, or None (all rows) if there are none"""
+        if not masks:
+            return None
+        mask = masks[0].copy()
+        for other in masks[1:]:
+            mask &= other
+        return np.flatnonzero(mask)
+
+    def take(self, rows):
+        """Indexed frame restricted to row positions from rows()"""
+        return self.frame if rows is None else self.frame.take(rows)
+
+    def select(self, masks):
+        """Rows of the indexed frame matching every mask (all rows if there are none)"""
+        return self.take(self.rows(masks))
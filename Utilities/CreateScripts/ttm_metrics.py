@@ -0,0 +1,393 @@
+"""
+TTM Metrics Engine
+Computes the standard TTM/TTO/TTD/TTEng/TTFix statistics (count, mean, min, max
+and percentiles) overall and grouped by any dimension, and caches them as a JSON
+metrics bundle next to the export. The report writers read the bundle instead of
+each re-deriving the same numbers from the CSV.
+
+Usage:
+    from ttm_metrics import load_metrics
+    metrics = load_metrics("october_2025_ttm_full_month.csv")
+    print(metrics['overall']['TTM']['p75'])
+"""
+
+import json
+import warnings
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from ttm_data import DEFAULT_CSV, apply_schema, load_ttm_data, parquet_path_for
+
+BUNDLE_VERSION = 1
+
+METRIC_COLUMNS = ['TTM', 'TTO', 'TTD', 'TTEng', 'TTFix']
+PERCENTILES = {'p50': 0.50, 'p75': 0.75, 'p90': 0.90, 'p95': 0.95}
+SEVERITY_COLUMNS = ['OutageIncidentSeverity', 'Severity']
+DIMENSIONS = ['ServiceName', 'OwningTeamName', 'ImpactedRegion']
+FLAG_COLUMNS = ['OutageDetectedBy', 'IsMultiRegion', 'IsCausedBy', 'CustomerImpactedCount',
+                'PIRRequired', 'PIRStatus']
+QUINTILE_LABELS = ['Q1', 'Q2', 'Q3', 'Q4', 'Q5']
+
+# Columns the bundle is built from; everything else in the export is never loaded
+BUNDLE_COLUMNS = METRIC_COLUMNS + SEVERITY_COLUMNS + DIMENSIONS + FLAG_COLUMNS
+
+
+def _native(value):
+    """Convert numpy/pandas scalars to JSON-safe Python values (NaN/NA -> None)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def column_stats(frame, columns=METRIC_COLUMNS):
+    """Count, mean, min, max and percentiles for each column, in one pass over a 2-D array"""
+    columns = [c for c in columns if c in frame.columns]
+    values = frame[columns].to_numpy(dtype='float64', na_value=np.nan)
+    if len(values) == 0:
+        values = np.full((1, len(columns)), np.nan)
+
+    with warnings.catch_warnings():
+        # All-NaN columns (e.g. an empty cohort) produce NaN stats, not warnings
+        warnings.simplefilter('ignore', RuntimeWarning)
+        counts = (~np.isnan(values)).sum(axis=0)
+        means = np.nanmean(values, axis=0)
+        mins = np.nanmin(values, axis=0)
+        maxs = np.nanmax(values, axis=0)
+        percentiles = np.nanquantile(values, list(PERCENTILES.values()), axis=0)
+
+    stats = {}
+    for i, col in enumerate(columns):
+        stats[col] = {'count': int(counts[i]), 'mean': _native(means[i]), 'min': _native(mins[i]),
+                      'max': _native(maxs[i])}
+        for j, name in enumerate(PERCENTILES):
+            stats[col][name] = _native(percentiles[j, i])
+    return stats
+
+
+def group_stats(frame, by, columns=METRIC_COLUMNS):
+    """Per-group statistics for any dimension (a column name or list of names)
+
+    Returns a DataFrame indexed by group, with an `incidents` column and one
+    `<metric>_<stat>` column per statistic, ordered by incident count (largest first).
+    """
+    columns = [c for c in columns if c in frame.columns]
+    grouped = frame.groupby(by, observed=True)[columns]
+
+    result = grouped.agg(['count', 'mean', 'min', 'max'])
+    result.columns = [f"{col}_{stat}" for col, stat in result.columns]
+
+    names = {q: name for name, q in PERCENTILES.items()}
+    percentiles = grouped.quantile(list(PERCENTILES.values())).unstack(-1)
+    percentiles.columns = [f"{col}_{names[q]}" for col, q in percentiles.columns]
+
+    result = result.join(percentiles)
+    result.insert(0, 'incidents', grouped.size())
+    return result.sort_values('incidents', ascending=False, kind='stable')
+
+
+def monthly_stats(frame, date_column='OutageCreateDate', columns=METRIC_COLUMNS):
+    """group_stats per calendar month of `date_column`, indexed by 'YYYY-MM' in date order"""
+    months = frame[date_column].dt.strftime('%Y-%m').rename('Month')
+    return group_stats(frame, months, columns).sort_index()
+
+
+def group_records(frame, by, columns=METRIC_COLUMNS):
+    """group_stats as a JSON-safe list of {'value', 'count', <metric>: {stats}} records"""
+    table = group_stats(frame, by, columns)
+    records = []
+    for value, row in table.iterrows():
+        value = [_native(v) for v in value] if isinstance(value, tuple) else _native(value)
+        record = {'value': value, 'count': int(row['incidents'])}
+        for col in columns:
+            if f"{col}_count" in row.index:
+                record[col] = {stat: _native(row[f"{col}_{stat}"])
+                               for stat in ['count', 'mean', 'min', 'max'] + list(PERCENTILES)}
+                record[col]['count'] = int(record[col]['count'])
+        records.append(record)
+    return records
+
+
+def sorted_quantile(sorted_values, q):
+    """Quantile(s) of already sorted, NaN-free values with pandas' linear interpolation (NaN when empty)
+
+    An order-statistics lookup: no sort, so a filtered subset taken in sorted
+    order (FilterIndex.sorted_values) costs O(1) per quantile.
+    """
+    sorted_values = np.asarray(sorted_values, dtype='float64')
+    q = np.asarray(q, dtype='float64')
+    if len(sorted_values) == 0:
+        return np.full(q.shape, np.nan) if q.ndim else np.nan
+    position = (len(sorted_values) - 1) * q
+    lower = np.floor(position).astype(np.intp)
+    upper = np.ceil(position).astype(np.intp)
+    low, high = sorted_values[lower], sorted_values[upper]
+    return low + (high - low) * (position - lower)
+
+
+def sorted_quintile_counts(sorted_values, labels=QUINTILE_LABELS):
+    """Incident count per quintile of already sorted values, like pd.qcut(..., 5, duplicates='drop')
+
+    Edges are order statistics and counts are binary searches, so quintiles
+    relative to any filtered subset cost no more than reading its percentiles.
+    """
+    edges = np.unique(sorted_quantile(sorted_values, np.linspace(0, 1, 6)))
+    if len(sorted_values) == 0 or len(edges) < 2:
+        return pd.Series(dtype='int64')
+    # Bins are (e0, e1], (e1, e2], ... with the lowest value included in the first
+    ends = np.searchsorted(sorted_values, edges[1:], side='right')
+    counts = np.diff(np.concatenate([[0], ends]))
+    return pd.Series(counts, index=list(labels)[:len(counts)])
+
+
+def pair_stats(left, right, values, q=0.75, categories=None, distinct=None):
+    """Statistics of `values` for every (left, right) column pair of two boolean incident matrices
+
+    `left` (n x a) and `right` (n x b) mark which incidents carry each tag of two
+    taxonomies (e.g. root cause themes and mitigation actions). Everything is
+    computed from the (incident, pair) memberships, never an incidents x pairs
+    matrix: counts, sums and per-category counts are bincounts over them, and
+    the quantile reads order statistics off each pair's run of values after one
+    sort by (pair, value). `categories` and `distinct` are integer codes (-1 for
+    missing, as from pd.factorize). Returns a dict of arrays: 'count', 'mean'
+    and 'quantile' (a x b), 'categories' (k x a x b) and 'distinct' (a x b).
+    """
+    left = np.asarray(left, dtype=bool)
+    right = np.asarray(right, dtype=bool)
+    values = np.asarray(values, dtype='float64')
+    a, b = left.shape[1], right.shape[1]
+
+    # Join the left and right tags of each incident into (row, pair) memberships
+    left_rows, left_tags = np.nonzero(left)
+    right_rows, right_tags = np.nonzero(right)  # row-major, so right_rows is sorted
+    first = np.searchsorted(right_rows, left_rows)
+    lengths = np.searchsorted(right_rows, left_rows, side='right') - first
+    rows = np.repeat(left_rows, lengths)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    pair = np.repeat(left_tags, lengths) * b + right_tags[np.repeat(first, lengths) + offsets]
+
+    result = {'count': np.bincount(pair, minlength=a * b).reshape(a, b).astype(np.int64)}
+    valid = ~np.isnan(values[rows])
+    valid_rows, valid_pair = rows[valid], pair[valid]
+    m = np.bincount(valid_pair, minlength=a * b)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result['mean'] = (np.bincount(valid_pair, weights=values[valid_rows], minlength=a * b) / m).reshape(a, b)
+
+    # Same interpolation as pandas' default ('linear') quantile, within each pair's sorted run
+    order = np.lexsort((values[valid_rows], valid_pair))
+    sorted_values = values[valid_rows][order]
+    starts = np.searchsorted(valid_pair[order], np.arange(a * b))
+    position = np.maximum(m - 1, 0) * q
+    lower, upper = np.floor(position), np.ceil(position)
+    if len(sorted_values):
+        last = len(sorted_values) - 1
+        low = sorted_values[np.minimum(starts + lower.astype(np.intp), last)]
+        high = sorted_values[np.minimum(starts + upper.astype(np.intp), last)]
+        quantile = np.where(m > 0, low + (high - low) * (position - lower), np.nan)
+    else:
+        quantile = np.full(a * b, np.nan)
+    result['quantile'] = quantile.reshape(a, b)
+
+    # Category counts over the same memberships
+    for name, codes in (('categories', categories), ('distinct', distinct)):
+        if codes is None:
+            continue
+        codes = np.asarray(codes)
+        width = int(codes.max()) + 1 if len(codes) else 0
+        code = codes[rows]
+        present = code >= 0  # missing values (-1) are not a category
+        code, member = code[present], pair[present]
+        if name == 'categories':
+            per_code = np.bincount(code * (a * b) + member, minlength=width * a * b)
+            result[name] = per_code.reshape(width, a, b).astype(np.int64)
+        else:
+            combos = np.unique(member * width + code) if width else np.array([], dtype=np.int64)
+            result[name] = np.bincount(combos // max(width, 1), minlength=a * b).reshape(a, b)
+    return result
+
+
+class RemovalStats:
+    """Count, mean and quantiles of a fixed set of values while subsets are removed and restored
+
+    The values are sorted once, and a Fenwick tree over the sorted positions
+    counts the values still present, so removing or restoring k values costs
+    O(k log n) and a quantile is two O(log n) descents for the k-th remaining
+    value. What-if sweeps that take incidents out one group at a time use it
+    instead of re-filtering and re-sorting the remaining values at every step.
+    Values must be NaN-free.
+    """
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype='float64')
+        n = len(self.values)
+        order = np.argsort(self.values, kind='stable')
+        self.sorted = self.values[order]
+        self.rank = np.empty(n, dtype=np.intp)
+        self.rank[order] = np.arange(n)
+        nodes = np.arange(1, n + 1)
+        self.tree = (nodes & -nodes).astype(np.int64)  # every value present
+        self.present = np.ones(n, dtype=bool)
+        self.count = n
+        self.total = float(self.values.sum())
+        self._top = 1 << (n.bit_length() - 1) if n else 0
+
+    def remove(self, positions):
+        """Remove the values at `positions` (indices into the original values); returns those
+        actually removed, so restore() can undo exactly this call"""
+        return self._update(positions, -1)
+
+    def restore(self, positions):
+        """Put removed values at `positions` back"""
+        return self._update(positions, 1)
+
+    def _update(self, positions, delta):
+        positions = np.unique(np.asarray(positions, dtype=np.intp))
+        positions = positions[self.present[positions] == (delta < 0)]
+        self.present[positions] = delta > 0
+        self.count += delta * len(positions)
+        self.total += delta * float(self.values[positions].sum())
+        node = self.rank[positions] + 1
+        while len(node):
+            np.add.at(self.tree, node - 1, delta)
+            node = node + (node & -node)
+            node = node[node <= len(self.tree)]
+        return positions
+
+    def kth(self, k):
+        """The k-th smallest remaining value (0-based)"""
+        position, wanted, step = 0, k + 1, self._top
+        while step:
+            if position + step <= len(self.tree) and self.tree[position + step - 1] < wanted:
+                position += step
+                wanted -= self.tree[position - 1]
+            step >>= 1
+        return self.sorted[position]
+
+    def quantile(self, q):
+        """Quantile of the remaining values with pandas' linear interpolation (NaN when none remain)"""
+        if self.count == 0:
+            return np.nan
+        position = (self.count - 1) * q
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        low = self.kth(lower)
+        high = self.kth(upper) if upper != lower else low
+        return low + (high - low) * (position - lower)
+
+    def mean(self):
+        """Mean of the remaining values (NaN when none remain)"""
+        return self.total / self.count if self.count else np.nan
+
+
+def severity_column(frame):
+    """The severity column present in an export, preferring OutageIncidentSeverity"""
+    return next((c for c in SEVERITY_COLUMNS if c in frame.columns), None)
+
+
+def quintile_stats(frame):
+    """TTM quintiles over incidents with a valid TTM: count, range and mean per quintile"""
+    ttm = frame.loc[frame['TTM'].notna() & (frame['TTM'] >= 0), 'TTM']
+    if ttm.empty:
+        return []
+    quintiles = pd.qcut(ttm, 5, labels=QUINTILE_LABELS, duplicates='drop')
+    table = ttm.groupby(quintiles, observed=True).agg(['count', 'min', 'max', 'mean'])
+    return [{'label': str(label), 'count': int(row['count']), 'min': _native(row['min']),
+             'max': _native(row['max']), 'mean': _native(row['mean'])}
+            for label, row in table.iterrows()]
+
+
+def flag_counts(frame, sev_col):
+    """Incident counts for the boolean/flag columns used across the reports"""
+    def count(mask):
+        return int(mask.sum())
+
+    counts = {
+        'auto_detected': count(frame['OutageDetectedBy'] == 'AUTOMATED') if 'OutageDetectedBy' in frame.columns else 0,
+        'multi_region': count(frame['IsMultiRegion'] == True) if 'IsMultiRegion' in frame.columns else 0,
+        'change_related': count(frame['IsCausedBy'] == True) if 'IsCausedBy' in frame.columns else 0,
+        'severity_2': count(frame[sev_col] == 2) if sev_col else 0,
+        'customers_impacted': _native(frame['CustomerImpactedCount'].sum()) if 'CustomerImpactedCount' in frame.columns else 0,
+        'pir_required': None,
+        'pir_complete': None
+    }
+    if 'PIRRequired' in frame.columns and 'PIRStatus' in frame.columns:
+        pir_required = frame['PIRRequired'] == True
+        counts['pir_required'] = count(pir_required)
+        counts['pir_complete'] = count(pir_required & frame['PIRStatus'].astype('string').str.contains('Complete', case=False, na=False))
+    return counts
+
+
+def build_metrics(df, source=None):
+    """Compute the full metrics bundle from an export DataFrame"""
+    frame = apply_schema(df[[c for c in BUNDLE_COLUMNS if c in df.columns]].copy())
+    sev_col = severity_column(frame)
+
+    high_impact = pd.Series(False, index=frame.index)
+    if sev_col:
+        high_impact |= (frame[sev_col] == 2).fillna(False)
+    if 'IsMultiRegion' in frame.columns:
+        high_impact |= (frame['IsMultiRegion'] == True).fillna(False)
+
+    groups = {}
+    for dim in ([sev_col] if sev_col else []) + DIMENSIONS:
+        if dim in frame.columns:
+            groups[dim] = group_records(frame, dim)
+
+    return {
+        'version': BUNDLE_VERSION,
+        'generated': datetime.now().isoformat(),
+        'source': source,
+        'rows': len(frame),
+        'severity_column': sev_col,
+        'overall': column_stats(frame),
+        'groups': groups,
+        'quintiles': quintile_stats(frame) if 'TTM' in frame.columns else [],
+        'counts': flag_counts(frame, sev_col),
+        'cohorts': {
+            'high_impact': dict(column_stats(frame[high_impact], ['TTM']), rows=int(high_impact.sum()))
+        }
+    }
+
+
+def metrics_path_for(csv_path):
+    """Metrics bundle file that accompanies a CSV export"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}.metrics.json")
+
+
+def source_fingerprint(csv_path):
+    """Identify the export file a bundle was computed from (CSV, or its Parquet copy)"""
+    csv_path = Path(csv_path)
+    path = csv_path if csv_path.exists() else parquet_path_for(csv_path)
+    stat = path.stat()
+    return {'file': path.name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def save_metrics(df, csv_path):
+    """Compute the bundle for a freshly written export and cache it next to the CSV"""
+    bundle = build_metrics(df, source_fingerprint(csv_path))
+    with open(metrics_path_for(csv_path), 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, indent=2)
+    return bundle
+
+
+def load_metrics(csv_path=DEFAULT_CSV, refresh=False):
+    """Return the metrics bundle for an export, recomputing it only if the export changed"""
+    bundle_path = metrics_path_for(csv_path)
+    source = source_fingerprint(csv_path)
+
+    if not refresh and bundle_path.exists():
+        with open(bundle_path, 'r', encoding='utf-8') as f:
+            bundle = json.load(f)
+        if bundle.get('version') == BUNDLE_VERSION and bundle.get('source') == source:
+            return bundle
+
+    return save_metrics(load_ttm_data(csv_path, columns=BUNDLE_COLUMNS), csv_path)
+
+
+if __name__ == "__main__":
+    import sys
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV
+    metrics = load_metrics(csv_path)
+    print(f"✅ Metrics bundle: {metrics_path_for(csv_path)} ({metrics['rows']:,} incidents)")
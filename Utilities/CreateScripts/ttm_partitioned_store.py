@@ -0,0 +1,76 @@
+"""
+TTM Partitioned Store
+Several monthly datasets viewed as one store partitioned by month, for
+dashboard views that span more than one export (a quarter, a year, ...).
+
+Each partition is a prepared monthly dataset with its own filter index, caches
+and precomputed per-month aggregates. A date window only touches the partitions
+it overlaps, and trend views read the per-partition monthly aggregates instead
+of rescanning incidents.
+"""
+
+import hashlib
+import pandas as pd
+from ttm_result_cache import RESULT_CACHE_SIZE, ResultCache
+
+
+class PartitionedStore:
+    """Monthly datasets (oldest first) combined into one dataset-like view
+
+    Partitions need `name`, `version`, `start`, `end`, `monthly` (per-month
+    aggregates indexed by 'YYYY-MM') and the summary attributes combined below.
+    """
+
+    def __init__(self, partitions, name, label="All months", frame_cache_size=2):
+        self.partitions = list(partitions)
+        self.name = name
+        self.label = label
+        self.version = hashlib.sha1(
+            '|'.join(f"{p.name}@{p.version}" for p in self.partitions).encode()
+        ).hexdigest()[:12]
+        self.loaded_at = max((p.loaded_at for p in self.partitions), default=None)
+
+        starts = [p.start for p in self.partitions if pd.notna(p.start)]
+        ends = [p.end for p in self.partitions if pd.notna(p.end)]
+        self.start = min(starts) if starts else pd.NaT
+        self.end = max(ends) if ends else pd.NaT
+        self.sort_key = ('', name)
+
+        self.severities = sorted({s for p in self.partitions for s in p.severities})
+        self.services = sorted({s for p in self.partitions for s in p.services})
+        self.ttm_max = max((p.ttm_max for p in self.partitions), default=1000)
+        self.event_options = [option for p in self.partitions for option in p.event_options]
+        self.table_columns = list(dict.fromkeys(c for p in self.partitions for c in p.table_columns))
+        self.monthly = self.monthly_aggregates()
+
+        self.result_cache = ResultCache(RESULT_CACHE_SIZE)
+        self.frames = ResultCache(frame_cache_size)
+
+    def monthly_aggregates(self):
+        """Per-month aggregates across partitions; a month found in several exports
+        is taken from the one holding most of its incidents"""
+        tables = [p.monthly.assign(Partition=p.name) for p in self.partitions if len(p.monthly)]
+        if not tables:
+            return pd.DataFrame()
+        combined = pd.concat(tables).rename_axis('Month').reset_index()
+        combined = combined.sort_values('incidents', ascending=False, kind='stable').drop_duplicates('Month')
+        return combined.set_index('Month').sort_index()
+
+    def prune(self, start=None, end=None):
+        """Partitions overlapping the window [start, end]; partitions without dates are always kept
+
+        Naive bounds are treated as UTC, like the dashboard date filters.
+        """
+        selected = []
+        for p in self.partitions:
+            if pd.notna(p.start) and end is not None and _utc(p.start) > _utc(end):
+                continue
+            if pd.notna(p.end) and start is not None and _utc(p.end) < _utc(start):
+                continue
+            selected.append(p)
+        return selected
+
+
+def _utc(value):
+    value = pd.Timestamp(value)
+    return value.tz_localize('UTC') if value.tzinfo is None else value.tz_convert('UTC')
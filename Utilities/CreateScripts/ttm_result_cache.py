@@ -0,0 +1,71 @@
+"""
+TTM Result Cache
+In-memory LRU of dashboard results per filter state, so switching back to a
+filter combination seen recently (Sev2 only, excluding cascades, a top service)
+returns the stored rows, card values and figures instead of recomputing them.
+
+Each entry holds named parts for one filter key (row positions, cards, charts,
+...). Parts are computed on first use, and the least recently used entry is
+evicted with all its parts once the cache is full.
+"""
+
+import threading
+from collections import Counter, OrderedDict
+
+RESULT_CACHE_SIZE = 32
+
+
+class ResultCache:
+    """Bounded LRU of per-filter-state results, safe to share between callback threads
+
+    A part is computed outside the lock, so two threads missing the same part at
+    once may both compute it; the later result simply replaces the earlier one.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, part, compute):
+        """Return `part` for `key`, calling `compute()` and storing the result on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if part in entry:
+                    self.hits[part] += 1
+                    return entry[part]
+            self.misses[part] += 1
+
+        value = compute()
+
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry[part] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop every entry (e.g. after the underlying data changes); counters are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Entry count and hit/miss counters, overall and per part"""
+        with self._lock:
+            parts = sorted(set(self.hits) | set(self.misses))
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': sum(self.hits.values()),
+                'misses': sum(self.misses.values()),
+                'evictions': self.evictions,
+                'parts': {p: {'hits': self.hits[p], 'misses': self.misses[p]} for p in parts}
+            }
@@ -0,0 +1,268 @@
+"""
+TTM Synthetic Incidents
+Generates a month of synthetic outages with the columns of the ttm_query.csl
+export that the analysis scripts and the dashboard read, so the toolkit can be
+run and benchmarked at any size without the real export.
+
+Distributions follow the shape of the real data rather than its values:
+- TTM is long-tailed (log-normal, shorter for Sev1), with a few incidents missing it
+- Most incidents stand alone; the rest form event systems: a root incident and
+  its cascades, linked by RootResponsibleIncidentId/OutageCorrelationId/EventId
+  and created within hours of the root
+- Services, teams and regions are Zipf-popular, so a few dominate the counts
+- Root causes, mitigations, impacts and symptoms are free text built from phrases
+  that contain the keywords of the dashboard and model taxonomies
+
+Run:
+    python ttm_synthetic.py 100000                  # october_2025_ttm_full_month.csv
+    python ttm_synthetic.py 1000000 --month 2025-11 --output synthetic_ttm_full_month.csv --seed 7
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from ttm_data import DEFAULT_CSV, parquet_path_for, write_parquet
+
+FIRST_INCIDENT_ID = 690_000_000
+
+# Event systems: share of standalone incidents and the cap on cascades per root
+STANDALONE_SHARE = 0.9
+MAX_CASCADES = 200
+
+SERVICE_AREAS = [
+    'Compute', 'Storage', 'Networking', 'SQL Database', 'Cosmos DB', 'Identity', 'Monitor', 'Key Vault',
+    'App Service', 'Kubernetes Service', 'Front Door', 'DNS', 'Load Balancer', 'Event Hubs', 'Service Bus',
+    'Backup', 'Site Recovery', 'Virtual Machines', 'Container Registry', 'API Management'
+]
+SERVICE_PARTS = ['', ' Control Plane', ' Data Plane', ' Resource Provider', ' Gateway', ' Frontend']
+TEAM_SUFFIXES = ['Core', 'Platform', 'Reliability', 'Networking', 'Deployment']
+REGIONS = [
+    'eastus', 'eastus2', 'westus', 'westus2', 'westus3', 'centralus', 'northcentralus', 'southcentralus',
+    'westcentralus', 'canadacentral', 'brazilsouth', 'northeurope', 'westeurope', 'uksouth', 'ukwest',
+    'francecentral', 'germanywestcentral', 'swedencentral', 'switzerlandnorth', 'norwayeast', 'uaenorth',
+    'southafricanorth', 'centralindia', 'southeastasia', 'eastasia', 'japaneast', 'koreacentral',
+    'australiaeast', 'global'
+]
+
+SEVERITIES = [1, 2, 3]
+SEVERITY_WEIGHTS = [0.05, 0.55, 0.40]
+
+# Root cause themes: export category, share of incidents, and phrases for the free text
+ROOT_CAUSES = {
+    'connectivity': ('Network', 0.14, ['network connectivity loss between frontend and storage endpoints',
+                                       'connection failures to an unreachable endpoint after a switch fault']),
+    'configuration': ('Configuration', 0.16, ['misconfiguration of a firewall rule pushed by a config change',
+                                              'configuration drift left an incorrect parameter in settings']),
+    'capacity': ('Capacity', 0.12, ['capacity exhaustion with high cpu and out of memory errors',
+                                    'resource throttling after scaling limits were reached']),
+    'deployment': ('Deployment', 0.18, ['a deployment rollout shipped a code change with a regression',
+                                        'the release introduced a software bug during rollout']),
+    'certificate': ('Certificate', 0.06, ['an expired ssl certificate broke tls authentication',
+                                          'certificate rotation failed and authentication requests were rejected']),
+    'timeout': ('Performance', 0.10, ['timeout and latency spikes from a slow backend query',
+                                      'requests timed out under degraded performance of a shared cache']),
+    'dependency': ('Dependency', 0.14, ['a downstream dependency failure cascading from an upstream service',
+                                        'an external dependency outage in a dependent platform service']),
+    'hardware': ('Hardware', 0.10, ['hardware failure of a tor switch and power loss in one rack',
+                                    'disk failure and memory failure on storage nodes']),
+}
+MITIGATIONS = {
+    'restart': ['restarted the affected instances', 'rebooted the nodes and recycled the worker processes'],
+    'rollback': ['rolled back the deployment', 'reverted the change and the rollback completed'],
+    'scaling': ['scaled out the cluster to add capacity', 'increased resource quotas and scaled up'],
+    'failover': ['failed over to the secondary region', 'redirected traffic and switched to healthy replicas'],
+    'config_change': ['corrected the config setting', 'adjusted the parameter and modified the policy'],
+    'traffic_mgmt': ['throttled incoming traffic with a rate limit', 'blocked the offending traffic to shed load'],
+}
+# Mitigation most likely to follow each root cause theme
+THEME_MITIGATION = {
+    'connectivity': 'failover', 'configuration': 'config_change', 'capacity': 'scaling',
+    'deployment': 'rollback', 'certificate': 'config_change', 'timeout': 'traffic_mgmt',
+    'dependency': 'failover', 'hardware': 'restart'
+}
+IMPACTS = {
+    'availability': 'customers saw service unavailable errors and the api was down',
+    'performance': 'customers experienced slow responses and increased latency',
+    'functionality': 'a feature was degraded and some functionality failed',
+    'data_issue': 'data inconsistency with delayed data processing',
+    'authentication': 'authentication failures and access denied errors at login',
+}
+SYMPTOMS = ['elevated 5xx error rate', 'failed health probes', 'request latency above threshold',
+            'dropped connections', 'queue backlog growth']
+HOW_FIXED = [('Fixed with automation', 0.25), ('Fixed with TSG', 0.30), ('Ad-hoc steps', 0.25),
+             ('Transient/False alarm', 0.15), ('Other', 0.05)]
+DETECTED_BY = [('AUTOMATED', 0.85), ('CUSTOMER', 0.10), ('MANUAL', 0.05)]
+PIR_STATUS = [('Completed', 0.55), ('ReadyForReview', 0.20), ('InProgress', 0.20), (None, 0.05)]
+
+# Hour-of-day weights for root incident creation (UTC), busier in working hours
+HOUR_WEIGHTS = np.array([3, 3, 3, 3, 4, 5, 6, 7, 8, 8, 8, 8, 8, 8, 8, 8, 8, 7, 6, 5, 4, 4, 3, 3], dtype=float)
+
+
+def pick(options, index):
+    """Object array of `options` at `index` (for building text columns without a Python loop)"""
+    return np.asarray(options, dtype=object)[index]
+
+
+def choose(rng, weighted, size):
+    """Indices into a [(value, weight), ...] list drawn by weight"""
+    weights = np.array([w for _, w in weighted], dtype=float)
+    return rng.choice(len(weighted), size=size, p=weights / weights.sum())
+
+
+def zipf_weights(count, exponent=1.1):
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def event_systems(rng, count):
+    """System number of each incident and its position in the system (0 = root)"""
+    sizes = np.where(rng.random(count) < STANDALONE_SHARE, 1,
+                     1 + np.minimum(rng.zipf(2.0, count), MAX_CASCADES))
+    ends = np.cumsum(sizes)
+    systems = int(np.searchsorted(ends, count)) + 1
+    sizes = sizes[:systems]
+    sizes[-1] -= ends[systems - 1] - count
+    starts = np.cumsum(sizes) - sizes
+    system = np.repeat(np.arange(systems), sizes)
+    position = np.arange(count) - starts[system]
+    return system, position
+
+
+def generate_incidents(count, month='2025-10', seed=0):
+    """`count` synthetic incidents created in `month` (YYYY-MM), one row per outage"""
+    rng = np.random.default_rng(seed)
+    system, position = event_systems(rng, count)
+    is_root = position == 0
+    roots = np.flatnonzero(is_root)
+    root_of = roots[system]
+    systems = len(roots)
+
+    # Creation times: roots over the month by hour weight, cascades shortly after their root
+    start = pd.Timestamp(f"{month}-01", tz='UTC')
+    end = start + pd.offsets.MonthBegin(1)
+    days = (end - start).days
+    root_minutes = (rng.integers(0, days, systems) * 1440
+                    + rng.choice(24, systems, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum()) * 60
+                    + rng.random(systems) * 60)
+    minutes = root_minutes[system] + np.where(is_root, 0, rng.exponential(45, count))
+    minutes = np.minimum(minutes, days * 1440 - 1 / 60)
+    created = start + pd.to_timedelta(np.round(minutes * 60), unit='s')
+
+    # Incident IDs increase with creation time
+    order = np.argsort(minutes, kind='stable')
+    ids = np.empty(count, dtype=np.int64)
+    ids[order] = FIRST_INCIDENT_ID + np.arange(count) * 3 + rng.integers(0, 3, count)
+    in_event = np.bincount(system)[system] > 1
+
+    # Service, team and region: cascades mostly land on other services, in the root's region
+    services = [area + part for area in SERVICE_AREAS for part in SERVICE_PARTS]
+    service = rng.choice(len(services), count, p=zipf_weights(len(services)))
+    same_service = ~is_root & (rng.random(count) < 0.3)
+    service[same_service] = service[root_of[same_service]]
+    teams_per_service = rng.integers(1, len(TEAM_SUFFIXES) + 1, len(services))
+    team = rng.integers(0, teams_per_service[service])
+    region = rng.choice(len(REGIONS), count, p=zipf_weights(len(REGIONS), 0.8))
+    region = np.where(is_root | (rng.random(count) < 0.2), region, region[root_of])
+
+    severity = rng.choice(SEVERITIES, count, p=SEVERITY_WEIGHTS)
+
+    # Long-tailed TTM; cascades are mitigated around the time their root is
+    ttm = rng.lognormal(np.log(90), 1.3, count) * np.where(severity == 1, 0.6, 1.0)
+    ttm = np.where(is_root, ttm, ttm[root_of] * rng.uniform(0.3, 1.1, count))
+    ttm = np.maximum(np.round(ttm), 1.0)
+    ttd = np.minimum(np.round(rng.lognormal(np.log(4), 0.8, count)), ttm)
+    ttn = np.minimum(ttd + np.round(rng.exponential(3, count)), ttm)
+    tto = np.round(ttm * rng.beta(2, 6, count))
+    tteng = np.minimum(ttn + np.round(rng.exponential(10, count)), ttm)
+    ttfix = np.round(ttm * rng.uniform(0.5, 1.0, count))
+    ttm[rng.random(count) < 0.01] = np.nan
+
+    # Free text: a root cause theme per event system (cascades mostly report the dependency)
+    themes = list(ROOT_CAUSES)
+    shares = np.array([ROOT_CAUSES[t][1] for t in themes])
+    theme = rng.choice(len(themes), count, p=shares / shares.sum())
+    theme = np.where(is_root, theme, np.where(rng.random(count) < 0.6, themes.index('dependency'), theme[root_of]))
+    variant = rng.integers(0, 2, count)
+    mitigation_names = list(MITIGATIONS)
+    mitigation = np.array([mitigation_names.index(THEME_MITIGATION[t]) for t in themes])[theme]
+    mitigation = np.where(rng.random(count) < 0.6, mitigation, rng.integers(0, len(mitigation_names), count))
+    impact = rng.integers(0, len(IMPACTS), count)
+
+    service_names = pick(services, service)
+    region_names = pick(REGIONS, region)
+    clock = pick([f"{m // 60:02d}:{m % 60:02d}" for m in range(1440)], (minutes % 1440).astype(int))
+    root_cause_text = pick([p for t in themes for p in ROOT_CAUSES[t][2]], theme * 2 + variant)
+    mitigation_text = pick([p for m in mitigation_names for p in MITIGATIONS[m]], mitigation * 2 + variant)
+    impact_text = pick(list(IMPACTS.values()), impact)
+    symptom_text = pick(SYMPTOMS, rng.integers(0, len(SYMPTOMS), count))
+    how_fixed = pick([h for h, _ in HOW_FIXED], choose(rng, HOW_FIXED, count))
+
+    df = pd.DataFrame({
+        'OutageIncidentId': ids,
+        'IncidentId': ids,
+        'OutageCreateDate': created,
+        'ServiceName': service_names,
+        'OwningTeamName': service_names + ' - ' + pick(TEAM_SUFFIXES, team),
+        'ImpactedRegion': region_names,
+        'Severity': severity,
+        'OutageIncidentSeverity': severity,
+        'TTM': ttm, 'TTO': tto, 'TTD': ttd, 'TTN': ttn, 'TTEng': tteng, 'TTFix': ttfix,
+        'IsCritSit': rng.random(count) < np.where(severity == 1, 0.25, 0.02),
+        'IsCausedByChange': rng.random(count) < np.where(theme == themes.index('deployment'), 0.9, 0.15),
+        'IsMultiRegion': (region == REGIONS.index('global')) | (rng.random(count) < 0.1),
+        'OutageCorrelationId': 'corr-' + ids[root_of].astype(str).astype(object),
+        'RootResponsibleIncidentId': np.where(is_root, np.nan, ids[root_of].astype(float)),
+        'Level': np.where(is_root, np.nan, np.minimum(rng.geometric(0.6, count), 4)),
+        'EventId': np.where(in_event, ids[root_of].astype(float), np.nan),
+        'RootCauseCategory': pick([ROOT_CAUSES[t][0] for t in themes], theme),
+        'IncidentTitle': '[Sev' + severity.astype(str).astype(object) + '] ' + service_names + ': '
+                         + symptom_text + ' in ' + region_names,
+        'RootCauses': 'Root cause: ' + root_cause_text + ' in ' + region_names + ' starting ' + clock + ' UTC.',
+        'set_Whys': 'Why 1: ' + symptom_text + '. Why 2: ' + root_cause_text + '.',
+        'Mitigations': 'The team ' + mitigation_text + ' on ' + service_names + '.',
+        'MitigationDescription': mitigation_text,
+        'Impacts': impact_text + ' in ' + region_names + '.',
+        'Symptoms': symptom_text,
+        'AI_Summary': service_names + ' had ' + symptom_text + ' caused by ' + root_cause_text
+                      + '; mitigation: ' + mitigation_text + '.',
+        'HowFixed': how_fixed,
+        'OutageDetectedBy': pick([d for d, _ in DETECTED_BY], choose(rng, DETECTED_BY, count)),
+        'PIRRequired': severity <= 2,
+        'PIRStatus': pick([s for s, _ in PIR_STATUS], choose(rng, PIR_STATUS, count)),
+        'CustomerImpactedCount': np.round(rng.lognormal(np.log(50), 2.0, count)).astype(np.int64),
+    })
+    df['Level'] = df['Level'].astype('Int64')
+    df['RootResponsibleIncidentId'] = df['RootResponsibleIncidentId'].astype('Int64')
+    df['EventId'] = df['EventId'].astype('Int64')
+    return df.sort_values('OutageCreateDate', kind='stable').reset_index(drop=True)
+
+
+def write_incidents(df, csv_path, parquet=True):
+    """Write the incidents as an export CSV, plus its Parquet copy when pyarrow is available"""
+    df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    if parquet:
+        write_parquet(df, parquet_path_for(csv_path))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a month of synthetic TTM incidents")
+    parser.add_argument("count", type=int, help="Number of incidents")
+    parser.add_argument("--month", default="2025-10", help="Month the incidents are created in, YYYY-MM (default: 2025-10)")
+    parser.add_argument("--output", default=DEFAULT_CSV, help=f"CSV path (default: {DEFAULT_CSV})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--no-parquet", action="store_true", help="Skip the Parquet copy")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = generate_incidents(args.count, args.month, args.seed)
+    write_incidents(df, args.output, parquet=not args.no_parquet)
+    events = df['EventId'].nunique()
+    print(f"✅ Wrote {len(df)} synthetic incidents to {args.output}")
+    print(f"   {events} event systems with cascades, {df['RootResponsibleIncidentId'].notna().sum()} cascading outages")
+    print(f"   TTM P50/P75/P90: {df['TTM'].quantile(0.5):.0f} / {df['TTM'].quantile(0.75):.0f} / {df['TTM'].quantile(0.9):.0f} minutes")
+
+
+if __name__ == "__main__":
+    main()
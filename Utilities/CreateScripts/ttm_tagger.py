@@ -0,0 +1,142 @@
+"""
+TTM Keyword Tagger
+Keyword taxonomies (root cause themes, mitigation actions, HowFixed kinds, ...)
+matched against incident text columns in one pass per distinct string.
+
+All keywords of all taxonomies on a column are compiled into one regex trie.
+The regex scans each distinct text once and reports, at every position, the
+longest keyword that starts there. Every shorter keyword that is a prefix of it
+is implied. This gives the same result as testing `keyword in text` for each
+keyword (Aho-Corasick style) without a Python loop per keyword and row. The
+result is one compact bitset column per taxonomy: bit i is set when any keyword
+of the taxonomy's i-th tag occurs in the text.
+
+Usage:
+    tagger = KeywordTagger({'themes': {'network': ['network', 'dns'], 'config': ['config']}})
+    bits = tagger.tag(df['RootCauses'])['themes']
+    df['has_network'] = tagger.has('themes', bits, 'network')
+    df['Theme'] = tagger.first('themes', bits, default='Unknown')   # first tag in taxonomy order
+    KeywordTagger({'kinds': HOW_FIXED, 'exact': HOW_FIXED_EXACT}, case_sensitive=['exact'])
+"""
+
+import re
+from functools import reduce
+from operator import or_
+import numpy as np
+import pandas as pd
+
+# How an incident was fixed (HowFixed field), matched in any case
+HOW_FIXED = {
+    'transient': ['transient', 'false alarm'],
+    'adhoc': ['ad-hoc'],
+}
+
+# HowFixed kinds the reports have always matched in exact case
+HOW_FIXED_EXACT = {
+    'automation': ['Automation'],
+    'tsg': ['TSG'],
+}
+
+BITSET_DTYPES = [(8, np.uint8), (16, np.uint16), (32, np.uint32), (64, np.uint64)]
+
+
+def trie_pattern(keywords):
+    """Regex matching the longest of `keywords` at a position, with shared prefixes factored out"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def render(node):
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ends here: the longer continuation is tried first (greedy)
+        return f"(?:{body})?" if '' in node else body
+
+    return render(trie)
+
+
+class KeywordTagger:
+    """Several keyword taxonomies ({tag: [keywords]} in priority order) compiled for one text column
+
+    Matching is case-insensitive unless `case_sensitive` is True, or lists the
+    taxonomies matched in exact case. Up to 64 tags can be compiled into one tagger.
+    """
+
+    def __init__(self, taxonomies, case_sensitive=False):
+        if isinstance(case_sensitive, bool):
+            case_sensitive = list(taxonomies) if case_sensitive else []
+        self.case_sensitive = set(case_sensitive)
+        self.tags = {name: list(tags) for name, tags in taxonomies.items()}
+        self.offsets = {}
+        offset = 0
+        for name, tags in self.tags.items():
+            self.offsets[name] = offset
+            offset += len(tags)
+        if offset > 64:
+            raise ValueError(f"{offset} tags do not fit one 64-bit tagger; split the taxonomies")
+
+        # One trie over the lowercased text and one over the text as is: (exact case, pattern, keyword bits)
+        self.matchers = []
+        for exact in (False, True):
+            keyword_bits = {}
+            for name, tags in taxonomies.items():
+                if (name in self.case_sensitive) != exact:
+                    continue
+                for i, keywords in enumerate(tags.values()):
+                    for keyword in keywords:
+                        keyword = keyword if exact else keyword.lower()
+                        keyword_bits[keyword] = keyword_bits.get(keyword, 0) | (1 << (self.offsets[name] + i))
+            if not keyword_bits:
+                continue
+            # A match of the longest keyword at a position also implies every keyword that is a prefix of it
+            keyword_bits = {
+                keyword: reduce(or_, (bits for other, bits in keyword_bits.items() if keyword.startswith(other)))
+                for keyword in keyword_bits
+            }
+            self.matchers.append((exact, re.compile(f"(?=({trie_pattern(keyword_bits)}))"), keyword_bits))
+
+    def tag(self, *columns):
+        """Bitset array per taxonomy for text columns (joined with a space; missing values are empty)"""
+        text = columns[0]
+        if len(columns) > 1:
+            text = text.astype('string').fillna('')
+            for column in columns[1:]:
+                text = text + ' ' + column.astype('string').fillna('')
+        codes, uniques = pd.factorize(text)
+
+        # Distinct texts only: each is scanned once, and rows pick up their text's bits
+        uniques = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+        unique_bits = np.zeros(len(uniques), dtype=np.uint64)
+        for exact, pattern, keyword_bits in self.matchers:
+            found = (uniques if exact else uniques.str.lower()).str.findall(pattern)
+            matches = found.explode()  # an empty match list becomes one NaN row
+            bits = matches.map(keyword_bits).fillna(0).to_numpy(dtype=np.uint64)
+            starts = np.concatenate([[0], np.cumsum(found.str.len().clip(lower=1).to_numpy())[:-1]]).astype(np.intp)
+            if len(bits):
+                unique_bits |= np.bitwise_or.reduceat(bits, starts)
+        # Missing values have code -1, which indexes the trailing empty bitset
+        row_bits = np.append(unique_bits, np.uint64(0))[codes]
+
+        result = {}
+        for name, tags in self.tags.items():
+            dtype = next(d for size, d in BITSET_DTYPES if len(tags) <= size)
+            mask = np.uint64((1 << len(tags)) - 1)
+            result[name] = ((row_bits >> np.uint64(self.offsets[name])) & mask).astype(dtype)
+        return result
+
+    def has(self, name, bitsets, tag):
+        """Rows whose bitset has `tag` of taxonomy `name`"""
+        return (np.asarray(bitsets) >> self.tags[name].index(tag)) & 1 == 1
+
+    def first(self, name, bitsets, default=None):
+        """Label of the first tag (in taxonomy order) set in each bitset, `default` where none is"""
+        bitsets = np.asarray(bitsets)
+        labels = np.full(len(bitsets), default, dtype=object)
+        for i in reversed(range(len(self.tags[name]))):
+            labels[(bitsets >> i) & 1 == 1] = self.tags[name][i]
+        return labels
@@ -0,0 +1,90 @@
+"""
+TTM Timings
+Rolling timings and payload sizes of the dashboard's stages (filtering, chart
+aggregates, each figure, table and analysis panels) and of its callback
+responses, so figures like "filter response ~0.3 s" can be read off the running
+dashboard instead of estimated.
+
+Each stage keeps its latest samples in a bounded window and reports rolling
+percentiles. Counters are per process: every gunicorn worker reports its own.
+
+Usage:
+    timings = Timings()
+    with timings.timed('filter'):
+        ...
+    @timings.timed('cards')
+    def build_cards(...): ...
+    timings.record('response chart-dist', seconds, size=len(body))
+    timings.summary()
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import ContextDecorator
+
+import numpy as np
+
+TIMINGS_WINDOW = 500
+
+
+class Timings:
+    """Bounded windows of durations (and optional sizes) per stage, safe to share between threads"""
+
+    def __init__(self, window=TIMINGS_WINDOW):
+        self.window = window
+        self.counts = {}
+        self._seconds = {}
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def timed(self, stage):
+        """Context manager and decorator recording the wall time of `stage`"""
+        return _Timer(self, stage)
+
+    def record(self, stage, seconds, size=None):
+        """Add one sample of `stage`: its duration and, for responses, the payload size in bytes"""
+        with self._lock:
+            if stage not in self._seconds:
+                self.counts[stage] = 0
+                self._seconds[stage] = deque(maxlen=self.window)
+                self._sizes[stage] = deque(maxlen=self.window)
+            self.counts[stage] += 1
+            self._seconds[stage].append(seconds)
+            if size is not None:
+                self._sizes[stage].append(size)
+
+    def summary(self):
+        """Per stage: total samples and rolling P50/P90/P99/max of milliseconds (and bytes)"""
+        with self._lock:
+            samples = {stage: (self.counts[stage], list(self._seconds[stage]), list(self._sizes[stage]))
+                       for stage in sorted(self._seconds)}
+        summary = {}
+        for stage, (count, seconds, sizes) in samples.items():
+            summary[stage] = {'count': count, 'ms': _percentiles(np.array(seconds) * 1000)}
+            if sizes:
+                summary[stage]['bytes'] = _percentiles(np.array(sizes))
+        return summary
+
+
+class _Timer(ContextDecorator):
+    def __init__(self, timings, stage):
+        self.timings = timings
+        self.stage = stage
+        self._starts = threading.local()
+
+    def __enter__(self):
+        # A decorator reuses one timer across threads and nested calls
+        self._starts.stack = getattr(self._starts, 'stack', [])
+        self._starts.stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.record(self.stage, time.perf_counter() - self._starts.stack.pop())
+        return False
+
+
+def _percentiles(values):
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {'p50': round(float(p50), 1), 'p90': round(float(p90), 1), 'p99': round(float(p99), 1),
+            'max': round(float(values.max()), 1)}
@@ -3,12 +3,25 @@ Execute Kusto Query and Save to CSV
 This script executes the ttm_query.csl against the Kusto cluster and saves results to CSV.
 """
 
+import argparse
+import json
+import sys
+import threading
+import time
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from azure.kusto.data import KustoClient, KustoConnectionStringBuilder
 from azure.kusto.data.exceptions import KustoServiceError
 from azure.identity import DefaultAzureCredential, InteractiveBrowserCredential
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Shared TTM schema and loader live alongside the analysis scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'CreateScripts'))
+from ttm_data import ParquetChunkWriter, load_ttm_data, parquet_path_for, write_parquet
+from ttm_metrics import column_stats, metrics_path_for, save_metrics
+from kusto_query_cache import CACHE_MAX_MB, CACHE_TTL_HOURS, QueryCache
 
 # Configuration
 CLUSTER_URI = "https://icmdataro.centralus.kusto.windows.net"
@@ -21,6 +34,26 @@ OUTPUT_CSV = OUTPUT_FOLDER / "october_2025_ttm_full_month.csv"
 START_DATE = "2025-10-01"
 END_DATE = "2025-10-31"
 
+# Rows buffered per chunk when streaming results straight to disk
+STREAM_CHUNK_SIZE = 50000
+
+# Time-sliced fan-out defaults (--slice-days 0 runs the range as a single query)
+SLICE_DAYS = 7
+SLICE_WORKERS = 4
+SLICE_MAX_RETRIES = 3
+SLICE_RETRY_DELAY = 5  # seconds, doubled after each failed attempt
+
+# Incremental refresh: high-water mark column, upsert key and look-back overlap
+WATERMARK_COLUMN = "OutageCreateDate"
+INCIDENT_KEY = "OutageIncidentId"
+INCREMENTAL_LOOKBACK_DAYS = 3
+
+# On-disk cache of query results, keyed by cluster, database, dates and normalized query
+CACHE_DIR = OUTPUT_FOLDER / ".query_cache"
+
+# Scope filter in ttm_query.csl that time slices narrow down
+SCOPE_DATE_FILTER = "| where OutageCreateDate between(startDate..endDate)"
+
 def read_query_file(query_file_path):
     """Read the KQL query from file"""
     print(f"📖 Reading query from: {query_file_path}")
@@ -45,13 +78,41 @@ def update_query_dates(query, start_date, end_date):
     
     return query
 
-def execute_kusto_query(cluster_uri, database, query):
-    """Execute the Kusto query and return results as DataFrame"""
+def split_date_range(start_date, end_date, slice_days):
+    """Split an inclusive YYYY-MM-DD date range into consecutive slices of `slice_days` days"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    
+    slices = []
+    slice_start = start
+    while slice_start <= end:
+        slice_end = min(slice_start + timedelta(days=slice_days - 1), end)
+        slices.append((slice_start.strftime('%Y-%m-%d'), slice_end.strftime('%Y-%m-%d')))
+        slice_start = slice_end + timedelta(days=1)
+    
+    return slices
+
+def slice_query(query, slice_start, slice_end):
+    """Restrict the outage scope of the query to a single time slice
+    
+    Only the OutageCreateDate scope filter is narrowed. The startDate/endDate
+    lets still cover the full range, so lookups such as severity history and
+    PIRs see the same window as an unsliced run.
+    """
+    if SCOPE_DATE_FILTER not in query:
+        raise ValueError(f"Scope filter not found in query: {SCOPE_DATE_FILTER}")
+    
+    return query.replace(
+        SCOPE_DATE_FILTER,
+        f"| where OutageCreateDate between(startofday(todatetime('{slice_start}'))..endofday(todatetime('{slice_end}')))"
+    )
+
+def create_kusto_client(cluster_uri):
+    """Authenticate and return a KustoClient for the cluster"""
     print(f"\n{'='*80}")
     print("CONNECTING TO KUSTO CLUSTER")
     print("="*80)
     print(f"Cluster: {cluster_uri}")
-    print(f"Database: {database}")
     
     print("\n🔐 Using Interactive Browser Authentication...")
     print("A browser window will open for you to sign in.")
@@ -62,6 +123,7 @@ def execute_kusto_query(cluster_uri, database, query):
         kcsb = KustoConnectionStringBuilder.with_azure_token_credential(cluster_uri, credential)
         client = KustoClient(kcsb)
         print("✅ Authentication successful!")
+        return client
         
     except Exception as e:
         print(f"❌ Authentication failed: {e}")
@@ -69,11 +131,56 @@ def execute_kusto_query(cluster_uri, database, query):
         print("  1. Run: az login")
         print("  2. Then run this script again")
         raise
+
+class LazyKustoClient:
+    """KustoClient that connects on first use, so a run served from the query cache never signs in
+
+    Safe to share between the slice threads: the first query connects while the
+    others wait, and a failed sign-in is raised to every caller without retrying it.
+    """
+
+    def __init__(self, cluster_uri):
+        self.cluster_uri = cluster_uri
+        self._client = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if self._client is None:
+                try:
+                    self._client = create_kusto_client(self.cluster_uri)
+                except Exception as e:
+                    self._error = e
+                    raise
+            return self._client
+
+    def execute(self, database, query):
+        return self._connect().execute(database, query)
+
+    def execute_streaming_query(self, database, query):
+        return self._connect().execute_streaming_query(database, query)
+
+def response_to_dataframe(response):
+    """Convert the primary result of a Kusto response to a DataFrame"""
+    primary_result = response.primary_results[0]
     
+    # Extract column names from the Kusto response
+    column_names = [col.column_name for col in primary_result.columns]
+    
+    # Convert rows to DataFrame with column names
+    rows = [row for row in primary_result]
+    return pd.DataFrame(rows, columns=column_names)
+
+def execute_kusto_query(client, database, query):
+    """Execute the Kusto query and return results as DataFrame"""
     # Execute query
     print(f"\n{'='*80}")
     print("EXECUTING KUSTO QUERY")
     print("="*80)
+    print(f"Database: {database}")
     print(f"Timestamp: {datetime.now()}")
     print("Please wait, this may take a few minutes for large result sets...")
     
@@ -83,18 +190,11 @@ def execute_kusto_query(cluster_uri, database, query):
         
         # Convert to DataFrame with proper column names
         print("\n🔄 Converting results to DataFrame...")
-        primary_result = response.primary_results[0]
-        
-        # Extract column names from the Kusto response
-        column_names = [col.column_name for col in primary_result.columns]
-        
-        # Convert rows to DataFrame with column names
-        rows = [row for row in primary_result]
-        df = pd.DataFrame(rows, columns=column_names)
+        df = response_to_dataframe(response)
         
         print(f"✅ Loaded {len(df)} incidents")
         print(f"✅ Columns: {len(df.columns)}")
-        print(f"✅ Column names preserved: {', '.join(column_names[:5])}...")
+        print(f"✅ Column names preserved: {', '.join(df.columns[:5])}...")
         
         return df
         
@@ -105,6 +205,169 @@ def execute_kusto_query(cluster_uri, database, query):
         print(f"❌ Unexpected error: {e}")
         raise
 
+def execute_query_slice(client, database, query, slice_range, max_retries=SLICE_MAX_RETRIES,
+                        retry_delay=SLICE_RETRY_DELAY, cache=None):
+    """Execute one time slice, retrying only this slice on failure
+    
+    With a `cache`, a fresh cached result for the slice is returned without
+    querying the cluster, and new results are added to the cache.
+    """
+    slice_start, slice_end = slice_range
+    sliced_query = slice_query(query, slice_start, slice_end)
+    
+    if cache is not None:
+        df = cache.get(database, sliced_query, slice_start, slice_end)
+        if df is not None:
+            print(f"   💾 Slice {slice_start} - {slice_end}: {len(df)} rows from cache")
+            return df
+    
+    for attempt in range(1, max_retries + 1):
+        try:
+            started = time.perf_counter()
+            df = response_to_dataframe(client.execute(database, sliced_query))
+            print(f"   ✅ Slice {slice_start} - {slice_end}: {len(df)} rows in {time.perf_counter() - started:.1f}s")
+            if cache is not None:
+                cache.put(database, sliced_query, slice_start, slice_end, df)
+            return df
+        except Exception as e:
+            if attempt == max_retries:
+                print(f"   ❌ Slice {slice_start} - {slice_end} failed after {attempt} attempts: {e}")
+                raise
+            delay = retry_delay * 2 ** (attempt - 1)
+            print(f"   ⚠️  Slice {slice_start} - {slice_end} attempt {attempt} failed ({e}), retrying in {delay}s")
+            time.sleep(delay)
+
+def execute_sliced_query(client, database, query, start_date, end_date, slice_days=SLICE_DAYS,
+                         max_workers=SLICE_WORKERS, max_retries=SLICE_MAX_RETRIES,
+                         retry_delay=SLICE_RETRY_DELAY, cache=None):
+    """Execute the query as parallel time slices and merge the results in date order
+    
+    The date range is split into `slice_days` slices that run concurrently on a
+    bounded thread pool sharing one client. Each slice retries on its own, so a
+    slow or failed slice never restarts the whole export. Slices are cached
+    individually when a `cache` is given, so overlapping ranges reuse them.
+    """
+    slices = split_date_range(start_date, end_date, slice_days)
+    
+    print(f"\n{'='*80}")
+    print("EXECUTING KUSTO QUERY (TIME-SLICED)")
+    print("="*80)
+    print(f"Database: {database}")
+    print(f"Timestamp: {datetime.now()}")
+    print(f"Slices: {len(slices)} x {slice_days} day(s), {max_workers} worker(s), {max_retries} attempt(s) per slice")
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(execute_query_slice, client, database, query, slice_range,
+                                   max_retries, retry_delay, cache)
+                   for slice_range in slices]
+        
+        # Collect in submission order so the merged result is in date order
+        frames = []
+        failed = []
+        for slice_range, future in zip(slices, futures):
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                failed.append((slice_range, e))
+    
+    if failed:
+        failed_text = ', '.join(f"{start} - {end}" for (start, end), _ in failed)
+        raise RuntimeError(f"{len(failed)} of {len(slices)} slice(s) failed: {failed_text}") from failed[0][1]
+    
+    df = pd.concat(frames, ignore_index=True)
+    
+    print(f"✅ Loaded {len(df)} incidents from {len(slices)} slices")
+    print(f"✅ Columns: {len(df.columns)}")
+    
+    return df
+
+def stream_kusto_query_to_csv(client, database, query, output_path, chunk_size=STREAM_CHUNK_SIZE,
+                              write_parquet_copy=True):
+    """Execute the Kusto query and append results to CSV as they arrive
+    
+    Uses the streaming query API so rows are read progressively from the
+    response instead of being materialized up front. Only one chunk of
+    `chunk_size` rows (plus the TTM column for the final statistics) is held
+    in memory at a time, so peak memory stays flat regardless of export size.
+    Each chunk is also appended to the Parquet copy unless `write_parquet_copy`
+    is False.
+    """
+    print(f"\n{'='*80}")
+    print("EXECUTING KUSTO QUERY (STREAMING)")
+    print("="*80)
+    print(f"Database: {database}")
+    print(f"Timestamp: {datetime.now()}")
+    print(f"Chunk size: {chunk_size:,} rows")
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    try:
+        response = client.execute_streaming_query(database, query)
+        primary_result = next(response.iter_primary_results())
+        column_names = [col.column_name for col in primary_result.columns]
+        print("✅ Query started, streaming results to disk...")
+        
+        total_rows = 0
+        chunk_count = 0
+        ttm_chunks = []
+        sample = None
+        
+        parquet_writer = ParquetChunkWriter(parquet_path_for(output_path)) if write_parquet_copy else None
+        
+        # Open once so the UTF-8 BOM is written a single time at the top of the file
+        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+            def write_chunk(rows):
+                nonlocal total_rows, chunk_count, sample
+                chunk = pd.DataFrame(rows, columns=column_names)
+                chunk.to_csv(f, index=False, header=(chunk_count == 0))
+                if parquet_writer is not None:
+                    parquet_writer.write(chunk)
+                total_rows += len(chunk)
+                chunk_count += 1
+                if 'TTM' in chunk.columns:
+                    ttm_chunks.append(pd.to_numeric(chunk['TTM'], errors='coerce').to_numpy())
+                if sample is None:
+                    sample = chunk.head()
+            
+            buffer = []
+            for row in primary_result:
+                buffer.append(row)
+                if len(buffer) >= chunk_size:
+                    write_chunk(buffer)
+                    print(f"   ... {total_rows:,} rows written ({chunk_count} chunks)")
+                    buffer = []
+            
+            # Flush the final partial chunk (always write the header for empty results)
+            if buffer or chunk_count == 0:
+                write_chunk(buffer)
+        
+        parquet_written = parquet_writer is not None and parquet_writer.close()
+        print(f"✅ Streamed {total_rows:,} incidents in {chunk_count} chunk(s)")
+        print(f"✅ Columns: {len(column_names)}")
+        
+    except KustoServiceError as e:
+        print(f"❌ Kusto query error: {e}")
+        raise
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        raise
+    
+    print(f"\n{'='*80}")
+    print("SAVED TO CSV")
+    print("="*80)
+    print(f"✅ Saved to: {output_path}")
+    print(f"   - Rows: {total_rows}")
+    print(f"   - Columns: {len(column_names)}")
+    print(f"   - File size: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
+    if parquet_written:
+        parquet_path = parquet_path_for(output_path)
+        print(f"✅ Parquet copy: {parquet_path} ({parquet_path.stat().st_size / 1024 / 1024:.2f} MB)")
+    
+    ttm_stats = column_stats(pd.DataFrame({'TTM': np.concatenate(ttm_chunks)}), ['TTM'])['TTM'] if ttm_chunks else None
+    print_sample_and_statistics(sample, ttm_stats)
+    
+    return output_path
+
 def save_to_csv(df, output_path):
     """Save DataFrame to CSV"""
     print(f"\n{'='*80}")
@@ -122,25 +385,145 @@ def save_to_csv(df, output_path):
     print(f"   - Columns: {len(df.columns)}")
     print(f"   - File size: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
     
+    # Compute the shared metrics bundle now so the report writers never re-derive it
+    metrics = save_metrics(df, output_path)
+    print(f"✅ Metrics bundle: {metrics_path_for(output_path)}")
+    
+    print_sample_and_statistics(df.head(), metrics['overall'].get('TTM'))
+    
+    return output_path
+
+def watermark_path(output_path):
+    """Path of the high-water mark file kept next to an output file"""
+    return output_path.with_name(f"{output_path.stem}.watermark.json")
+
+def read_watermark(output_path):
+    """Return the saved high-water mark for an output file, or None"""
+    path = watermark_path(output_path)
+    if not path.exists() or not output_path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_watermark(output_path, df, column=WATERMARK_COLUMN):
+    """Save the max value of `column` in df as the output file's high-water mark"""
+    watermark = pd.to_datetime(df[column], errors='coerce', utc=True).max()
+    if pd.isna(watermark):
+        print(f"⚠️  No valid {column} values, watermark not updated")
+        return None
+    
+    data = {
+        'column': column,
+        'watermark': watermark.isoformat(),
+        'rows': len(df),
+        'updated': datetime.now().isoformat()
+    }
+    with open(watermark_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    
+    print(f"🔖 Watermark saved: {column} = {data['watermark']}")
+    return data
+
+def incremental_start_date(watermark, lookback_days=INCREMENTAL_LOOKBACK_DAYS):
+    """First day to re-fetch: the watermark day minus the look-back overlap"""
+    watermark_day = pd.Timestamp(watermark['watermark']).date()
+    return (watermark_day - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+
+def upsert_incidents(existing, updates, key=INCIDENT_KEY):
+    """Replace rows of `existing` whose key appears in `updates` and append the new rows"""
+    kept = existing[~existing[key].isin(updates[key])]
+    merged = pd.concat([kept, updates], ignore_index=True)
+    
+    if WATERMARK_COLUMN in merged.columns:
+        order = pd.to_datetime(merged[WATERMARK_COLUMN], errors='coerce', utc=True).argsort(kind='stable')
+        merged = merged.iloc[order].reset_index(drop=True)
+    
+    print(f"🔀 Upserted {len(updates)} fetched rows: {len(existing) - len(kept)} updated, "
+          f"{len(merged) - len(existing)} new, {len(merged)} total")
+    return merged
+
+def save_to_parquet(df, output_path):
+    """Save DataFrame as typed, compressed Parquet next to the CSV"""
+    parquet_path = parquet_path_for(output_path)
+    
+    if write_parquet(df, parquet_path):
+        print(f"✅ Parquet copy: {parquet_path} ({parquet_path.stat().st_size / 1024 / 1024:.2f} MB)")
+        return parquet_path
+    return None
+
+def print_sample_and_statistics(sample, ttm):
+    """Print the first rows and TTM summary statistics (a ttm_metrics stats dict) of an export"""
     # Display sample data
-    print(f"\n📊 Sample Data (first 5 rows):")
-    display_cols = [col for col in ['OutageIncidentId', 'ServiceName', 'Severity', 'TTM', 'TTD', 'TTO', 'OutageCreateDate'] 
-                    if col in df.columns]
-    if display_cols:
-        print(df[display_cols].head().to_string(index=False))
+    if sample is not None:
+        print(f"\n📊 Sample Data (first 5 rows):")
+        display_cols = [col for col in ['OutageIncidentId', 'ServiceName', 'Severity', 'TTM', 'TTD', 'TTO', 'OutageCreateDate'] 
+                        if col in sample.columns]
+        if display_cols:
+            print(sample[display_cols].head().to_string(index=False))
     
     # Display summary statistics
-    if 'TTM' in df.columns:
+    if ttm is not None:
         print(f"\n📈 TTM Statistics:")
-        print(f"   - Mean: {df['TTM'].mean():.2f} minutes")
-        print(f"   - Median (P50): {df['TTM'].median():.2f} minutes")
-        print(f"   - P75: {df['TTM'].quantile(0.75):.2f} minutes")
-        print(f"   - P90: {df['TTM'].quantile(0.90):.2f} minutes")
+        if not ttm['count']:
+            print("   - No TTM values in the export")
+            return
+        print(f"   - Mean: {ttm['mean']:.2f} minutes")
+        print(f"   - Median (P50): {ttm['p50']:.2f} minutes")
+        print(f"   - P75: {ttm['p75']:.2f} minutes")
+        print(f"   - P90: {ttm['p90']:.2f} minutes")
+
+def parse_args():
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Execute ttm_query.csl against Kusto and save the results to CSV")
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream results to the CSV in chunks instead of loading them all into memory')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                        help=f'Rows per chunk in --stream mode (default: {STREAM_CHUNK_SIZE})')
+    parser.add_argument('--slice-days', type=int, default=0,
+                        help=f'Split the date range into slices of N days and run them in parallel (e.g. {SLICE_DAYS})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Concurrent slice queries (default: {SLICE_WORKERS})')
+    parser.add_argument('--max-retries', type=int, default=None,
+                        help=f'Attempts per slice before the export fails (default: {SLICE_MAX_RETRIES})')
+    parser.add_argument('--no-parquet', action='store_true',
+                        help='Only write the CSV, without the typed Parquet copy')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Only fetch rows past the saved {WATERMARK_COLUMN} watermark and upsert them into the existing CSV')
+    parser.add_argument('--force-refresh', action='store_true',
+                        help='Ignore cached query results and re-run the query (results are still cached)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Neither read nor write the query result cache')
+    parser.add_argument('--cache-ttl-hours', type=float, default=None,
+                        help=f'Hours a cached result stays valid (default: {CACHE_TTL_HOURS})')
+    parser.add_argument('--cache-max-mb', type=float, default=None,
+                        help=f'Size limit of the cache before least recently used results are evicted (default: {CACHE_MAX_MB})')
+    parser.add_argument('--lookback-days', type=int, default=INCREMENTAL_LOOKBACK_DAYS,
+                        help=f'Days before the watermark to re-fetch in --incremental mode (default: {INCREMENTAL_LOOKBACK_DAYS})')
+    args = parser.parse_args()
     
-    return output_path
+    if args.incremental and args.stream:
+        parser.error('--incremental cannot be combined with --stream')
+    # --stream runs one unsliced query straight to disk, without retries or the cache
+    stream_conflicts = [flag for flag, given in (
+        ('--slice-days', args.slice_days > 0), ('--workers', args.workers is not None),
+        ('--max-retries', args.max_retries is not None), ('--force-refresh', args.force_refresh),
+        ('--cache-ttl-hours', args.cache_ttl_hours is not None), ('--cache-max-mb', args.cache_max_mb is not None)
+    ) if given]
+    if args.stream and stream_conflicts:
+        parser.error(f"{', '.join(stream_conflicts)} cannot be combined with --stream")
+    
+    # Defaults of the options checked above
+    args.workers = SLICE_WORKERS if args.workers is None else args.workers
+    args.max_retries = SLICE_MAX_RETRIES if args.max_retries is None else args.max_retries
+    args.cache_ttl_hours = CACHE_TTL_HOURS if args.cache_ttl_hours is None else args.cache_ttl_hours
+    args.cache_max_mb = CACHE_MAX_MB if args.cache_max_mb is None else args.cache_max_mb
+    
+    return args
 
 def main():
     """Main execution function"""
+    args = parse_args()
+    
     print("="*80)
     print("OCTOBER 2025 TTM ANALYSIS - KUSTO QUERY TO CSV")
     print("="*80)
@@ -148,24 +531,67 @@ def main():
     
     try:
         # Step 1: Read query file
-        query = read_query_file(QUERY_FILE)
+        template = read_query_file(QUERY_FILE)
+        
+        # Step 2: Work out the date range to fetch
+        start_date = START_DATE
+        watermark = read_watermark(OUTPUT_CSV) if args.incremental else None
+        if watermark:
+            start_date = max(START_DATE, incremental_start_date(watermark, args.lookback_days))
+            print(f"🔖 Watermark: {watermark['column']} = {watermark['watermark']} "
+                  f"(re-fetching from {start_date}, {args.lookback_days} day look-back)")
+        elif args.incremental:
+            print("🔖 No watermark found, running a full export to seed the incremental store")
         
-        # Step 2: Update query with October 2025 dates
-        query = update_query_dates(query, START_DATE, END_DATE)
+        # Step 3: Update query with the date range
+        query = update_query_dates(template, start_date, END_DATE)
         
-        # Step 3: Execute query
-        df = execute_kusto_query(CLUSTER_URI, DATABASE, query)
+        # Step 4: Open the cache; the cluster is only connected to on the first cache miss
+        # (--incremental always re-fetches its window so recent changes are picked up;
+        # --stream writes straight to disk and bypasses the cache)
+        cache = None
+        if not args.no_cache and not args.stream:
+            cache = QueryCache(CACHE_DIR, CLUSTER_URI, args.cache_ttl_hours, args.cache_max_mb,
+                               force_refresh=args.force_refresh or args.incremental)
+        client = LazyKustoClient(CLUSTER_URI)
         
-        # Step 4: Save to CSV
-        csv_path = save_to_csv(df, OUTPUT_CSV)
+        # Step 5: Execute query and save to CSV
+        if args.stream:
+            csv_path = stream_kusto_query_to_csv(client, DATABASE, query, OUTPUT_CSV, args.chunk_size,
+                                                 write_parquet_copy=not args.no_parquet)
+        else:
+            if args.slice_days > 0:
+                df = execute_sliced_query(client, DATABASE, query, start_date, END_DATE, args.slice_days,
+                                          args.workers, args.max_retries, cache=cache)
+            else:
+                df = cache.get(DATABASE, query, start_date, END_DATE) if cache else None
+                if df is not None:
+                    print(f"\n💾 Loaded {len(df)} incidents from the query cache")
+                else:
+                    df = execute_kusto_query(client, DATABASE, query)
+                    if cache:
+                        cache.put(DATABASE, query, start_date, END_DATE, df)
+            
+            if cache:
+                print(f"💾 Query cache: {cache.summary()}")
+            
+            if watermark:
+                existing = load_ttm_data(OUTPUT_CSV)
+                df = upsert_incidents(existing, df)
+            
+            csv_path = save_to_csv(df, OUTPUT_CSV)
+            if not args.no_parquet:
+                save_to_parquet(df, OUTPUT_CSV)
+            if args.incremental:
+                write_watermark(OUTPUT_CSV, df)
         
-        # Step 5: Success message
+        # Step 6: Success message
         print(f"\n{'='*80}")
         print("✅ SUCCESS - CSV FILE CREATED")
         print("="*80)
         print(f"\nNext steps:")
         print(f"1. Verify the CSV file: {csv_path}")
-        print(f"2. Run the full analysis: python run_full_analysis.py")
+        print(f"2. Run the full analysis: python ../Utilities/CreateScripts/run_full_analysis.py")
         print(f"3. Generate the narrative following: Narrative_Generation_Instructions.md")
         
         return 0
@@ -0,0 +1,148 @@
+"""
+Fake Kusto Client
+In-memory stand-in for KustoClient so the exporter's time-sliced fan-out, merge
+order and per-slice retries can be exercised without access to the cluster.
+
+Run: python fake_kusto_client.py
+"""
+
+import re
+import threading
+import time
+import pandas as pd
+from pathlib import Path
+
+# Slice scope filter written by execute_kusto_query_to_csv.slice_query
+SLICE_FILTER_PATTERN = re.compile(
+    r"OutageCreateDate between\(startofday\(todatetime\('([\d-]+)'\)\)\.\.endofday\(todatetime\('([\d-]+)'\)\)\)"
+)
+# Full-range lets written by execute_kusto_query_to_csv.update_query_dates
+START_DATE_PATTERN = re.compile(r"let startDate = startofday\(todatetime\('([^']+)'\)\);")
+END_DATE_PATTERN = re.compile(r"let endDate = endofday\(todatetime\('([^']+)'\)\);")
+
+
+class FakeQueryError(Exception):
+    """Transient failure raised by FakeKustoClient"""
+
+
+class FakeColumn:
+    def __init__(self, column_name):
+        self.column_name = column_name
+
+
+class FakeResultTable:
+    """Mimics KustoResultTable: exposes `columns` and iterates rows"""
+
+    def __init__(self, df):
+        self.columns = [FakeColumn(c) for c in df.columns]
+        self._rows = df.itertuples(index=False, name=None)
+
+    def __iter__(self):
+        return (list(row) for row in self._rows)
+
+
+class FakeResponse:
+    """Mimics both KustoResponseDataSet and KustoStreamingResponseDataSet"""
+
+    def __init__(self, df):
+        self._df = df
+
+    @property
+    def primary_results(self):
+        return [FakeResultTable(self._df)]
+
+    def iter_primary_results(self):
+        yield FakeResultTable(self._df)
+
+
+class FakeKustoClient:
+    """Serves query results from a DataFrame filtered by the query's date range
+
+    Args:
+        df: Rows to serve; must contain an OutageCreateDate column.
+        latency: Seconds to sleep per call, or a callable(start, end) -> seconds.
+        failures: Map of slice start date (YYYY-MM-DD) -> number of calls for
+            that slice that fail before it succeeds.
+
+    Every call is recorded in `calls` as (start, end, succeeded) so callers can
+    check how many attempts each slice took.
+    """
+
+    def __init__(self, df, latency=0.0, failures=None):
+        self.df = df.copy()
+        self.df['OutageCreateDate'] = pd.to_datetime(self.df['OutageCreateDate'])
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _date_range(self, query):
+        match = SLICE_FILTER_PATTERN.search(query)
+        if match:
+            return match.group(1), match.group(2)
+        start = START_DATE_PATTERN.search(query)
+        end = END_DATE_PATTERN.search(query)
+        return (start.group(1) if start else None), (end.group(1) if end else None)
+
+    def _run(self, query):
+        start, end = self._date_range(query)
+
+        with self._lock:
+            should_fail = self.failures.get(start, 0) > 0
+            if should_fail:
+                self.failures[start] -= 1
+            self.calls.append((start, end, not should_fail))
+
+        delay = self.latency(start, end) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+        if should_fail:
+            raise FakeQueryError(f"Simulated transient failure for slice starting {start}")
+
+        mask = pd.Series(True, index=self.df.index)
+        if start:
+            mask &= self.df['OutageCreateDate'] >= pd.Timestamp(start)
+        if end:
+            mask &= self.df['OutageCreateDate'] < pd.Timestamp(end) + pd.Timedelta(days=1)
+        return FakeResponse(self.df[mask])
+
+    def execute(self, database, query, properties=None):
+        return self._run(query)
+
+    def execute_streaming_query(self, database, query, timeout=None, properties=None):
+        return self._run(query)
+
+
+def main():
+    """Run the time-sliced fan-out against the fake client and check the result"""
+    from execute_kusto_query_to_csv import execute_sliced_query, update_query_dates, read_query_file
+
+    dates = pd.date_range('2025-10-01', '2025-10-31 23:00', freq='7h')
+    df = pd.DataFrame({
+        'OutageIncidentId': range(len(dates)),
+        'OutageCreateDate': dates,
+        'TTM': [float(i % 240) for i in range(len(dates))]
+    })
+
+    # Later slices answer first, and two slices fail before succeeding
+    client = FakeKustoClient(
+        df,
+        latency=lambda start, end: 0.3 if start == '2025-10-01' else 0.05,
+        failures={'2025-10-08': 1, '2025-10-22': 2}
+    )
+
+    query = update_query_dates(read_query_file(Path(__file__).with_name('ttm_query.csl')), '2025-10-01', '2025-10-31')
+    result = execute_sliced_query(client, 'FakeDatabase', query, '2025-10-01', '2025-10-31',
+                                  slice_days=7, max_workers=4, max_retries=3, retry_delay=0.01)
+
+    assert result['OutageIncidentId'].tolist() == df['OutageIncidentId'].tolist(), "Slices merged out of order"
+    attempts = pd.Series([start for start, _, _ in client.calls]).value_counts()
+    assert attempts['2025-10-08'] == 2 and attempts['2025-10-22'] == 3, "Unexpected retry counts"
+    assert attempts.drop(['2025-10-08', '2025-10-22']).eq(1).all(), "Healthy slices were re-run"
+
+    print(f"\n✅ Fan-out check passed: {len(result)} rows merged in order from {len(attempts)} slices")
+    print(f"   Attempts per slice: {attempts.sort_index().to_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Kusto Query Result Cache
+On-disk cache of query results so repeated exporter runs during analysis
+iterations do not re-execute ttm_query.csl against the cluster.
+
+Entries are keyed by a SHA-256 hash of the cluster, database, date range and the
+normalized query text (comments dropped, whitespace collapsed), so formatting
+edits to the .csl file still hit the cache while any real change misses it.
+Entries older than the TTL are ignored and removed, and the least recently used
+entries are evicted once the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+CACHE_TTL_HOURS = 24
+CACHE_MAX_MB = 2048
+
+# `//` comments, but not the `//` inside cluster('https://...') URLs
+COMMENT_PATTERN = re.compile(r"(^|\s)//.*$", re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Query text with comments removed and all whitespace collapsed to single spaces"""
+    query = COMMENT_PATTERN.sub(r"\1", query)
+    return WHITESPACE_PATTERN.sub(" ", query).strip()
+
+
+class QueryCache:
+    """Result cache for one cluster, stored as pickled DataFrames in `cache_dir`
+
+    Each entry is a `<key>.pkl` file with a `<key>.json` sidecar holding the
+    query parameters and creation time. File modification times track last
+    use for LRU eviction. Safe to share between the exporter's slice threads.
+    With `force_refresh` every lookup misses, but new results are still stored.
+    """
+
+    def __init__(self, cache_dir, cluster, ttl_hours=CACHE_TTL_HOURS, max_mb=CACHE_MAX_MB,
+                 force_refresh=False):
+        self.cache_dir = Path(cache_dir)
+        self.cluster = cluster
+        self.force_refresh = force_refresh
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, database, query, start_date, end_date):
+        """Cache key for a query and its date parameters"""
+        payload = json.dumps({
+            'cluster': self.cluster.rstrip('/').lower(),
+            'database': database,
+            'start_date': start_date,
+            'end_date': end_date,
+            'query': normalize_query(query)
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return self.cache_dir / f"{key}.pkl", self.cache_dir / f"{key}.json"
+
+    def _is_fresh(self, meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                created = json.load(f)['created_ts']
+        except (OSError, ValueError, KeyError):
+            return False
+        return time.time() - created < self.ttl_seconds
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    def contains(self, database, query, start_date, end_date):
+        """True if a fresh entry exists, without counting a hit or touching it"""
+        if self.force_refresh:
+            return False
+        data_path, meta_path = self._paths(self.key(database, query, start_date, end_date))
+        return data_path.exists() and self._is_fresh(meta_path)
+
+    def get(self, database, query, start_date, end_date):
+        """Return the cached DataFrame, or None if missing or expired"""
+        key = self.key(database, query, start_date, end_date)
+        data_path, meta_path = self._paths(key)
+
+        with self._lock:
+            if self.force_refresh:
+                self.misses += 1
+                return None
+            if not data_path.exists() or not self._is_fresh(meta_path):
+                if data_path.exists() or meta_path.exists():
+                    self._remove(key)
+                self.misses += 1
+                return None
+            # Mark as recently used for LRU eviction before reading outside the lock
+            try:
+                os.utime(data_path)
+            except OSError:
+                self.misses += 1
+                return None
+
+        try:
+            df = pd.read_pickle(data_path)
+        except OSError:
+            # Another thread's put() or eviction removed the entry since the check
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return df
+
+    def put(self, database, query, start_date, end_date, df):
+        """Store a result and evict old entries if the cache is over its size limit"""
+        key = self.key(database, query, start_date, end_date)
+        data_path, meta_path = self._paths(key)
+
+        # Write to temp files and rename so concurrent readers never see a partial entry
+        tmp_data = data_path.with_suffix(f".pkl.{threading.get_ident()}.tmp")
+        df.to_pickle(tmp_data)
+        tmp_meta = meta_path.with_suffix(f".json.{threading.get_ident()}.tmp")
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump({
+                'cluster': self.cluster,
+                'database': database,
+                'start_date': start_date,
+                'end_date': end_date,
+                'rows': len(df),
+                'created': datetime.now().isoformat(),
+                'created_ts': time.time()
+            }, f, indent=2)
+
+        with self._lock:
+            os.replace(tmp_meta, meta_path)
+            os.replace(tmp_data, data_path)
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max size"""
+        entries = []
+        for data_path in self.cache_dir.glob("*.pkl"):
+            key = data_path.stem
+            if not self._is_fresh(self._paths(key)[1]):
+                self._remove(key)
+                continue
+            stat = data_path.stat()
+            entries.append((stat.st_mtime, stat.st_size, key))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            print(f"   🧹 Evicted cached result {key[:12]} ({size / 1024 / 1024:.2f} MB)")
+
+    def summary(self):
+        """One-line hit/miss summary"""
+        return f"{self.hits} hit(s), {self.misses} miss(es) in {self.cache_dir}"